@@ -128,18 +128,14 @@ def save_to_mongodb(box_score_data, mongo_uri=MONGO_URI, db_name=DB_NAME, collec
         db = client[db_name]
         collection = db[collection_name]
         
-        # Check if game already exists in the database
+        # Insert or replace the game's record in a single round-trip
         game_id = box_score_data['game_id']
-        existing_record = collection.find_one({'game_id': game_id})
+        result = collection.replace_one({'game_id': game_id}, box_score_data, upsert=True)
         
-        if existing_record:
-            # Update existing record
-            result = collection.replace_one({'game_id': game_id}, box_score_data)
+        if result.upserted_id is None:
             print(f"Updated existing live box score for game ID {game_id}")
         else:
-            # Insert new record
-            result = collection.insert_one(box_score_data)
-            print(f"Inserted new live box score for game ID {game_id} with _id: {result.inserted_id}")
+            print(f"Inserted new live box score for game ID {game_id} with _id: {result.upserted_id}")
         
         client.close()
         return True
@@ -1,70 +1,540 @@
 import asyncio
-from typing import List
+import functools
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
 from nba_api.live.nba.endpoints import scoreboard
 from nba_stats.api.nba_client import NBAClient
+from nba_stats.api.resilience import FetchResult, FetchStatus
 import logging
+from nba_stats.config import LIVE_FETCH_MODE, LIVE_FETCH_CONCURRENCY, LIVE_FETCH_MAX_WORKERS, LIVE_FETCH_BACKEND
+from nba_stats.config import BOX_SCORE_HISTORY_ENABLED, LIVE_API_ENABLED, STORAGE_BACKEND, VERIFY_INDEXES_ON_STARTUP
+from nba_stats.config import AGGREGATES_ENABLED, GAME_STATE_ENABLED
+from nba_stats.data.aggregates import AggregateEngine
 from nba_stats.data.database import MongoDBClient
+from nba_stats.data.fingerprint import FingerprintCache
+from nba_stats.data.history import BoxScoreHistory
+from nba_stats.data.indexes import IndexManager
+from nba_stats.data.models import BoxScoreData, PlayByPlayData
+from nba_stats.data.play_tracker import PlayByPlayTracker, PlayByPlayUpdate
+from nba_stats.live.broker import PlayBroker
+from nba_stats.live.game_state import GameStateEngine
+from nba_stats.live.lifecycle import GameEvent, GameLifecycleTracker, is_final
+from nba_stats.live.persistence import WriteBehindQueue
+from nba_stats.live.scheduler import PollScheduler, GAME_STATUS_LIVE
+from nba_stats.live.store import LiveStore
+from nba_stats.utils.player_index import PlayerIndex
 
 logger = logging.getLogger(__name__)
 POLL_INTERVAL_SECONDS = 15
 REFRESH_GAMES_INTERVAL_SECONDS = 300  # 5 minutes
 
-# Shared cache
-active_game_ids: List[str] = []
+# Start/final tracking for today's games; decides which games are polled
+lifecycle = GameLifecycleTracker(REFRESH_GAMES_INTERVAL_SECONDS)
 
-async def refresh_active_games_cache():
-    """Refresh the cached list of active games every 5 minutes."""
-    global active_game_ids
+# Stored play-by-play state per game, so each cycle only writes new or corrected actions
+play_tracker = PlayByPlayTracker()
+
+# Fingerprints of the last documents written, so unchanged polls skip persistence
+fingerprints = FingerprintCache()
+
+# Per-game poll times, adapted to each game's state
+scheduler = PollScheduler()
+
+# Per-poll box score deltas, so the in-game progression is kept
+history = BoxScoreHistory()
+
+# Lineups, stint plus-minus and scoring runs per game, fed only the new actions of each poll
+game_states = GameStateEngine()
+
+# Season sums and leaderboards, updated once per finished game
+aggregates = AggregateEngine() if AGGREGATES_ENABLED else None
+
+# Latest feeds, pre-serialized for the read API
+live_store = LiveStore()
+
+# New plays fanned out to streaming clients as soon as they are fetched
+play_broker = PlayBroker()
+
+# Fetch outcomes (ok, not_modified, throttled, upstream_down, ...) since startup
+fetch_outcomes = Counter()
+
+GameFeeds = Tuple[str, Optional[BoxScoreData], Optional[PlayByPlayData]]
+
+def unwrap_feeds(game_id: str, box_score_result: FetchResult, play_by_play_result: FetchResult) -> GameFeeds:
+    """
+    Count the fetch outcomes for a game and reduce them to models (None when failed).
+
+    An unchanged feed keeps the cached model its NOT_MODIFIED result carries, if
+    any, so a final whose write failed is written again; the fingerprints skip
+    the ones already stored.
+    """
+    feeds = []
+    for kind, result in (("box score", box_score_result), ("play-by-play", play_by_play_result)):
+        fetch_outcomes[result.status.value] += 1
+        if result.status not in (FetchStatus.OK, FetchStatus.NOT_MODIFIED):
+            logger.warning(f"Live {kind} for game {game_id}: {result.status.value}")
+        feeds.append(result.data if result.status in (FetchStatus.OK, FetchStatus.NOT_MODIFIED) else None)
+    return game_id, feeds[0], feeds[1]
+
+def publish_plays(result: FetchResult) -> FetchResult:
+    """Stream a fresh play-by-play's new actions straight away, without waiting for the rest of the cycle."""
+    if result.ok:
+        play_broker.publish(result.data)
+    return result
+
+async def publish_plays_when_fetched(fetch) -> FetchResult:
+    return publish_plays(await fetch)
+
+async def fetch_scoreboard(async_client=None) -> FetchResult:
+    """Fetch the scoreboard without blocking the event loop."""
+    if async_client:
+        return await async_client.fetch_scoreboard()
+    return await asyncio.get_running_loop().run_in_executor(None, NBAClient.fetch_scoreboard)
+
+async def refresh_active_games_cache(async_client=None):
+    """Refresh the scoreboard, more often around scheduled tip-offs, and track game starts and finals."""
+    games = []
     while True:
+        delay = REFRESH_GAMES_INTERVAL_SECONDS
         try:
-            live_scoreboard = NBAClient.get_scoreboard()
-            games = live_scoreboard.games
-            active_game_ids = [
-                game['gameId']
-                for game in games
-                if game.get('gameStatus', 0) == 2  # 2 = Live
-            ]
+            result = await fetch_scoreboard(async_client)
+            if result.ok:
+                games = result.data.games
+                live_store.put_scoreboard(result.data)
+            elif result.status is not FetchStatus.NOT_MODIFIED:
+                logger.error(f"Failed to refresh scoreboard ({result.status.value}), reusing the last one")
+            # Re-applied even when unchanged, since games also start when their tip-off time passes
+            announce_game_events(lifecycle.update(games))
+            active_game_ids = lifecycle.active_game_ids()
+            for game in games:
+                game_status = game.get('gameStatus', 0)
+                if game['gameId'] in active_game_ids:
+                    # Games past their scheduled tip-off are polled as live even if the scoreboard lags
+                    game_status = max(game_status, GAME_STATUS_LIVE)
+                scheduler.set_game_status(game['gameId'], game_status)
+            # Finished games stay readable until the scoreboard moves on
+            live_store.retain([game['gameId'] for game in games] + active_game_ids)
             logger.info(f"Refreshed active games: {active_game_ids}")
+            delay = lifecycle.next_refresh_delay()
         except Exception as e:
             print(f"Error refreshing active games: {e}")
-        
-        await asyncio.sleep(REFRESH_GAMES_INTERVAL_SECONDS)
 
-async def update_live_games_loop():
-    """Fetch and update box scores for cached active games every 15 seconds."""
-    while True:
-        try:
-            if not active_game_ids:
-                logger.info("No active games currently.")
+        await asyncio.sleep(delay)
+
+async def fetch_game_feeds(game_id: str, executor: ThreadPoolExecutor, semaphore: asyncio.Semaphore,
+                           async_client=None) -> GameFeeds:
+    """Fetch the box score and play-by-play for one game in parallel, on the event loop or the worker pool."""
+    if async_client:
+        # Bounded by the client's connection limit rather than the thread semaphore
+        logger.info(f"Refreshing box score for {game_id}")
+        box_score_result, play_by_play_result = await asyncio.gather(
+            async_client.fetch_live_box_score(game_id),
+            publish_plays_when_fetched(async_client.fetch_live_play_by_play(game_id))
+        )
+        return unwrap_feeds(game_id, box_score_result, play_by_play_result)
+
+    loop = asyncio.get_running_loop()
+    async with semaphore:
+        logger.info(f"Refreshing box score for {game_id}")
+        box_score_result, play_by_play_result = await asyncio.gather(
+            loop.run_in_executor(executor, NBAClient.fetch_live_box_score, game_id),
+            publish_plays_when_fetched(loop.run_in_executor(executor, NBAClient.fetch_live_play_by_play, game_id))
+        )
+    return unwrap_feeds(game_id, box_score_result, play_by_play_result)
+
+async def fetch_all_games(game_ids: List[str], executor: ThreadPoolExecutor, semaphore: asyncio.Semaphore,
+                          async_client=None) -> List[GameFeeds]:
+    """Fetch the feeds for every game, concurrently or one after another depending on LIVE_FETCH_MODE."""
+    if LIVE_FETCH_MODE == "sequential":
+        if async_client:
+            return [
+                unwrap_feeds(game_id,
+                             await async_client.fetch_live_box_score(game_id),
+                             publish_plays(await async_client.fetch_live_play_by_play(game_id)))
+                for game_id in game_ids
+            ]
+        return [
+            unwrap_feeds(game_id, NBAClient.fetch_live_box_score(game_id),
+                         publish_plays(NBAClient.fetch_live_play_by_play(game_id)))
+            for game_id in game_ids
+        ]
+    return await asyncio.gather(*(fetch_game_feeds(game_id, executor, semaphore, async_client) for game_id in game_ids))
+
+def announce_game_events(events: List[Optional[GameEvent]]) -> None:
+    """Pass game starts and finals on to the games' stream clients."""
+    for event in events:
+        if event:
+            play_broker.announce(event.game_id, event.kind)
+
+def publish_live_feeds(results: List[GameFeeds]) -> None:
+    """Hand fresh feeds to the read API before they are persisted."""
+    for _, box_score_data, play_by_play_data in results:
+        if box_score_data:
+            live_store.put_box_score(box_score_data)
+            # A final box score usually comes before the scoreboard says so; its plays were already published
+            announce_game_events([lifecycle.observe_box_score(box_score_data)])
+        if play_by_play_data:
+            live_store.put_play_by_play(play_by_play_data)
+
+def load_play_by_play_state(db_client: MongoDBClient, play_by_plays: List[PlayByPlayData]) -> None:
+    """Load the stored plays and game state checkpoints of games not seen since startup."""
+    for play_by_play_data in play_by_plays:
+        game_id = play_by_play_data.game_id
+        if not play_tracker.is_loaded(game_id):
+            stored = db_client.get_document(game_id, db_name="PlayByPlay", collection_name="play_by_play",
+                                            projection={'plays': 1})
+            play_tracker.load(game_id, stored.get('plays', []) if stored else None)
+        if GAME_STATE_ENABLED and not game_states.is_loaded(game_id):
+            # Without a checkpoint the game is replayed from its first action, which gives the same state
+            game_states.load(game_id, db_client.get_document(game_id, db_name="PlayByPlay",
+                                                             collection_name="game_state", projection={'_id': 0}))
+
+async def load_cycle_state_async(db_client, writes: "CycleWrites") -> None:
+    """Load stored plays, game states and box score history of new games concurrently, before planning."""
+    async def load_plays(game_id: str) -> None:
+        stored = await db_client.get_document(game_id, db_name="PlayByPlay", collection_name="play_by_play",
+                                              projection={'plays': 1})
+        play_tracker.load(game_id, stored.get('plays', []) if stored else None)
+
+    async def load_game_state(game_id: str) -> None:
+        game_states.load(game_id, await db_client.get_document(game_id, db_name="PlayByPlay",
+                                                               collection_name="game_state", projection={'_id': 0}))
+
+    async def load_history(game_id: str) -> None:
+        segments = await db_client.find_documents({'game_id': game_id}, history.db_name, history.collection_name,
+                                                  sort=[('seq', -1)], limit=1)
+        history.load(game_id, segments[0] if segments else None)
+
+    loads = [load_plays(play_by_play_data.game_id) for play_by_play_data in writes.play_by_plays
+             if not play_tracker.is_loaded(play_by_play_data.game_id)]
+    if GAME_STATE_ENABLED:
+        loads += [load_game_state(play_by_play_data.game_id) for play_by_play_data in writes.play_by_plays
+                  if not game_states.is_loaded(play_by_play_data.game_id)]
+    if BOX_SCORE_HISTORY_ENABLED:
+        loads += [load_history(box_score_data.game_id) for box_score_data in writes.box_scores
+                  if not history.is_loaded(box_score_data.game_id)]
+    await asyncio.gather(*loads)
+
+def plan_play_by_play_updates(play_by_plays: List[PlayByPlayData]) -> List[PlayByPlayUpdate]:
+    """Diff each game's fresh play-by-play against what is already stored."""
+    updates = []
+    for play_by_play_data in play_by_plays:
+        update = play_tracker.plan(play_by_play_data)
+        if update.is_empty():
+            logger.info(f"No new plays for game {play_by_play_data.game_id}")
+            continue
+        updates.append(update)
+    return updates
+
+class CycleWrites:
+    """
+    The writes of one persistence batch, shared by the sync and async storage backends.
+
+    Selects the feeds that changed since their last write, plans the
+    play-by-play, game state and history operations once stored state is
+    loaded, and commits fingerprints and tracker state for the writes that
+    succeeded.
+    """
+
+    def __init__(self, results: List[GameFeeds]):
+        self.stored_box_scores: Set[str] = set()
+        self.play_by_plays: List[PlayByPlayData] = []
+        self.play_by_play_fingerprints: Dict[str, str] = {}
+        self.box_scores: List[BoxScoreData] = []
+        self.box_score_fingerprints: List[str] = []
+        self.updates: List[PlayByPlayUpdate] = []
+        self.history_entries = []
+        self.game_state_ids: List[str] = []
+        self.game_state_groups: List[List[Any]] = []
+        # Starters seed the lineups of a game the engine sees for the first time
+        self.latest_box_scores = {game_id: box_score_data for game_id, box_score_data, _ in results if box_score_data}
+        for game_id, box_score_data, play_by_play_data in results:
+            if play_by_play_data:
+                fingerprint = fingerprints.changed("play_by_play", play_by_play_data)
+                if fingerprint:
+                    self.play_by_plays.append(play_by_play_data)
+                    self.play_by_play_fingerprints[game_id] = fingerprint
+                else:
+                    logger.info(f"Play-by-play for game {game_id} unchanged, skipping write")
+            if box_score_data:
+                fingerprint = fingerprints.changed("box_score", box_score_data)
+                if fingerprint:
+                    self.box_scores.append(box_score_data)
+                    self.box_score_fingerprints.append(fingerprint)
+                else:
+                    self.stored_box_scores.add(game_id)
+                    logger.info(f"Box score for game {game_id} unchanged, skipping write")
+
+        for play_by_play_data in self.play_by_plays:
+            print(f"Play-by-play data for game {play_by_play_data.game_id}: {play_by_play_data}")
+
+    def plan(self) -> None:
+        """Diff against the loaded state; call after the trackers are loaded."""
+        self.updates = plan_play_by_play_updates(self.play_by_plays)
+        planned = {update.game_id for update in self.updates}
+        for game_id, fingerprint in self.play_by_play_fingerprints.items():
+            if game_id not in planned:
+                fingerprints.remember("play_by_play", game_id, fingerprint)
+        if GAME_STATE_ENABLED:
+            for play_by_play_data in self.play_by_plays:
+                game_id = play_by_play_data.game_id
+                if game_states.observe(play_by_play_data, self.latest_box_scores.get(game_id)):
+                    live_store.put_game_state(game_id, game_states.get(game_id).summary())
+            # Includes games whose last checkpoint write failed
+            planned_states = game_states.operations()
+            self.game_state_ids = list(planned_states)
+            self.game_state_groups = list(planned_states.values())
+        if BOX_SCORE_HISTORY_ENABLED:
+            # One history record per changed box score
+            self.history_entries = [entry for entry in map(history.plan, self.box_scores) if entry]
+
+    def play_by_play_operations(self) -> List[List[Any]]:
+        return [update.to_operations() for update in self.updates]
+
+    def history_operations(self) -> List[List[Any]]:
+        return [history.to_operations(entry) for entry in self.history_entries]
+
+    def game_state_operations(self) -> List[List[Any]]:
+        return self.game_state_groups
+
+    def commit_play_by_plays(self, saved: List[bool]) -> None:
+        for update, ok in zip(self.updates, saved):
+            if ok:
+                play_tracker.commit(update)
+                fingerprints.record("play_by_play", update.game_id, self.play_by_play_fingerprints[update.game_id])
+                if update.full_write:
+                    detail = f"{len(update.play_by_play_data.plays)} plays"
+                else:
+                    detail = (f"{len(update.new_plays)} new, {len(update.corrected_plays)} corrected, "
+                              f"{len(update.removed_action_numbers)} removed")
+                logger.info(f"Live play-by-play data for game {update.game_id} successfully saved to MongoDB ({detail})")
+            else:
+                # Part of the update may have landed; reload the stored plays before planning the next one
+                play_tracker.forget(update.game_id)
+                logger.error(f"Failed to save live play-by-play data for game {update.game_id} to MongoDB")
+
+    def commit_box_scores(self, saved: List[bool]) -> None:
+        for box_score_data, fingerprint, ok in zip(self.box_scores, self.box_score_fingerprints, saved):
+            if ok:
+                fingerprints.record("box_score", box_score_data.game_id, fingerprint)
+                self.stored_box_scores.add(box_score_data.game_id)
+                logger.info(f"Live box score for game {box_score_data.game_id} successfully saved to MongoDB")
             else:
-                db_client = MongoDBClient()
-                for game_id in active_game_ids:
-                    logger.info(f"Refreshing box score for {game_id}")
-                    box_score_data = NBAClient.get_live_box_score(game_id)
-                    play_by_play_data = NBAClient.get_live_play_by_play(game_id)
-                    if play_by_play_data:
-                        print(f"Play-by-play data for game {game_id}: {play_by_play_data}")
-                        if db_client.save(play_by_play_data, db_name="PlayByPlay", collection_name="play_by_play"):
-                            logger.info(f"Live play-by-play data for game {game_id} successfully saved to MongoDB")
-                        else:
-                            logger.error(f"Failed to save live play-by-play data for game {game_id} to MongoDB")
+                logger.error(f"Failed to save live box score for game {box_score_data.game_id} to MongoDB")
+
+    def commit_game_states(self, saved: List[bool]) -> None:
+        for game_id, ok in zip(self.game_state_ids, saved):
+            if ok:
+                game_states.commit(game_id)
+            else:
+                logger.error(f"Failed to save game state for game {game_id}, will retry with its next update")
+
+    def commit_history(self, saved: List[bool]) -> None:
+        for entry, ok in zip(self.history_entries, saved):
+            if ok:
+                history.commit(entry)
+                logger.debug(f"Box score history for game {entry.game_id}: {entry.kind} #{entry.seq}")
+            else:
+                logger.error(f"Failed to save box score history for game {entry.game_id}")
+
+    def finish(self) -> Set[str]:
+        """
+        Returns the IDs of games whose box score is now stored, either written
+        this cycle or skipped because it was unchanged.
+        """
+        stats = fingerprints.stats()
+        logger.info(f"Documents written: {stats['written']}, skipped as unchanged: {stats['skipped']}")
+        return self.stored_box_scores
+
+def save_cycle_results(db_client: MongoDBClient, results: List[GameFeeds]) -> Set[str]:
+    """Persist one batch of feeds with a single bulk write per collection, one collection after another."""
+    writes = CycleWrites(results)
+    load_play_by_play_state(db_client, writes.play_by_plays)
+    writes.plan()
+    writes.commit_play_by_plays(db_client.write_operations(writes.play_by_play_operations(),
+                                                           db_name="PlayByPlay", collection_name="play_by_play"))
+    writes.commit_game_states(db_client.write_operations(writes.game_state_operations(),
+                                                         db_name="PlayByPlay", collection_name="game_state"))
+    writes.commit_box_scores(db_client.save_many(writes.box_scores, db_name="Boxscores",
+                                                 collection_name="live_boxscores"))
+    writes.commit_history(db_client.write_operations(writes.history_operations(),
+                                                     db_name=history.db_name, collection_name=history.collection_name))
+    stored_box_scores = writes.finish()
+    aggregate_final_games(results, stored_box_scores)
+    return stored_box_scores
+
+async def save_cycle_results_async(db_client, results: List[GameFeeds]) -> Set[str]:
+    """Persist one batch of feeds through AsyncMongoDBClient, writing the collections concurrently."""
+    writes = CycleWrites(results)
+    await load_cycle_state_async(db_client, writes)
+    writes.plan()
+    play_by_plays_saved, game_states_saved, box_scores_saved, history_saved = await asyncio.gather(
+        db_client.write_operations(writes.play_by_play_operations(),
+                                   db_name="PlayByPlay", collection_name="play_by_play"),
+        db_client.write_operations(writes.game_state_operations(),
+                                   db_name="PlayByPlay", collection_name="game_state"),
+        db_client.save_many(writes.box_scores, db_name="Boxscores", collection_name="live_boxscores"),
+        db_client.write_operations(writes.history_operations(),
+                                   db_name=history.db_name, collection_name=history.collection_name),
+    )
+    writes.commit_play_by_plays(play_by_plays_saved)
+    writes.commit_game_states(game_states_saved)
+    writes.commit_box_scores(box_scores_saved)
+    writes.commit_history(history_saved)
+    return writes.finish()
+
+def aggregate_final_games(results: List[GameFeeds], stored_box_scores: Set[str]) -> None:
+    """Fold games whose final box score is stored into the season aggregates; games already applied are skipped."""
+    if not aggregates:
+        return
+    aggregates.apply_many(box_score_data for game_id, box_score_data, _ in results
+                          if is_final(box_score_data) and game_id in stored_box_scores)
+    # Also retries documents a failed save left behind
+    if aggregates.pending:
+        aggregates.save()
+
+def finish_games(results: List[GameFeeds], stored_box_scores: Set[str]) -> None:
+    """Stop polling games whose final box score has been written; the read API keeps them until they leave the scoreboard."""
+    for game_id, box_score_data, _ in results:
+        if is_final(box_score_data) and game_id in stored_box_scores:
+            lifecycle.mark_final_written(game_id)
+            scheduler.remove(game_id)
+            play_tracker.forget(game_id)
+            fingerprints.forget(game_id)
+            history.forget(game_id)
+            game_states.forget(game_id)
+            play_broker.finish(game_id)
+
+def group_feeds(batch: List[Tuple[Tuple[str, str], Any]]) -> List[GameFeeds]:
+    """Turn a persistence batch of (('box_score' | 'play_by_play', game_id), model) back into per-game feeds."""
+    feeds: Dict[str, List[Any]] = {}
+    for (kind, game_id), model in batch:
+        game_feeds = feeds.setdefault(game_id, [game_id, None, None])
+        game_feeds[1 if kind == "box_score" else 2] = model
+    return [tuple(game_feeds) for game_feeds in feeds.values()]
+
+async def persist_feeds(db_client: MongoDBClient, executor: ThreadPoolExecutor,
+                        batch: List[Tuple[Tuple[str, str], Any]]) -> None:
+    """Write-behind sink: save a batch on the writer thread, then retire the games whose final box score is stored."""
+    results = group_feeds(batch)
+    stored_box_scores = await asyncio.get_running_loop().run_in_executor(executor, save_cycle_results,
+                                                                         db_client, results)
+    finish_games(results, stored_box_scores)
+
+async def persist_feeds_async(db_client, batch: List[Tuple[Tuple[str, str], Any]]) -> None:
+    """Write-behind sink for STORAGE_BACKEND=async: save a batch on the event loop."""
+    results = group_feeds(batch)
+    stored_box_scores = await save_cycle_results_async(db_client, results)
+    # Aggregates load and write through the blocking client; that only happens when a game ends
+    await asyncio.get_running_loop().run_in_executor(None, aggregate_final_games, results, stored_box_scores)
+    finish_games(results, stored_box_scores)
+
+async def enqueue_feeds(persistence: WriteBehindQueue, results: List[GameFeeds]) -> None:
+    """Hand a cycle's feeds to the writer; a game still waiting from an earlier cycle is replaced."""
+    for game_id, box_score_data, play_by_play_data in results:
+        if box_score_data:
+            await persistence.put(("box_score", game_id), box_score_data)
+        if play_by_play_data:
+            await persistence.put(("play_by_play", game_id), play_by_play_data)
+
+async def update_live_games_loop(async_client=None):
+    """Fetch and update box scores for cached active games whenever the scheduler says they are due."""
+    executor = ThreadPoolExecutor(max_workers=LIVE_FETCH_MAX_WORKERS, thread_name_prefix="live-fetch")
+    semaphore = asyncio.Semaphore(LIVE_FETCH_CONCURRENCY)
+    persist_executor = None
+    if STORAGE_BACKEND == "async":
+        # Imported here so the default sync backend works with pymongo versions without asyncio support
+        from nba_stats.data.async_database import AsyncMongoDBClient
+        db_client = AsyncMongoDBClient()
+        persistence = WriteBehindQueue(functools.partial(persist_feeds_async, db_client))
+    else:
+        db_client = MongoDBClient()
+        # One writer thread, so the trackers behind save_cycle_results only ever see one batch at a time
+        persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-persist")
+        persistence = WriteBehindQueue(functools.partial(persist_feeds, db_client, persist_executor))
+    persistence.start()
+    try:
+        while True:
+            try:
+                scheduler.sync(lifecycle.active_game_ids())
+                delay = scheduler.seconds_until_next()
+                if delay is None:
+                    logger.info("No active games currently.")
+                    await asyncio.sleep(POLL_INTERVAL_SECONDS)
+                    continue
+                if delay > 0:
+                    # Wake up at least once per base interval to pick up newly active games
+                    await asyncio.sleep(min(delay, POLL_INTERVAL_SECONDS))
+                    continue
+
+                game_ids = scheduler.pop_due()
+                cycle_start = time.perf_counter()
+                results = await fetch_all_games(game_ids, executor, semaphore, async_client)
+                fetch_elapsed = time.perf_counter() - cycle_start
+                publish_live_feeds(results)
+
+                # Pick up rookies and two-way players missing from the static player list
+                player_index = PlayerIndex.shared()
+                for _, box_score_data, _ in results:
                     if box_score_data:
-                        if db_client.save(box_score_data, db_name="Boxscores", collection_name="live_boxscores"):
-                            logger.info(f"Live box score for game {game_id} successfully saved to MongoDB")
-                        else:
-                            logger.error(f"Failed to live static box score for game {game_id} to MongoDB")
-                    db_client.close()
-        except Exception as e:
-            print(f"Error updating box scores: {e}")
-        
-        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+                        player_index.refresh_from_box_score(box_score_data)
+
+                for game_id, box_score_data, _ in results:
+                    interval = scheduler.observe(game_id, box_score_data)
+                    logger.debug(f"Next poll for game {game_id} in {interval:.0f}s")
+
+                # Written by the persistence writer; only waits here if it has fallen max_pending games behind
+                await enqueue_feeds(persistence, results)
+
+                cycle_elapsed = time.perf_counter() - cycle_start
+                cache_stats = NBAClient.cache.stats()
+                persist_stats = persistence.metrics()
+                logger.info(f"Live cycle ({LIVE_FETCH_MODE}, {LIVE_FETCH_BACKEND}) for {len(game_ids)} games: "
+                            f"fetch {fetch_elapsed:.2f}s, total {cycle_elapsed:.2f}s, "
+                            f"cache {cache_stats['hits']} hits / {cache_stats['misses']} misses / "
+                            f"{cache_stats['coalesced']} coalesced, outcomes {dict(fetch_outcomes)}, "
+                            f"persist queue {persist_stats['depth']} pending / "
+                            f"last flush {persist_stats['last_flush_ms']}ms")
+            except Exception as e:
+                print(f"Error updating box scores: {e}")
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+    finally:
+        # Drain pending writes before the connection goes away
+        await persistence.close()
+        if persist_executor:
+            persist_executor.shutdown(wait=True)
+            db_client.close()
+        else:
+            await db_client.close()
+        executor.shutdown(wait=False)
 
 async def main():
     """Run both tasks concurrently."""
-    await asyncio.gather(
-        refresh_active_games_cache(),
-        update_live_games_loop()
-    )
+    if VERIFY_INDEXES_ON_STARTUP:
+        await asyncio.get_running_loop().run_in_executor(None, IndexManager().verify)
+    async_client = None
+    if LIVE_FETCH_BACKEND == "aiohttp":
+        # Imported here so the default threads backend does not need aiohttp installed
+        from nba_stats.api.async_client import AsyncNBAClient
+        async_client = AsyncNBAClient()
+    api_runner = None
+    if LIVE_API_ENABLED:
+        from nba_stats.live.api import start_live_api
+        api_runner = await start_live_api(live_store, play_broker)
+    try:
+        await asyncio.gather(
+            refresh_active_games_cache(async_client),
+            update_live_games_loop(async_client)
+        )
+    finally:
+        if api_runner:
+            # Streams only end when their queue says so, so close them before stopping the server
+            play_broker.close()
+            await api_runner.cleanup()
+        if async_client:
+            await async_client.close()
 
 def run_backend_live_updates():
     try:
@@ -73,6 +543,8 @@ def run_backend_live_updates():
         print("\nShutting down live updater cleanly...")
     except Exception as e:
         print(f"An error occurred: {e}")
+    finally:
+        MongoDBClient.close_pool()
 
 if __name__ == "__main__":
     run_backend_live_updates()
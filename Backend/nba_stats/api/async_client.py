@@ -0,0 +1,136 @@
+import logging
+from typing import Any, Dict, Optional, Type
+
+import aiohttp
+from nba_api.live.nba.endpoints import boxscore as live_boxscore, scoreboard
+from nba_api.live.nba.endpoints import playbyplay
+
+from ..config import (
+    NBA_LIVE_BASE_URL,
+    LIVE_REQUEST_TIMEOUT_SECONDS,
+    LIVE_HTTP_CONNECTION_LIMIT,
+    LIVE_HTTP_KEEPALIVE_SECONDS,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTLS,
+)
+from ..data.models import BoxScoreData, ScoreboardData, PlayByPlayData
+from .cache import ResponseCache
+from .http import LIVE_HEADERS, NOT_MODIFIED, ValidatorStore, build_endpoint
+from .nba_client import NBAClient
+from .resilience import FetchResult, get_guard
+
+logger = logging.getLogger(__name__)
+
+class AsyncNBAClient:
+    """
+    Fetches the live endpoints with aiohttp on the event loop.
+
+    All requests share one keep-alive ClientSession, so connections to the CDN
+    are reused, and every request has its own timeout. Responses go through
+    the same conditional validators, endpoint guards and parse functions as
+    NBAClient, and the fetch_* methods return the same FetchResults. There is
+    no read-through cache here, since its single-flight waits would block the
+    loop. The last good result per game is still kept and attached to the
+    NOT_MODIFIED result of a 304, so a caller whose write of that result
+    failed has the model to retry with on the next poll.
+    """
+
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 timeout: float = LIVE_REQUEST_TIMEOUT_SECONDS,
+                 connection_limit: int = LIVE_HTTP_CONNECTION_LIMIT,
+                 session: Optional[aiohttp.ClientSession] = None):
+        self.base_url = base_url or NBA_LIVE_BASE_URL
+        self.headers = headers if headers is not None else dict(LIVE_HEADERS)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.connection_limit = connection_limit
+        self.validators = ValidatorStore()
+        # Only written and revalidated, never read by TTL
+        self.last_results = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTLS)
+        self._session = session
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so it binds to the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.connection_limit,
+                                             keepalive_timeout=LIVE_HTTP_KEEPALIVE_SECONDS)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> "AsyncNBAClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def url_for(self, path: str) -> str:
+        return self.base_url.rstrip('/') + '/' + path.lstrip('/')
+
+    async def load_endpoint(self, endpoint_cls: Type[Any], path: str, **endpoint_kwargs):
+        """
+        Conditionally fetch a live endpoint and build the nba_api endpoint object from the body.
+
+        Returns NOT_MODIFIED instead when the server answers 304. The response's
+        validators are stored once the endpoint has been parsed.
+        """
+        url = self.url_for(path)
+        headers = self.validators.conditional_headers(url, self.headers)
+        try:
+            async with self._get_session().get(url, headers=headers) as response:
+                if response.status == 304:
+                    logger.debug(f"[AsyncHTTP] {url} not modified")
+                    return NOT_MODIFIED
+                response.raise_for_status()
+                body = await response.read()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+                status_code = response.status
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError) as e:
+            # Surface transport failures as ConnectionError so the guard retries them
+            raise ConnectionError(str(e) or type(e).__name__) from e
+
+        return build_endpoint(endpoint_cls, url, status_code, body.decode('utf-8'), etag, last_modified,
+                              **endpoint_kwargs)
+
+    async def _fetch_and_parse(self, game_id: str, endpoint_cls: Type[Any], path: str,
+                               parse_fn, model_cls: Type[Any],
+                               endpoint_kwargs: Optional[Dict[str, Any]] = None) -> FetchResult:
+        result = await get_guard(model_cls.__name__).call_async(
+            lambda: self.load_endpoint(endpoint_cls, path, **(endpoint_kwargs or {}))
+        )
+        return self.last_results.put(model_cls.__name__, game_id,
+                                     NBAClient._parse_result(result, game_id, parse_fn, model_cls, self.validators))
+
+    async def fetch_live_box_score(self, game_id: str) -> FetchResult:
+        return await self._fetch_and_parse(
+            game_id,
+            live_boxscore.BoxScore,
+            live_boxscore.BoxScore.endpoint_url.format(game_id=game_id),
+            NBAClient._parse_live_box_score,
+            BoxScoreData,
+            {'game_id': game_id}
+        )
+
+    async def fetch_scoreboard(self) -> FetchResult:
+        return await self._fetch_and_parse(
+            '',
+            scoreboard.ScoreBoard,
+            scoreboard.ScoreBoard.endpoint_url,
+            NBAClient._parse_scoreboard_data,
+            ScoreboardData
+        )
+
+    async def fetch_live_play_by_play(self, game_id: str) -> FetchResult:
+        return await self._fetch_and_parse(
+            game_id,
+            playbyplay.PlayByPlay,
+            playbyplay.PlayByPlay.endpoint_url.format(game_id=game_id),
+            NBAClient._parse_live_play_by_play,
+            PlayByPlayData,
+            {'game_id': game_id}
+        )
@@ -0,0 +1,125 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .resilience import FetchResult, FetchStatus
+
+logger = logging.getLogger(__name__)
+
+class _Flight:
+    """A fetch in progress that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+
+class ResponseCache:
+    """
+    TTL + LRU cache of parsed responses with single-flight fetching.
+
+    Entries live for a TTL chosen per endpoint, and the least recently used
+    entry is evicted once max_entries is reached. Concurrent misses for the
+    same key share one in-flight fetch. Expired entries are kept until evicted
+    so a NOT_MODIFIED reply can revalidate them instead of dropping the data;
+    callers still get NOT_MODIFIED, with the revalidated model as its data.
+    Cached models are shared between callers and must be treated as read-only.
+
+    Fetches return FetchResults. Only OK results are cached; throttled, failed
+    and unparseable results pass through so the next caller tries again.
+    """
+
+    def __init__(self, max_entries: int, ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, Hashable], _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get_or_fetch(self, endpoint: str, key: Hashable, fetch: Callable[[], FetchResult]) -> FetchResult:
+        """Return the cached value for (endpoint, key), fetching it at most once at a time."""
+        cache_key = (endpoint, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+            flight = self._in_flight.get(cache_key)
+            if flight is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                flight = self._in_flight[cache_key] = _Flight()
+                self.misses += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            return flight.value
+
+        value = None
+        try:
+            value = fetch()
+        finally:
+            with self._lock:
+                value = self._store(endpoint, cache_key, value)
+                del self._in_flight[cache_key]
+            flight.value = value
+            flight.done.set()
+        return value
+
+    def put(self, endpoint: str, key: Hashable, value: FetchResult) -> FetchResult:
+        """
+        Store a result fetched without get_or_fetch and return what callers should
+        see: for NOT_MODIFIED, a NOT_MODIFIED result carrying the stored data.
+        """
+        with self._lock:
+            return self._store(endpoint, (endpoint, key), value)
+
+    def _store(self, endpoint: str, cache_key: Tuple[str, Hashable], value: Optional[FetchResult]) -> Optional[FetchResult]:
+        """Store a fetched result and return what callers should see. Must hold the lock."""
+        expires_at = self._clock() + self.ttls.get(endpoint, self.default_ttl)
+        if value is None:
+            return value
+        stored = value
+        if value.status is FetchStatus.NOT_MODIFIED:
+            stale = self._entries.get(cache_key)
+            if stale is None:
+                return value
+            stored = stale[1]
+            value = FetchResult(FetchStatus.NOT_MODIFIED, stored.data, attempts=value.attempts)
+        elif not value.ok:
+            return value
+        self._entries[cache_key] = (expires_at, stored)
+        self._entries.move_to_end(cache_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def invalidate(self, endpoint: str, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop((endpoint, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+            }
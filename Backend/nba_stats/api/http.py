@@ -0,0 +1,158 @@
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple, Type
+
+import requests
+from nba_api.library.http import NBAResponse
+from nba_api.live.nba.library.http import NBALiveHTTP
+
+from ..config import NBA_LIVE_BASE_URL, LIVE_REQUEST_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# nba_api's live headers pin Host to cdn.nba.com, which breaks other base URLs
+LIVE_HEADERS = {key: value for key, value in NBALiveHTTP.headers.items() if key.lower() != 'host'}
+LIVE_HEADERS['Accept-Encoding'] = 'gzip, deflate'
+
+class _NotModified:
+    """Marker returned when the upstream feed has not changed since the last fetch."""
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __repr__(self) -> str:
+        return 'NOT_MODIFIED'
+
+NOT_MODIFIED = _NotModified()
+
+class ConditionalResponse:
+    """Result of a conditional GET."""
+
+    def __init__(self, url: str, status_code: int, text: Optional[str] = None):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status_code == 304
+
+class ValidatorStore:
+    """ETag / Last-Modified validators of the last good response per URL."""
+
+    def __init__(self):
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def conditional_headers(self, url: str, headers: Dict[str, str]) -> Dict[str, str]:
+        """A copy of headers with If-None-Match / If-Modified-Since added for the URL."""
+        headers = dict(headers)
+        with self._lock:
+            etag, last_modified = self._validators.get(url, (None, None))
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def remember(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._validators[url] = (etag, last_modified)
+
+    def forget(self, url: str) -> None:
+        with self._lock:
+            self._validators.pop(url, None)
+
+    def remember_endpoint(self, endpoint: Any) -> None:
+        """Store the validators an endpoint from build_endpoint was served with; other endpoints are ignored."""
+        response = getattr(endpoint, 'nba_response', None)
+        if isinstance(response, ValidatedResponse):
+            self.remember(response.get_url(), response.etag, response.last_modified)
+
+class ValidatedResponse(NBAResponse):
+    """An NBAResponse that also carries the ETag / Last-Modified it was served with."""
+
+    def __init__(self, response, status_code, url, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        super().__init__(response=response, status_code=status_code, url=url)
+        self.etag = etag
+        self.last_modified = last_modified
+
+def build_endpoint(endpoint_cls: Type[Any], url: str, status_code: int, text: str,
+                   etag: Optional[str] = None, last_modified: Optional[str] = None, **endpoint_kwargs):
+    """
+    Build an nba_api live endpoint object from a response body fetched elsewhere.
+
+    The validators are only attached to it. They are stored with
+    ValidatorStore.remember_endpoint once the endpoint has been parsed, so a
+    body that fails to parse is downloaded again instead of answered with 304.
+    """
+    endpoint = endpoint_cls(get_request=False, **endpoint_kwargs)
+    contents = NBALiveHTTP().clean_contents(text)
+    endpoint.nba_response = ValidatedResponse(contents, status_code, url, etag, last_modified)
+    endpoint.load_response()
+    return endpoint
+
+class ConditionalHTTPClient:
+    """
+    Fetches live feed JSON with conditional requests.
+
+    The ETag and Last-Modified validators of the last successfully parsed
+    response are kept per URL and sent back as If-None-Match /
+    If-Modified-Since. A 304 reply skips the download, JSON decoding and
+    parsing entirely. Validators are per process, so one client should back
+    one consumer of each feed.
+    """
+
+    def __init__(self,
+                 base_url: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 timeout: float = LIVE_REQUEST_TIMEOUT_SECONDS,
+                 session: Optional[requests.Session] = None):
+        self.base_url = base_url or NBA_LIVE_BASE_URL
+        self.headers = headers if headers is not None else dict(LIVE_HEADERS)
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.validators = ValidatorStore()
+
+    def url_for(self, path: str) -> str:
+        return self.base_url.rstrip('/') + '/' + path.lstrip('/')
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers for a URL, including any stored validators."""
+        return self.validators.conditional_headers(url, self.headers)
+
+    def remember(self, url: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """Store the validators of a response that was parsed successfully."""
+        self.validators.remember(url, etag, last_modified)
+
+    def forget(self, url: str) -> None:
+        """Drop a URL's validators so the next fetch downloads the full body."""
+        self.validators.forget(url)
+
+    def get(self, path: str) -> Tuple[ConditionalResponse, Dict[str, Optional[str]]]:
+        """Send a conditional GET. Returns the response and the validators it carried."""
+        url = self.url_for(path)
+        response = self.session.get(url, headers=self.conditional_headers(url), timeout=self.timeout)
+        if response.status_code == 304:
+            logger.debug(f"[HTTP] {url} not modified")
+            return ConditionalResponse(url, 304), {}
+        response.raise_for_status()
+        validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+        # JSON is UTF-8; decoding directly skips requests' charset detection
+        return ConditionalResponse(url, response.status_code, response.content.decode('utf-8')), validators
+
+    def load_endpoint(self, endpoint_cls: Type[Any], path: str, **endpoint_kwargs):
+        """
+        Fetch a live endpoint and build the nba_api endpoint object from the body.
+
+        Returns NOT_MODIFIED instead when the server answers 304. The response's
+        validators are stored by the caller with validators.remember_endpoint
+        once the endpoint has been parsed.
+        """
+        response, validators = self.get(path)
+        if response.not_modified:
+            return NOT_MODIFIED
+        return build_endpoint(endpoint_cls, response.url, response.status_code, response.text,
+                              validators.get('etag'), validators.get('last_modified'), **endpoint_kwargs)
@@ -1,20 +1,40 @@
 import logging
-import pandas as pd
 from typing import Type, Optional, Dict, Any
 
 from nba_api.live.nba.endpoints import boxscore as live_boxscore, scoreboard
 from nba_api.live.nba.endpoints import playbyplay
 from nba_api.stats.static import players
-from nba_api.stats.endpoints import BoxScoreTraditionalV2 as static_boxscore
 
+from ..config import (
+    LIVE_CONDITIONAL_REQUESTS,
+    RESPONSE_CACHE_ENABLED,
+    RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTLS,
+)
 from ..data.models import BoxScoreData, StaticBoxScoreData, ScoreboardData, PlayByPlayData
+from .cache import ResponseCache
+from .http import ConditionalHTTPClient, ValidatorStore
+from .resilience import EndpointGuard, FetchResult, FetchStatus, get_guard
 
 logger = logging.getLogger(__name__)
 
+# LeagueGameLog season types by backfill name
+SEASON_TYPE_NAMES = {
+    'preseason': 'Pre Season',
+    'regular': 'Regular Season',
+    'playoffs': 'Playoffs',
+    'allstar': 'All Star',
+    'playin': 'PlayIn',
+}
+
+class EmptyFeedError(LookupError):
+    """The endpoint answered, but has no data for the game (e.g. a game ID past the end of a season)."""
+
 # Column mappings
 PLAYER_STATS_COLUMNS_MAPPING = {
     'TEAM_ABBREVIATION': 'TEAM_ABBREVIATION',
     'PLAYER_NAME': 'name',
+    'PLAYER_ID': 'personId',
     'START_POSITION': 'position',
     'MIN': 'statistics_minutesCalculated',
     'PTS': 'statistics_points',
@@ -31,33 +51,100 @@ PLAYER_STATS_COLUMNS_MAPPING = {
     'FG3_PCT': 'statistics_threePointersPercentage',
 }
 
+# Live player rows map straight from each player's dict; 'statistics_' columns come from its nested statistics dict
+STATISTICS_PREFIX = 'statistics_'
+LIVE_PLAYER_FIELDS = [
+    (new_col, source_col)
+    for new_col, source_col in PLAYER_STATS_COLUMNS_MAPPING.items()
+    if new_col != 'TEAM_ABBREVIATION' and not source_col.startswith(STATISTICS_PREFIX)
+]
+LIVE_PLAYER_STATISTICS_FIELDS = [
+    (new_col, source_col[len(STATISTICS_PREFIX):])
+    for new_col, source_col in PLAYER_STATS_COLUMNS_MAPPING.items()
+    if source_col.startswith(STATISTICS_PREFIX)
+]
+
 STATIC_PLAYER_STATS_COLUMNS = [
-    'TEAM_ABBREVIATION', 'PLAYER_NAME', 'START_POSITION',
+    'TEAM_ABBREVIATION', 'PLAYER_NAME', 'PLAYER_ID', 'START_POSITION',
     'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TO',
     'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT'
 ]
 
 class NBAClient:
-    """Client for interacting with NBA APIs."""
+    """
+    Client for interacting with NBA APIs.
+
+    With LIVE_CONDITIONAL_REQUESTS on, the live endpoints are fetched through
+    a ConditionalHTTPClient and the get_live_*/get_scoreboard methods return
+    NOT_MODIFIED (which is falsy) when the feed has not changed.
+
+    With RESPONSE_CACHE_ENABLED on, parsed models are shared between callers
+    through a TTL + LRU cache, and concurrent requests for the same game share
+    one fetch. A NOT_MODIFIED reply then refreshes the cached model, and the
+    fetch_* methods return a NOT_MODIFIED result with that model as its data.
+
+    Every upstream call goes through the endpoint's guard (token bucket,
+    retries with jittered backoff, circuit breaker). The fetch_* methods
+    return a FetchResult saying what happened; the get_* methods keep the
+    old contract and return the model, NOT_MODIFIED or None.
+    """
+
+    live_http = ConditionalHTTPClient()
+    cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTLS)
 
     @staticmethod
     def _fetch_and_parse(game_id: str, 
                          fetch_fn, 
                          parse_fn, 
-                         model_cls: Type[Any]) -> Optional[Any]:
+                         model_cls: Type[Any]) -> FetchResult:
         """
-        General method to fetch, parse and instantiate model.
+        General method to fetch, parse and instantiate model, through the response cache.
         """
+        if not RESPONSE_CACHE_ENABLED:
+            return NBAClient._fetch_and_parse_uncached(game_id, fetch_fn, parse_fn, model_cls)
+        return NBAClient.cache.get_or_fetch(
+            model_cls.__name__,
+            game_id,
+            lambda: NBAClient._fetch_and_parse_uncached(game_id, fetch_fn, parse_fn, model_cls)
+        )
+
+    @staticmethod
+    def _fetch_and_parse_uncached(game_id: str,
+                                  fetch_fn,
+                                  parse_fn,
+                                  model_cls: Type[Any],
+                                  guard: Optional[EndpointGuard] = None) -> FetchResult:
+        """
+        Fetch through the endpoint guard, then parse and instantiate model without consulting the cache.
+        """
+        result = (guard or get_guard(model_cls.__name__)).call(lambda: fetch_fn(game_id))
+        return NBAClient._parse_result(result, game_id, parse_fn, model_cls, NBAClient.live_http.validators)
+
+    @staticmethod
+    def _parse_result(result: FetchResult, game_id: str, parse_fn, model_cls: Type[Any],
+                      validators: Optional[ValidatorStore] = None) -> FetchResult:
+        """
+        Turn an OK fetch result's endpoint object into the model; other results pass through.
+        The endpoint's conditional validators go into validators only if it parsed.
+        """
+        if not result.ok:
+            return result
         try:
-            raw_data = fetch_fn(game_id)
-            parsed_data = parse_fn(raw_data)
-            return model_cls(**parsed_data)
+            endpoint = result.data
+            parsed_data = parse_fn(endpoint)
+            result.data = model_cls(**parsed_data)
+            if validators is not None:
+                validators.remember_endpoint(endpoint)
+            return result
+        except EmptyFeedError as e:
+            logger.warning(f"[NBAClient] No {model_cls.__name__} for game {game_id}: {e}")
+            return FetchResult(FetchStatus.NOT_FOUND, error=e, attempts=result.attempts)
         except Exception as e:
-            logger.error(f"[NBAClient] Error fetching {model_cls.__name__} for game {game_id}: {e}")
-            return None
+            logger.error(f"[NBAClient] Error parsing {model_cls.__name__} for game {game_id}: {e}")
+            return FetchResult(FetchStatus.PARSE_ERROR, error=e, attempts=result.attempts)
 
     @staticmethod
-    def get_live_box_score(game_id: str) -> Optional[BoxScoreData]:
+    def fetch_live_box_score(game_id: str) -> FetchResult:
         return NBAClient._fetch_and_parse(
             game_id,
             NBAClient._fetch_live_data,
@@ -66,25 +153,60 @@ class NBAClient:
         )
 
     @staticmethod
-    def get_static_box_score(game_id: str) -> Optional[StaticBoxScoreData]:
+    def fetch_static_box_score(game_id: str, guard: Optional[EndpointGuard] = None) -> FetchResult:
+        """
+        A guard passed in replaces the endpoint's shared one and skips the response
+        cache, for bulk callers such as the backfill that pace themselves.
+        """
+        if guard is not None:
+            return NBAClient._fetch_and_parse_uncached(
+                game_id,
+                NBAClient._fetch_static_data,
+                NBAClient._parse_static_box_score,
+                StaticBoxScoreData,
+                guard
+            )
         return NBAClient._fetch_and_parse(
             game_id,
             NBAClient._fetch_static_data,
             NBAClient._parse_static_box_score,
             StaticBoxScoreData
         )
-    
+
     @staticmethod
-    def get_scoreboard() -> Optional[ScoreboardData]:
+    def fetch_season_game_ids(season: str, season_type: str = 'regular',
+                              guard: Optional[EndpointGuard] = None) -> FetchResult:
+        """
+        The game IDs a season actually has, from the league game log, in game order.
+        """
+        def fetch():
+            # Imported here so the live polling path never loads pandas via nba_api.stats
+            from nba_api.stats.endpoints import LeagueGameLog
+            return LeagueGameLog(season=season, season_type_all_star=SEASON_TYPE_NAMES[season_type])
+
+        result = (guard or get_guard(StaticBoxScoreData.__name__)).call(fetch)
+        if not result.ok:
+            return result
+        try:
+            # One row per team and game
+            rows = result.data.get_normalized_dict()['LeagueGameLog']
+            result.data = sorted({row['GAME_ID'] for row in rows})
+            return result
+        except Exception as e:
+            logger.error(f"[NBAClient] Error parsing the {season} {season_type} game log: {e}")
+            return FetchResult(FetchStatus.PARSE_ERROR, error=e, attempts=result.attempts)
+
+    @staticmethod
+    def fetch_scoreboard() -> FetchResult:
         return NBAClient._fetch_and_parse(
             game_id='',
             fetch_fn=NBAClient._fetch_scoreboard_data,
             parse_fn=NBAClient._parse_scoreboard_data,
             model_cls=ScoreboardData
         )
-    
+
     @staticmethod
-    def get_live_play_by_play(game_id: str) -> Optional[PlayByPlayData]:
+    def fetch_live_play_by_play(game_id: str) -> FetchResult:
         return NBAClient._fetch_and_parse(
             game_id=game_id,
             fetch_fn=NBAClient._fetch_live_play_by_play,
@@ -92,40 +214,69 @@ class NBAClient:
             model_cls=PlayByPlayData
         )
 
+    @staticmethod
+    def get_live_box_score(game_id: str) -> Optional[BoxScoreData]:
+        return NBAClient.fetch_live_box_score(game_id).value
+
+    @staticmethod
+    def get_static_box_score(game_id: str) -> Optional[StaticBoxScoreData]:
+        return NBAClient.fetch_static_box_score(game_id).value
+    
+    @staticmethod
+    def get_scoreboard() -> Optional[ScoreboardData]:
+        return NBAClient.fetch_scoreboard().value
+    
+    @staticmethod
+    def get_live_play_by_play(game_id: str) -> Optional[PlayByPlayData]:
+        return NBAClient.fetch_live_play_by_play(game_id).value
+
     @staticmethod
     def _fetch_live_data(game_id: str):
+        if LIVE_CONDITIONAL_REQUESTS:
+            return NBAClient.live_http.load_endpoint(
+                live_boxscore.BoxScore,
+                live_boxscore.BoxScore.endpoint_url.format(game_id=game_id),
+                game_id=game_id
+            )
         return live_boxscore.BoxScore(game_id=game_id)
 
     @staticmethod
     def _fetch_static_data(game_id: str):
+        # Imported here so the live polling path never loads pandas via nba_api.stats
+        from nba_api.stats.endpoints import BoxScoreTraditionalV2 as static_boxscore
         return static_boxscore(game_id=game_id)
 
     @staticmethod
     def _fetch_scoreboard_data(game_id: str):
+        if LIVE_CONDITIONAL_REQUESTS:
+            return NBAClient.live_http.load_endpoint(scoreboard.ScoreBoard, scoreboard.ScoreBoard.endpoint_url)
         return scoreboard.ScoreBoard()
     
     @staticmethod
     def _fetch_live_play_by_play(game_id: str):
+        if LIVE_CONDITIONAL_REQUESTS:
+            return NBAClient.live_http.load_endpoint(
+                playbyplay.PlayByPlay,
+                playbyplay.PlayByPlay.endpoint_url.format(game_id=game_id),
+                game_id=game_id
+            )
         return playbyplay.PlayByPlay(game_id=game_id)
 
     @staticmethod
     def _parse_live_box_score(data: live_boxscore.BoxScore) -> Dict[str, Any]:
         # Parse player stats
-        home_players = data.home_team_player_stats.get_dict()
-        away_players = data.away_team_player_stats.get_dict()
-        home_df = pd.DataFrame(home_players)
-        away_df = pd.DataFrame(away_players)
-
-        home_df['TEAM_ABBREVIATION'] = data.home_team.get_dict()['teamTricode']
-        away_df['TEAM_ABBREVIATION'] = data.away_team.get_dict()['teamTricode']
-
-        all_players_df = pd.concat([home_df, away_df])
-
-        player_stats_df = pd.json_normalize(all_players_df.to_dict('records'), sep='_')
-
-        player_stats_clean = pd.DataFrame()
-        for new_col, source_col in PLAYER_STATS_COLUMNS_MAPPING.items():
-            player_stats_clean[new_col] = player_stats_df.get(source_col)
+        player_stats = []
+        for team, team_players in [(data.home_team, data.home_team_player_stats),
+                                   (data.away_team, data.away_team_player_stats)]:
+            team_abbreviation = team.get_dict()['teamTricode']
+            for player in team_players.get_dict():
+                statistics = player.get('statistics') or {}
+                row = {'TEAM_ABBREVIATION': team_abbreviation}
+                for new_col, source_col in LIVE_PLAYER_FIELDS:
+                    row[new_col] = player.get(source_col)
+                for new_col, source_col in LIVE_PLAYER_STATISTICS_FIELDS:
+                    row[new_col] = statistics.get(source_col)
+                player_stats.append(row)
 
         # Parse team stats
         home_team_stats = data.home_team_stats.get_dict()
@@ -148,20 +299,24 @@ class NBAClient:
         return {
             'game_id': data.game_id,
             'game_status': game_details.get('gameStatusText', ''),
+            'period': game_details.get('period'),
+            'game_clock': game_details.get('gameClock'),
             'arena': arena_info,
-            'player_stats': player_stats_clean.to_dict('records'),
+            'player_stats': player_stats,
             'team_stats': [home_team_stats, away_team_stats]
         }
 
     @staticmethod
-    def _parse_static_box_score(data: static_boxscore) -> Dict[str, Any]:
+    def _parse_static_box_score(data) -> Dict[str, Any]:
         player_stats = data.player_stats.get_data_frame()
         team_stats = data.team_stats.get_data_frame()
+        if player_stats.empty:
+            raise EmptyFeedError("no player stats")
 
         player_stats_clean = player_stats[STATIC_PLAYER_STATS_COLUMNS]
 
         return {
-            'game_id': data.player_stats.get_data_frame()['GAME_ID'].iloc[0],
+            'game_id': player_stats['GAME_ID'].iloc[0],
             'player_stats': player_stats_clean.to_dict('records'),
             'team_stats': team_stats.to_dict('records')
         }
@@ -0,0 +1,301 @@
+import asyncio
+import enum
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import requests
+
+from ..config import (
+    RATE_LIMITS,
+    LIVE_RATE_LIMIT,
+    RATE_LIMIT_MAX_WAIT_SECONDS,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+)
+from .http import NOT_MODIFIED
+
+logger = logging.getLogger(__name__)
+
+class FetchStatus(enum.Enum):
+    """Outcome of a guarded upstream call."""
+    OK = 'ok'
+    NOT_MODIFIED = 'not_modified'
+    NOT_FOUND = 'not_found'
+    THROTTLED = 'throttled'
+    UPSTREAM_DOWN = 'upstream_down'
+    PARSE_ERROR = 'parse_error'
+
+class FetchResult:
+    """
+    Typed result of a fetch: a status plus the data when there is any.
+
+    A NOT_MODIFIED result served through a response cache carries the
+    cached model as its data.
+    """
+
+    def __init__(self, status: FetchStatus, data: Any = None, error: Optional[BaseException] = None, attempts: int = 0):
+        self.status = status
+        self.data = data
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def ok(self) -> bool:
+        return self.status is FetchStatus.OK
+
+    @property
+    def value(self) -> Any:
+        """The data for OK, NOT_MODIFIED for an unchanged feed, else None (the legacy get_* contract)."""
+        if self.status is FetchStatus.OK:
+            return self.data
+        if self.status is FetchStatus.NOT_MODIFIED:
+            return NOT_MODIFIED
+        return None
+
+    def __repr__(self) -> str:
+        return f"FetchResult({self.status.value}, attempts={self.attempts}, error={self.error!r})"
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_reserve(self, max_wait: float) -> Optional[float]:
+        """
+        Reserve a token. Returns how long to wait before using it, or None if
+        that would exceed max_wait (nothing is reserved then).
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        wait = self.try_reserve(float('inf'))
+        if wait:
+            time.sleep(wait)
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive upstream failures, rejects
+    calls for `reset_timeout` seconds, then lets one trial call through.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"[CircuitBreaker] {self.name} closed")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"[CircuitBreaker] {self.name} opened after {self._failures} failures")
+                self.state = self.OPEN
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Hand back a half-open trial that never got an answer either way, e.g. because it was throttled."""
+        with self._lock:
+            self._trial_in_flight = False
+
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter."""
+
+    def __init__(self, max_attempts: int, base_delay: float, max_delay: float):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Seconds to wait before retrying after the given zero-based attempt."""
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+def _retry_after(error: Optional[BaseException]) -> Optional[float]:
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None) or {}
+    value = headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def _status_code(error: BaseException) -> Optional[int]:
+    response = getattr(error, 'response', None)
+    if response is not None and hasattr(response, 'status_code'):
+        return response.status_code
+    # aiohttp.ClientResponseError carries the status on the exception itself
+    status = getattr(error, 'status', None)
+    return status if isinstance(status, int) else None
+
+def classify_error(error: BaseException) -> Tuple[FetchStatus, bool]:
+    """Map an exception to a fetch status and whether retrying can help."""
+    status_code = _status_code(error)
+    if status_code is not None:
+        if status_code in (403, 429):
+            return FetchStatus.THROTTLED, True
+        if status_code == 404:
+            return FetchStatus.NOT_FOUND, False
+        return FetchStatus.UPSTREAM_DOWN, status_code >= 500
+    if isinstance(error, (requests.Timeout, requests.ConnectionError, TimeoutError, ConnectionError)):
+        return FetchStatus.UPSTREAM_DOWN, True
+    return FetchStatus.PARSE_ERROR, False
+
+class EndpointGuard:
+    """Rate limit, retries and circuit breaker for one upstream endpoint."""
+
+    def __init__(self, name: str, bucket: TokenBucket, retry_policy: RetryPolicy, breaker: CircuitBreaker,
+                 max_wait: float = RATE_LIMIT_MAX_WAIT_SECONDS):
+        self.name = name
+        self.bucket = bucket
+        self.retry_policy = retry_policy
+        self.breaker = breaker
+        self.max_wait = max_wait
+
+    def _admit(self, attempt: int) -> Tuple[Optional[FetchResult], float]:
+        """Check the breaker and reserve a token. Returns a rejection or the time to wait."""
+        if not self.breaker.allow():
+            return FetchResult(FetchStatus.UPSTREAM_DOWN, attempts=attempt), 0.0
+        wait = self.bucket.try_reserve(self.max_wait)
+        if wait is None:
+            self.breaker.release_trial()
+            return FetchResult(FetchStatus.THROTTLED, attempts=attempt), 0.0
+        return None, wait
+
+    def _on_error(self, error: Exception, attempt: int) -> Tuple[Optional[FetchResult], float]:
+        """Record a failed attempt. Returns the final result, or the delay before retrying."""
+        status, retryable = classify_error(error)
+        if status is FetchStatus.UPSTREAM_DOWN:
+            self.breaker.record_failure()
+        elif status is FetchStatus.THROTTLED:
+            # Says nothing about whether the upstream recovered; let the next call try again
+            self.breaker.release_trial()
+        else:
+            # The upstream answered; only the payload was unusable
+            self.breaker.record_success()
+        if not retryable or attempt >= self.retry_policy.max_attempts \
+                or self.breaker.state == CircuitBreaker.OPEN:
+            logger.error(f"[{self.name}] {status.value} after {attempt} attempt(s): {error}")
+            return FetchResult(status, error=error, attempts=attempt), 0.0
+        delay = self.retry_policy.delay(attempt - 1, error)
+        logger.warning(f"[{self.name}] {status.value} on attempt {attempt}, retrying in {delay:.2f}s: {error}")
+        return None, delay
+
+    def _on_success(self, data: Any, attempt: int) -> FetchResult:
+        self.breaker.record_success()
+        if data is NOT_MODIFIED:
+            return FetchResult(FetchStatus.NOT_MODIFIED, attempts=attempt)
+        return FetchResult(FetchStatus.OK, data, attempts=attempt)
+
+    def call(self, fetch: Callable[[], Any]) -> FetchResult:
+        """Run a fetch under the guard and return a typed result."""
+        attempt = 0
+        while True:
+            rejected, wait = self._admit(attempt)
+            if rejected:
+                return rejected
+            if wait:
+                time.sleep(wait)
+            attempt += 1
+            try:
+                data = fetch()
+            except Exception as e:
+                result, delay = self._on_error(e, attempt)
+                if result:
+                    return result
+                time.sleep(delay)
+                continue
+            return self._on_success(data, attempt)
+
+    async def call_async(self, fetch: Callable[[], Awaitable[Any]]) -> FetchResult:
+        """Like call(), for a coroutine fetch; waits with asyncio.sleep so the event loop keeps running."""
+        attempt = 0
+        while True:
+            rejected, wait = self._admit(attempt)
+            if rejected:
+                return rejected
+            if wait:
+                await asyncio.sleep(wait)
+            attempt += 1
+            try:
+                data = await fetch()
+            except Exception as e:
+                result, delay = self._on_error(e, attempt)
+                if result:
+                    return result
+                await asyncio.sleep(delay)
+                continue
+            return self._on_success(data, attempt)
+
+_guards: Dict[str, EndpointGuard] = {}
+_guards_lock = threading.Lock()
+
+def get_guard(endpoint: str) -> EndpointGuard:
+    """Return the shared guard for an endpoint, creating it from config on first use."""
+    with _guards_lock:
+        guard = _guards.get(endpoint)
+        if guard is None:
+            rate, burst = RATE_LIMITS.get(endpoint, LIVE_RATE_LIMIT)
+            guard = _guards[endpoint] = EndpointGuard(
+                endpoint,
+                TokenBucket(rate, burst),
+                RetryPolicy(RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY_SECONDS, RETRY_MAX_DELAY_SECONDS),
+                CircuitBreaker(endpoint, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS),
+            )
+        return guard
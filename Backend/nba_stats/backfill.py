@@ -0,0 +1,271 @@
+import itertools
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Optional, Sequence
+
+from .api.nba_client import NBAClient
+from .api.resilience import EndpointGuard, FetchResult, FetchStatus, RetryPolicy, TokenBucket, get_guard
+from .config import (
+    COLLECTION_NAME_static,
+    BACKFILL_WORKERS,
+    BACKFILL_REQUESTS_PER_SECOND,
+    BACKFILL_BATCH_SIZE,
+    BACKFILL_CHECKPOINT_DIR,
+    BACKFILL_STOP_AFTER_MISSING,
+    RETRY_MAX_ATTEMPTS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+    AGGREGATES_ENABLED,
+)
+from .data.aggregates import AggregateEngine
+from .data.database import MongoDBClient
+from .data.models import StaticBoxScoreData
+from .utils.seasons import GAME_ID_SEASON_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Game ID prefixes by season type; the next two digits are the season's start year
+SEASON_TYPE_PREFIXES = {season_type: prefix for prefix, season_type in GAME_ID_SEASON_TYPES.items()}
+REGULAR_SEASON_GAMES = 1230
+# Series per playoff round, and the most games a series can take
+PLAYOFF_SERIES_PER_ROUND = (8, 4, 2, 1)
+PLAYOFF_SERIES_GAMES = 7
+
+def numbered_game_ids(season: str, season_type: str = 'regular', games: int = REGULAR_SEASON_GAMES) -> List[str]:
+    """
+    Number the game IDs of a full season, e.g. '2023-24' -> '0022300001' ... '0022301230'.
+
+    Playoff IDs encode round, series and game ('0042300101' is game 1 of the first
+    first-round series), so every game of a full bracket is listed and `games` is
+    ignored. All-star and play-in IDs follow no numbering and raise ValueError.
+    """
+    if season_type not in ('preseason', 'regular', 'playoffs'):
+        raise ValueError(f"Cannot number {season_type!r} game IDs; only preseason, regular and playoffs are numbered")
+    start_year = int(season.split('-')[0])
+    prefix = SEASON_TYPE_PREFIXES[season_type] + f"{start_year % 100:02d}"
+    if season_type == 'playoffs':
+        return [f"{prefix}00{round_number}{series}{game}"
+                for round_number, series_count in enumerate(PLAYOFF_SERIES_PER_ROUND, start=1)
+                for series in range(series_count)
+                for game in range(1, PLAYOFF_SERIES_GAMES + 1)]
+    return [f"{prefix}{number:05d}" for number in range(1, games + 1)]
+
+def season_game_ids(season: str, season_type: str = 'regular') -> List[str]:
+    """
+    List the game IDs a season actually has, from the league game log. Falls back to
+    numbering a full season when the log cannot be fetched; the backfill then stops
+    after BACKFILL_STOP_AFTER_MISSING games in a row are not found.
+    """
+    result = NBAClient.fetch_season_game_ids(season, season_type)
+    if result.ok and result.data:
+        logger.info(f"The {season} {season_type} game log lists {len(result.data)} games")
+        return result.data
+    logger.warning(f"Could not fetch the {season} {season_type} game log ({result.status.value}), "
+                   f"numbering a full season instead")
+    return numbered_game_ids(season, season_type)
+
+class BackfillCheckpoint:
+    """Completed, missing and failed game IDs of a backfill, persisted to a JSON file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = set()
+        # Games the league has no box score for; not retried
+        self.missing = set()
+        self.failed: Dict[str, int] = {}
+        self.load()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            data = json.load(f)
+        self.done = set(data.get('done', []))
+        self.missing = set(data.get('missing', []))
+        self.failed = data.get('failed', {})
+        logger.info(f"Resuming backfill from {self.path}: {len(self.done)} done, {len(self.missing)} missing, "
+                    f"{len(self.failed)} failed")
+
+    def is_settled(self, game_id: str) -> bool:
+        return game_id in self.done or game_id in self.missing
+
+    def mark_done(self, game_id: str) -> None:
+        self.done.add(game_id)
+        self.failed.pop(game_id, None)
+
+    def mark_missing(self, game_id: str) -> None:
+        self.missing.add(game_id)
+        self.failed.pop(game_id, None)
+
+    def mark_failed(self, game_id: str) -> None:
+        self.failed[game_id] = self.failed.get(game_id, 0) + 1
+
+    def save(self) -> None:
+        """Write the checkpoint atomically so a crash never leaves a torn file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'done': sorted(self.done), 'missing': sorted(self.missing), 'failed': self.failed}, f)
+        os.replace(tmp_path, self.path)
+
+class BackfillResult:
+    """Summary of a backfill run."""
+
+    def __init__(self, requested: int, saved: int, skipped: int, failed: int, elapsed: float, missing: int = 0):
+        self.requested = requested
+        self.saved = saved
+        self.skipped = skipped
+        self.failed = failed
+        self.elapsed = elapsed
+        self.missing = missing
+
+    @property
+    def games_per_minute(self) -> float:
+        return self.saved / self.elapsed * 60 if self.elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (f"BackfillResult(requested={self.requested}, saved={self.saved}, skipped={self.skipped}, "
+                f"missing={self.missing}, failed={self.failed}, {self.games_per_minute:.1f} games/min)")
+
+class StaticBoxScoreBackfill:
+    """
+    Loads static box scores for many games through a rate-limited worker pool.
+
+    Games already stored or recorded in the checkpoint are skipped, fetched
+    games are written in batches with save_many, and the checkpoint is saved
+    after every batch so a crashed run resumes where it stopped. Saved games
+    are folded into the season aggregates batch by batch as well.
+
+    Fetches go through one guard of the backfill's own: its token bucket
+    spaces requests at requests_per_second and waits as long as that takes,
+    instead of the endpoint's shared guard turning queued requests into
+    THROTTLED results, and the response cache is skipped since every game
+    is fetched once. Only a small window of games is queued at a time, so
+    an interrupted run stops after the fetches already in flight. Games the
+    league has no box score for are recorded as missing and not retried;
+    after stop_after_missing of them in a row (the end of a numbered
+    season) no further games are requested.
+    """
+
+    def __init__(self,
+                 checkpoint_path: str,
+                 db_client: Optional[MongoDBClient] = None,
+                 workers: int = BACKFILL_WORKERS,
+                 requests_per_second: float = BACKFILL_REQUESTS_PER_SECOND,
+                 batch_size: int = BACKFILL_BATCH_SIZE,
+                 db_name: str = "Boxscores",
+                 collection_name: str = COLLECTION_NAME_static,
+                 aggregates: Optional[AggregateEngine] = None,
+                 stop_after_missing: int = BACKFILL_STOP_AFTER_MISSING):
+        self.checkpoint = BackfillCheckpoint(checkpoint_path)
+        self.db_client = db_client or MongoDBClient()
+        self.workers = workers
+        # One token at a time spaces request starts evenly instead of bursting; shares the endpoint's breaker
+        self.guard = EndpointGuard(
+            "StaticBoxScoreData (backfill)",
+            TokenBucket(requests_per_second, capacity=1),
+            RetryPolicy(RETRY_MAX_ATTEMPTS, RETRY_BASE_DELAY_SECONDS, RETRY_MAX_DELAY_SECONDS),
+            get_guard("StaticBoxScoreData").breaker,
+            max_wait=float('inf'),
+        )
+        self.stop_after_missing = stop_after_missing
+        self.batch_size = batch_size
+        self.db_name = db_name
+        self.collection_name = collection_name
+        self.aggregates = aggregates or (AggregateEngine(self.db_client) if AGGREGATES_ENABLED else None)
+
+    def _fetch(self, game_id: str) -> FetchResult:
+        result = NBAClient.fetch_static_box_score(game_id, guard=self.guard)
+        if result.status is not FetchStatus.OK:
+            logger.warning(f"Backfill fetch for game {game_id}: {result.status.value}")
+        return result
+
+    def _flush(self, batch: List[StaticBoxScoreData]) -> int:
+        """Write a batch and record the outcome in the checkpoint. Returns the number saved."""
+        if not batch:
+            return 0
+        results = self.db_client.save_many(batch, db_name=self.db_name, collection_name=self.collection_name)
+        for box_score_data, ok in zip(batch, results):
+            if ok:
+                self.checkpoint.mark_done(box_score_data.game_id)
+                if self.aggregates:
+                    self.aggregates.apply(box_score_data)
+            else:
+                self.checkpoint.mark_failed(box_score_data.game_id)
+        if self.aggregates:
+            self.aggregates.save()
+        self.checkpoint.save()
+        batch.clear()
+        return sum(results)
+
+    def run(self, game_ids: Sequence[str]) -> BackfillResult:
+        """Backfill the given games and return a summary."""
+        start = time.perf_counter()
+        pending = [game_id for game_id in game_ids if not self.checkpoint.is_settled(game_id)]
+
+        stored = self.db_client.existing_ids(pending, db_name=self.db_name, collection_name=self.collection_name)
+        for game_id in stored:
+            self.checkpoint.mark_done(game_id)
+        pending = [game_id for game_id in pending if game_id not in stored]
+        skipped = len(game_ids) - len(pending)
+        self.checkpoint.save()
+        logger.info(f"Backfilling {len(pending)} games ({skipped} already stored or missing)")
+
+        saved = 0
+        missing = 0
+        missing_streak = 0
+        completed = 0
+        batch: List[StaticBoxScoreData] = []
+        queue = iter(pending)
+        futures = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill")
+        try:
+            # Keep a couple of requests queued per worker; the rest are only submitted as these complete
+            for game_id in itertools.islice(queue, self.workers * 2):
+                futures[executor.submit(self._fetch, game_id)] = game_id
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    game_id = futures.pop(future)
+                    result = future.result()
+                    completed += 1
+                    if result.ok and result.data:
+                        batch.append(result.data)
+                        missing_streak = 0
+                    elif result.status is FetchStatus.NOT_FOUND:
+                        self.checkpoint.mark_missing(game_id)
+                        missing += 1
+                        missing_streak += 1
+                    else:
+                        self.checkpoint.mark_failed(game_id)
+
+                if missing_streak >= self.stop_after_missing and queue is not None:
+                    logger.info(f"{missing_streak} games in a row were not found, not requesting any more")
+                    queue = None
+                if queue is not None:
+                    for game_id in itertools.islice(queue, len(done)):
+                        futures[executor.submit(self._fetch, game_id)] = game_id
+
+                if len(batch) >= self.batch_size:
+                    saved += self._flush(batch)
+                    elapsed = time.perf_counter() - start
+                    logger.info(f"Backfill progress: {completed}/{len(pending)} fetched, {saved} saved, "
+                                f"{saved / elapsed * 60:.1f} games/min")
+        finally:
+            # On an interrupt, drop queued fetches instead of running them before the checkpoint is saved
+            executor.shutdown(wait=False, cancel_futures=True)
+            saved += self._flush(batch)
+            self.checkpoint.save()
+
+        failed = completed - saved - missing
+        result = BackfillResult(len(game_ids), saved, skipped, failed, time.perf_counter() - start, missing)
+        logger.info(f"Backfill finished: {result}")
+        return result
+
+def default_checkpoint_path(name: str) -> str:
+    return os.path.join(BACKFILL_CHECKPOINT_DIR, f"backfill_{name}.json")
@@ -8,4 +8,119 @@ load_dotenv()
 MONGO_URI = os.getenv("MONGO_URI")
 DB_NAME_boxscore = os.getenv("DB_NAME_boxscore")
 COLLECTION_NAME_live = os.getenv("COLLECTION_NAME_live_boxscore", "live_boxscores")
-COLLECTION_NAME_static = os.getenv("COLLECTION_NAME_static_boxscore", "static_boxscores")
\ No newline at end of file
+COLLECTION_NAME_static = os.getenv("COLLECTION_NAME_static_boxscore", "static_boxscores")
+COLLECTION_NAME_history = os.getenv("COLLECTION_NAME_boxscore_history", "live_boxscore_history")
+
+# Live updater fetch settings
+LIVE_FETCH_MODE = os.getenv("LIVE_FETCH_MODE", "concurrent")  # "concurrent" or "sequential"
+LIVE_FETCH_CONCURRENCY = int(os.getenv("LIVE_FETCH_CONCURRENCY", "6"))
+LIVE_FETCH_MAX_WORKERS = int(os.getenv("LIVE_FETCH_MAX_WORKERS", str(2 * LIVE_FETCH_CONCURRENCY)))
+LIVE_FETCH_BACKEND = os.getenv("LIVE_FETCH_BACKEND", "threads")  # "threads" (nba_api + requests) or "aiohttp"
+
+# MongoDB connection pool settings
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "20"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "10000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_HEARTBEAT_FREQUENCY_MS = int(os.getenv("MONGO_HEARTBEAT_FREQUENCY_MS", "10000"))
+
+# Adaptive live polling intervals (seconds)
+POLL_INTERVAL_DEFAULT = float(os.getenv("POLL_INTERVAL_DEFAULT", "15"))
+POLL_INTERVAL_CLOSE_LATE = float(os.getenv("POLL_INTERVAL_CLOSE_LATE", "5"))
+POLL_INTERVAL_CLOCK_STOPPED = float(os.getenv("POLL_INTERVAL_CLOCK_STOPPED", "20"))
+POLL_INTERVAL_PERIOD_BREAK = float(os.getenv("POLL_INTERVAL_PERIOD_BREAK", "30"))
+POLL_INTERVAL_BLOWOUT = float(os.getenv("POLL_INTERVAL_BLOWOUT", "30"))
+POLL_INTERVAL_HALFTIME = float(os.getenv("POLL_INTERVAL_HALFTIME", "90"))
+POLL_INTERVAL_PREGAME = float(os.getenv("POLL_INTERVAL_PREGAME", "60"))
+CLOSE_GAME_MARGIN = int(os.getenv("CLOSE_GAME_MARGIN", "8"))
+CLOSE_GAME_SECONDS_LEFT = int(os.getenv("CLOSE_GAME_SECONDS_LEFT", "300"))
+BLOWOUT_MARGIN = int(os.getenv("BLOWOUT_MARGIN", "20"))
+
+# Game lifecycle detection around scheduled tip-offs
+SCOREBOARD_REFRESH_NEAR_TIPOFF_SECONDS = float(os.getenv("SCOREBOARD_REFRESH_NEAR_TIPOFF_SECONDS", "30"))
+TIPOFF_WINDOW_BEFORE_SECONDS = float(os.getenv("TIPOFF_WINDOW_BEFORE_SECONDS", "300"))
+# Stop polling a started game that is still not live this long after tip-off (postponed, suspended)
+GAME_GIVE_UP_AFTER_SECONDS = float(os.getenv("GAME_GIVE_UP_AFTER_SECONDS", str(6 * 3600)))
+
+# Live feed HTTP settings
+NBA_LIVE_BASE_URL = os.getenv("NBA_LIVE_BASE_URL", "https://cdn.nba.com/static/json/liveData/")
+LIVE_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LIVE_REQUEST_TIMEOUT_SECONDS", "10"))
+LIVE_CONDITIONAL_REQUESTS = os.getenv("LIVE_CONDITIONAL_REQUESTS", "true").lower() == "true"
+LIVE_HTTP_CONNECTION_LIMIT = int(os.getenv("LIVE_HTTP_CONNECTION_LIMIT", "32"))
+LIVE_HTTP_KEEPALIVE_SECONDS = float(os.getenv("LIVE_HTTP_KEEPALIVE_SECONDS", "30"))
+
+# Response cache in front of NBAClient (TTL seconds per endpoint)
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_TTLS = {
+    "BoxScoreData": float(os.getenv("CACHE_TTL_LIVE_BOX_SCORE", "3")),
+    "PlayByPlayData": float(os.getenv("CACHE_TTL_LIVE_PLAY_BY_PLAY", "3")),
+    "ScoreboardData": float(os.getenv("CACHE_TTL_SCOREBOARD", "15")),
+    "StaticBoxScoreData": float(os.getenv("CACHE_TTL_STATIC_BOX_SCORE", "3600")),
+}
+
+# Static box score backfill settings
+BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "4"))
+BACKFILL_REQUESTS_PER_SECOND = float(os.getenv("BACKFILL_REQUESTS_PER_SECOND", "1.0"))
+BACKFILL_BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", "25"))
+BACKFILL_CHECKPOINT_DIR = os.getenv("BACKFILL_CHECKPOINT_DIR", "checkpoints")
+# Consecutive NOT_FOUND games after which a backfill stops requesting (the end of a shortened season)
+BACKFILL_STOP_AFTER_MISSING = int(os.getenv("BACKFILL_STOP_AFTER_MISSING", "10"))
+
+# Upstream resilience: token bucket per endpoint as (requests per second, burst)
+LIVE_RATE_LIMIT = (float(os.getenv("LIVE_RATE_LIMIT_PER_SECOND", "10")), int(os.getenv("LIVE_RATE_LIMIT_BURST", "20")))
+STATS_RATE_LIMIT = (float(os.getenv("STATS_RATE_LIMIT_PER_SECOND", "1")), int(os.getenv("STATS_RATE_LIMIT_BURST", "2")))
+RATE_LIMITS = {
+    "BoxScoreData": LIVE_RATE_LIMIT,
+    "PlayByPlayData": LIVE_RATE_LIMIT,
+    "ScoreboardData": LIVE_RATE_LIMIT,
+    "StaticBoxScoreData": STATS_RATE_LIMIT,
+}
+RATE_LIMIT_MAX_WAIT_SECONDS = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "5"))
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "0.5"))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "8"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "60"))
+
+# Live box score history (per-poll deltas with a full keyframe every N records)
+BOX_SCORE_HISTORY_ENABLED = os.getenv("BOX_SCORE_HISTORY_ENABLED", "true").lower() == "true"
+BOX_SCORE_HISTORY_KEYFRAME_INTERVAL = int(os.getenv("BOX_SCORE_HISTORY_KEYFRAME_INTERVAL", "200"))
+
+# Read API for the lens, served from the poller's in-memory LiveStore
+LIVE_API_ENABLED = os.getenv("LIVE_API_ENABLED", "true").lower() == "true"
+LIVE_API_HOST = os.getenv("LIVE_API_HOST", "0.0.0.0")
+LIVE_API_PORT = int(os.getenv("LIVE_API_PORT", "8080"))
+LIVE_API_PLAY_BY_PLAY_TAIL = int(os.getenv("LIVE_API_PLAY_BY_PLAY_TAIL", "20"))
+LIVE_API_MAX_TAIL = int(os.getenv("LIVE_API_MAX_TAIL", "500"))
+LIVE_STREAM_QUEUE_SIZE = int(os.getenv("LIVE_STREAM_QUEUE_SIZE", "256"))
+LIVE_STREAM_REPLAY_LIMIT = int(os.getenv("LIVE_STREAM_REPLAY_LIMIT", "2000"))
+LIVE_STREAM_HEARTBEAT_SECONDS = float(os.getenv("LIVE_STREAM_HEARTBEAT_SECONDS", "15"))
+
+# Write-behind persistence of live feeds (pending games, batch size, max seconds an update waits)
+PERSIST_QUEUE_MAX_PENDING = int(os.getenv("PERSIST_QUEUE_MAX_PENDING", "64"))
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "16"))
+PERSIST_FLUSH_INTERVAL_SECONDS = float(os.getenv("PERSIST_FLUSH_INTERVAL_SECONDS", "1.0"))
+
+# Live persistence backend: "sync" (pymongo on a writer thread) or "async" (pymongo's asyncio client on the loop)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sync").lower()
+
+# Create the declared MongoDB indexes and report unindexed reads when the live updater starts
+VERIFY_INDEXES_ON_STARTUP = os.getenv("VERIFY_INDEXES_ON_STARTUP", "true").lower() == "true"
+
+# Parquet export of stored box scores
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "200"))  # games per record batch / written file
+
+# Season aggregates (per-player / per-team sums, averages and leaderboards) updated as games are saved
+AGGREGATES_ENABLED = os.getenv("AGGREGATES_ENABLED", "true").lower() == "true"
+AGGREGATES_DB_NAME = os.getenv("AGGREGATES_DB_NAME", "Aggregates")
+AGGREGATES_LEADERS_SIZE = int(os.getenv("AGGREGATES_LEADERS_SIZE", "25"))
+# Leaderboards only rank players with at least this share of the most games (and attempts, for percentages)
+AGGREGATES_QUALIFYING_FRACTION = float(os.getenv("AGGREGATES_QUALIFYING_FRACTION", "0.5"))
+
+# Incremental game state (lineups, stint plus-minus, scoring runs) derived from live play-by-play
+GAME_STATE_ENABLED = os.getenv("GAME_STATE_ENABLED", "true").lower() == "true"
+GAME_STATE_RUN_MIN_POINTS = int(os.getenv("GAME_STATE_RUN_MIN_POINTS", "8"))  # unanswered points kept as a run
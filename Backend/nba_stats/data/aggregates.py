@@ -0,0 +1,395 @@
+import datetime
+import logging
+import math
+import threading
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+from pymongo import ReplaceOne
+
+from ..config import (
+    COLLECTION_NAME_static,
+    AGGREGATES_DB_NAME,
+    AGGREGATES_LEADERS_SIZE,
+    AGGREGATES_QUALIFYING_FRACTION,
+)
+from ..utils.game_clock import parse_game_clock
+from ..utils.seasons import season_from_game_id, season_type_from_game_id
+from .database import MongoDBClient
+from .models import BoxScoreData, StaticBoxScoreData
+
+logger = logging.getLogger(__name__)
+
+PLAYER_COLUMNS = ('MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', 'FG3M', 'FG3A')
+TEAM_COLUMNS = ('PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', 'FG3M', 'FG3A', 'OPP_PTS', 'W', 'L')
+# Made / attempted pairs reported as percentages
+SHOOTING_SPLITS = {'FG_PCT': ('FGM', 'FGA'), 'FG3_PCT': ('FG3M', 'FG3A')}
+PLAYER_LEADER_STATS = ('PTS', 'REB', 'AST', 'STL', 'BLK', 'FG_PCT', 'FG3_PCT')
+
+PLAYER_SEASON = 'player_season'
+TEAM_SEASON = 'team_season'
+SEASON_LEADERS = 'season_leaders'
+SEASON_ACCUMULATORS = 'season_accumulators'
+
+Key = Union[int, str]
+BoxScore = Union[BoxScoreData, StaticBoxScoreData]
+
+def minutes_played(value: Any) -> float:
+    """Minutes from a static 'MM:SS' string, a live 'PT34M12.00S' clock, or a number."""
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return 0.0 if isinstance(value, float) and math.isnan(value) else float(value)
+    if value.startswith('PT'):
+        seconds = parse_game_clock(value)
+        return seconds / 60 if seconds is not None else 0.0
+    minutes, _, seconds = value.partition(':')
+    try:
+        return float(minutes) + (float(seconds) / 60 if seconds else 0.0)
+    except ValueError:
+        return 0.0
+
+def _number(value: Any) -> float:
+    if value is None or isinstance(value, str):
+        return 0.0
+    value = float(value)
+    return 0.0 if math.isnan(value) else value
+
+class StatAccumulator:
+    """
+    Running per-key sums in a NumPy matrix: one row per player (or team), one column per stat.
+
+    add() folds in one game's rows with a single scatter-add; rows grow by
+    doubling. Averages and shooting percentages are derived from the sums
+    and game counts when asked for, so nothing but sums is ever stored.
+    """
+
+    def __init__(self, columns: Sequence[str], capacity: int = 64):
+        self.columns = tuple(columns)
+        self.column_index = {column: position for position, column in enumerate(self.columns)}
+        self.keys: List[Key] = []
+        self.rows: Dict[Key, int] = {}
+        self.labels: List[Dict[str, Any]] = []
+        self.sums = np.zeros((capacity, len(self.columns)))
+        self.games = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _row(self, key: Key, label: Dict[str, Any]) -> int:
+        row = self.rows.get(key)
+        if row is None:
+            row = len(self.keys)
+            if row == len(self.games):
+                self.sums = np.vstack([self.sums, np.zeros_like(self.sums)])
+                self.games = np.concatenate([self.games, np.zeros_like(self.games)])
+            self.rows[key] = row
+            self.keys.append(key)
+            self.labels.append({})
+        # Latest name and team win, e.g. after a trade
+        self.labels[row].update(label)
+        return row
+
+    def add(self, keys: Sequence[Key], labels: Sequence[Dict[str, Any]], values: np.ndarray,
+            played: np.ndarray) -> List[int]:
+        """Add one game's stat rows. Returns the accumulator rows they went to."""
+        rows = [self._row(key, label) for key, label in zip(keys, labels)]
+        np.add.at(self.sums, rows, values)
+        np.add.at(self.games, rows, played)
+        return rows
+
+    def _used(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.sums[:len(self.keys)], self.games[:len(self.keys)]
+
+    def per_game(self) -> np.ndarray:
+        sums, games = self._used()
+        return np.divide(sums, games[:, None], out=np.zeros_like(sums), where=games[:, None] > 0)
+
+    def percentage(self, split: str) -> np.ndarray:
+        sums, _ = self._used()
+        made, attempted = (sums[:, self.column_index[column]] for column in SHOOTING_SPLITS[split])
+        return np.divide(made, attempted, out=np.zeros_like(made), where=attempted > 0)
+
+    def stat(self, stat: str) -> np.ndarray:
+        """Per-game value of a column, or the percentage of a shooting split, for every row."""
+        if stat in SHOOTING_SPLITS:
+            return self.percentage(stat)
+        return self.per_game()[:, self.column_index[stat]]
+
+    def summary(self, row: int) -> Dict[str, Any]:
+        sums, games = self._used()
+        per_game = self.per_game()[row]
+        return {
+            **self.labels[row],
+            'games': int(games[row]),
+            'totals': {column: round(float(sums[row, index]), 3) for column, index in self.column_index.items()},
+            'per_game': {column: round(float(per_game[index]), 3) for column, index in self.column_index.items()},
+            'shooting': {split: round(float(self.percentage(split)[row]), 4) for split in SHOOTING_SPLITS
+                         if all(column in self.column_index for column in SHOOTING_SPLITS[split])},
+        }
+
+    def leaders(self, stat: str, size: int, qualifying_fraction: float) -> List[Dict[str, Any]]:
+        """
+        Top rows for a stat among qualified ones: at least qualifying_fraction of
+        the most games played, and for percentages also of the most attempts.
+        """
+        if not self.keys:
+            return []
+        sums, games = self._used()
+        qualified = games >= qualifying_fraction * games.max()
+        if stat in SHOOTING_SPLITS:
+            attempted = sums[:, self.column_index[SHOOTING_SPLITS[stat][1]]]
+            qualified &= attempted >= qualifying_fraction * attempted.max()
+        values = np.where(qualified, self.stat(stat), -np.inf)
+        size = min(size, int(qualified.sum()))
+        if size == 0:
+            return []
+        top = np.argpartition(-values, size - 1)[:size]
+        top = top[np.argsort(-values[top], kind='stable')]
+        return [{**self.labels[row], 'key': self.keys[row], 'games': int(games[row]),
+                 'value': round(float(values[row]), 4)} for row in top]
+
+    def to_dict(self) -> Dict[str, Any]:
+        sums, games = self._used()
+        return {'columns': list(self.columns), 'keys': self.keys, 'labels': self.labels,
+                'sums': sums.tolist(), 'games': games.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StatAccumulator":
+        accumulator = cls(data['columns'], capacity=max(64, len(data['keys'])))
+        count = len(data['keys'])
+        accumulator.keys = list(data['keys'])
+        accumulator.rows = {key: row for row, key in enumerate(accumulator.keys)}
+        accumulator.labels = list(data['labels'])
+        if count:
+            accumulator.sums[:count] = np.asarray(data['sums'], dtype=float)
+            accumulator.games[:count] = np.asarray(data['games'], dtype=np.int64)
+        return accumulator
+
+def season_key(season: str, season_type: str) -> str:
+    """'2024-25', 'regular' -> '2024-25:regular'; prefix of every aggregate document _id."""
+    return f"{season}:{season_type}"
+
+class SeasonAggregates:
+    """Player and team accumulators of one season type, and the games already folded into them."""
+
+    def __init__(self, season: str, season_type: str):
+        self.season = season
+        self.season_type = season_type
+        self.players = StatAccumulator(PLAYER_COLUMNS)
+        self.teams = StatAccumulator(TEAM_COLUMNS)
+        self.applied_game_ids: Set[str] = set()
+        self.dirty_players: Set[int] = set()
+        self.dirty_teams: Set[int] = set()
+
+    def apply(self, box_score_data: BoxScore) -> bool:
+        """Fold one game in. Returns False if it was already applied."""
+        if box_score_data.game_id in self.applied_game_ids:
+            return False
+
+        player_stats = box_score_data.player_stats
+        values = np.zeros((len(player_stats), len(PLAYER_COLUMNS)))
+        keys, labels = [], []
+        for position, player in enumerate(player_stats):
+            keys.append(player.get('PLAYER_ID') or player.get('PLAYER_NAME'))
+            labels.append({'player_id': player.get('PLAYER_ID'), 'player_name': player.get('PLAYER_NAME'),
+                           'team_abbreviation': player.get('TEAM_ABBREVIATION')})
+            values[position, 0] = minutes_played(player.get('MIN'))
+            values[position, 1:] = [_number(player.get(column)) for column in PLAYER_COLUMNS[1:]]
+        # A player who did not get on the floor has not played the game
+        played = ((values[:, 0] > 0) | (values[:, 1:].sum(axis=1) > 0)).astype(np.int64)
+        self.dirty_players.update(self.players.add(keys, labels, values, played))
+
+        # Team totals are the sums of their players' rows, so live and static box scores agree
+        team_keys = list(dict.fromkeys(label['team_abbreviation'] for label in labels if label['team_abbreviation']))
+        team_values = np.zeros((len(team_keys), len(TEAM_COLUMNS)))
+        for position, team in enumerate(team_keys):
+            in_team = np.array([label['team_abbreviation'] == team for label in labels])
+            team_values[position, :10] = values[in_team, 1:].sum(axis=0)
+        if len(team_keys) == 2:
+            points = team_values[:, 0]
+            team_values[:, TEAM_COLUMNS.index('OPP_PTS')] = points[::-1]
+            if points[0] != points[1]:
+                winner = int(points.argmax())
+                team_values[winner, TEAM_COLUMNS.index('W')] = 1
+                team_values[1 - winner, TEAM_COLUMNS.index('L')] = 1
+        team_labels = [{'team_abbreviation': team} for team in team_keys]
+        self.dirty_teams.update(self.teams.add(team_keys, team_labels, team_values,
+                                               np.ones(len(team_keys), dtype=np.int64)))
+
+        self.applied_game_ids.add(box_score_data.game_id)
+        return True
+
+    @property
+    def key(self) -> str:
+        return season_key(self.season, self.season_type)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.dirty_players or self.dirty_teams)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'_id': self.key, 'season': self.season, 'season_type': self.season_type,
+                'applied_game_ids': sorted(self.applied_game_ids),
+                'players': self.players.to_dict(), 'teams': self.teams.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SeasonAggregates":
+        aggregates = cls(data['season'], data['season_type'])
+        aggregates.players = StatAccumulator.from_dict(data['players'])
+        aggregates.teams = StatAccumulator.from_dict(data['teams'])
+        aggregates.applied_game_ids = set(data.get('applied_game_ids', []))
+        return aggregates
+
+class AggregateEngine:
+    """
+    Season averages, totals and shooting splits, updated once per saved game.
+
+    apply() folds a box score into its season's NumPy accumulators unless
+    that game was applied before, so re-saving a game never counts it
+    twice. operations() then materializes only what changed into the
+    Aggregates database: one document per touched player and team, the
+    season's leaderboards, and the accumulator checkpoint the engine
+    reloads from after a restart. Reading a player's averages or a
+    leaderboard is a single _id lookup (see get_player_season and
+    get_leaders) rather than a scan over stored box scores.
+
+    Like BoxScoreHistory, operations() plans the writes and commit() marks
+    them clean once they succeeded; a failed write is retried with the
+    next one.
+    """
+
+    def __init__(self,
+                 db_client: Optional[MongoDBClient] = None,
+                 db_name: str = AGGREGATES_DB_NAME,
+                 leaders_size: int = AGGREGATES_LEADERS_SIZE,
+                 qualifying_fraction: float = AGGREGATES_QUALIFYING_FRACTION):
+        self.db_client = db_client or MongoDBClient()
+        self.db_name = db_name
+        self.leaders_size = leaders_size
+        self.qualifying_fraction = qualifying_fraction
+        self._seasons: Dict[str, SeasonAggregates] = {}
+        # Rows written by the last operations(), cleared by commit(); rows dirtied in between stay dirty
+        self._planned: Dict[str, Tuple[Set[int], Set[int]]] = {}
+        self._lock = threading.Lock()
+
+    def _season(self, season: str, season_type: str) -> SeasonAggregates:
+        key = season_key(season, season_type)
+        aggregates = self._seasons.get(key)
+        if aggregates is None:
+            # Read directly rather than through get_document, which also returns None on errors:
+            # starting a season over after a failed read would overwrite its stored accumulators
+            if not self.db_client.client and not self.db_client.connect():
+                raise ConnectionError(f"Cannot load {key} aggregates without a MongoDB connection")
+            stored = self.db_client.client[self.db_name][SEASON_ACCUMULATORS].find_one({'_id': key})
+            aggregates = SeasonAggregates.from_dict(stored) if stored else SeasonAggregates(season, season_type)
+            if stored:
+                logger.info(f"Loaded {key} aggregates ({len(aggregates.applied_game_ids)} games)")
+            self._seasons[key] = aggregates
+        return aggregates
+
+    def apply(self, box_score_data: BoxScore) -> bool:
+        """Fold a finished game into its season. Returns False if it was already applied or could not be."""
+        game_id = box_score_data.game_id
+        season, season_type = season_from_game_id(game_id), season_type_from_game_id(game_id)
+        if season is None or season_type is None:
+            logger.warning(f"Cannot tell the season of game {game_id}, not aggregating it")
+            return False
+        try:
+            with self._lock:
+                return self._season(season, season_type).apply(box_score_data)
+        except Exception as e:
+            logger.error(f"Error aggregating game {game_id}: {e}")
+            return False
+
+    def apply_many(self, box_scores: Iterable[BoxScore]) -> int:
+        return sum(self.apply(box_score_data) for box_score_data in box_scores)
+
+    @property
+    def pending(self) -> bool:
+        """True if some applied game has not been written yet."""
+        return any(aggregates.dirty for aggregates in self._seasons.values())
+
+    def operations(self) -> Dict[str, List[List[Any]]]:
+        """Write groups per Aggregates collection for every season with unsaved changes."""
+        operations: Dict[str, List[List[Any]]] = {PLAYER_SEASON: [], TEAM_SEASON: [],
+                                                  SEASON_LEADERS: [], SEASON_ACCUMULATORS: []}
+        updated_at = datetime.datetime.now()
+        with self._lock:
+            self._planned = {}
+            for key, aggregates in self._seasons.items():
+                if not aggregates.dirty:
+                    continue
+                self._planned[key] = (set(aggregates.dirty_players), set(aggregates.dirty_teams))
+                labels = {'season': aggregates.season, 'season_type': aggregates.season_type}
+                for collection_name, accumulator, rows in ((PLAYER_SEASON, aggregates.players, aggregates.dirty_players),
+                                                           (TEAM_SEASON, aggregates.teams, aggregates.dirty_teams)):
+                    for row in sorted(rows):
+                        document_id = f"{key}:{accumulator.keys[row]}"
+                        document = {'_id': document_id, **labels, **accumulator.summary(row),
+                                    'updated_at': updated_at}
+                        operations[collection_name].append([ReplaceOne({'_id': document_id}, document, upsert=True)])
+
+                leaders = {stat: aggregates.players.leaders(stat, self.leaders_size, self.qualifying_fraction)
+                           for stat in PLAYER_LEADER_STATS}
+                leaders['W'] = aggregates.teams.leaders('W', self.leaders_size, 0.0)
+                operations[SEASON_LEADERS].append([ReplaceOne(
+                    {'_id': key},
+                    {'_id': key, **labels, 'leaders': leaders,
+                     'games': len(aggregates.applied_game_ids), 'updated_at': updated_at},
+                    upsert=True)])
+                operations[SEASON_ACCUMULATORS].append([ReplaceOne({'_id': key}, aggregates.to_dict(), upsert=True)])
+        return operations
+
+    def commit(self) -> None:
+        """Mark the rows planned by the last operations() clean after their documents were written."""
+        with self._lock:
+            for key, (players, teams) in self._planned.items():
+                self._seasons[key].dirty_players -= players
+                self._seasons[key].dirty_teams -= teams
+            self._planned = {}
+
+    def save(self) -> bool:
+        """Write all pending aggregate documents. Returns False if any write failed."""
+        ok = True
+        for collection_name, groups in self.operations().items():
+            ok &= all(self.db_client.write_operations(groups, self.db_name, collection_name))
+        if ok:
+            self.commit()
+        else:
+            logger.error("Failed to save season aggregates, will retry with the next save")
+        return ok
+
+    def catch_up(self, db_name: str = "Boxscores", collection_name: str = COLLECTION_NAME_static,
+                 batch_size: int = 200) -> int:
+        """
+        Apply every stored box score not yet folded in, e.g. games saved before
+        aggregates were enabled. Saves every batch_size games. Returns the number applied.
+        """
+        if not self.db_client.client and not self.db_client.connect():
+            return 0
+        applied = 0
+        cursor = self.db_client.client[db_name][collection_name].find({}, {'arena': 0}).batch_size(batch_size)
+        for document in cursor:
+            box_score_data = StaticBoxScoreData.from_dict(
+                {key: document.get(key) for key in ('game_id', 'player_stats', 'team_stats', 'retrieved_at')})
+            if self.apply(box_score_data):
+                applied += 1
+                if applied % batch_size == 0:
+                    self.save()
+        self.save()
+        logger.info(f"Aggregated {applied} stored {collection_name} games")
+        return applied
+
+    def get_player_season(self, season: str, player_id: Key, season_type: str = 'regular') -> Optional[Dict[str, Any]]:
+        document_id = f"{season_key(season, season_type)}:{player_id}"
+        return self.db_client.get_document(document_id, self.db_name, PLAYER_SEASON, id_field='_id')
+
+    def get_team_season(self, season: str, team_abbreviation: str,
+                        season_type: str = 'regular') -> Optional[Dict[str, Any]]:
+        document_id = f"{season_key(season, season_type)}:{team_abbreviation}"
+        return self.db_client.get_document(document_id, self.db_name, TEAM_SEASON, id_field='_id')
+
+    def get_leaders(self, season: str, season_type: str = 'regular') -> Optional[Dict[str, Any]]:
+        return self.db_client.get_document(season_key(season, season_type), self.db_name, SEASON_LEADERS,
+                                           id_field='_id')
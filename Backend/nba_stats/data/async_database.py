@@ -0,0 +1,218 @@
+import asyncio
+
+from pymongo import AsyncMongoClient
+from pymongo.errors import BulkWriteError
+from typing import Optional, Type, Any, Dict, List, Sequence, Set
+import logging
+
+from ..config import (
+    MONGO_URI,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_HEARTBEAT_FREQUENCY_MS,
+)
+from .database import replace_groups, group_results, failed_indexes
+
+logger = logging.getLogger(__name__)
+
+class AsyncMongoDBClient:
+    """
+    Asyncio counterpart of MongoDBClient, with the same methods as coroutines.
+
+    Built on pymongo's native AsyncMongoClient, so writes run on the event
+    loop and overlap with network fetches instead of blocking it. A client
+    is bound to the loop it was first used on, so unlike MongoDBClient there
+    is no process-wide pool: each instance owns its connection pool, created
+    on first use and closed by close(). Concurrent first calls share one
+    connect, so only one pool is ever created. Pass `client` to use an existing
+    AsyncMongoClient (or an in-memory stand-in with the same interface);
+    close() then leaves it open.
+    """
+
+    def __init__(self, uri: Optional[str] = None, client: Optional[Any] = None):
+        self.uri = uri or MONGO_URI
+        self.client = client
+        self._owns_client = client is None
+        self._connect_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def connect(self) -> bool:
+        """Create the connection pool and ping the server once."""
+        if self.client is not None:
+            return True
+        # gather()ed writes all connect on first use; the lock makes the others wait for the first
+        async with self._connect_lock:
+            if self.client is not None:
+                return True
+            client = AsyncMongoClient(
+                self.uri,
+                maxPoolSize=MONGO_MAX_POOL_SIZE,
+                minPoolSize=MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                heartbeatFrequencyMS=MONGO_HEARTBEAT_FREQUENCY_MS,
+            )
+            try:
+                await client.admin.command('ping')
+            except Exception as e:
+                await client.close()
+                logger.error(f"MongoDB connection error: {e}")
+                return False
+            self.client = client
+            self._owns_client = True
+            logger.info(f"Connected to MongoDB with asyncio (pool size {MONGO_MIN_POOL_SIZE}-{MONGO_MAX_POOL_SIZE})")
+            return True
+
+    async def ping(self) -> bool:
+        """Check that the server is reachable."""
+        if not self.client:
+            if not await self.connect():
+                return False
+        try:
+            await self.client.admin.command('ping')
+            return True
+        except Exception as e:
+            logger.error(f"MongoDB health check failed: {e}")
+            return False
+
+    async def close(self) -> None:
+        """Close the connection pool, unless the client was passed in."""
+        if self.client is not None and self._owns_client:
+            await self.client.close()
+        self.client = None
+
+    async def save(self, obj: Any, db_name: str, collection_name: str, id_field: str = 'game_id') -> bool:
+        """
+        Save any object that has to_dict() and an ID field.
+        """
+        if not self.client:
+            if not await self.connect():
+                return False
+
+        collection = self.client[db_name][collection_name]
+
+        try:
+            obj_dict = obj.to_dict()
+            obj_id = getattr(obj, id_field, None)
+            if obj_id is None:
+                logger.error(f"Object missing id field: {id_field}")
+                return False
+
+            result = await collection.replace_one({id_field: obj_id}, obj_dict, upsert=True)
+            if result.upserted_id is not None:
+                logger.info(f"Inserted new record with _id: {result.upserted_id}")
+            else:
+                logger.info(f"Updated {collection_name} record with {id_field}={obj_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error saving object to MongoDB: {e}")
+            return False
+
+    async def save_many(self, objs: Sequence[Any], db_name: str, collection_name: str,
+                        id_field: str = 'game_id') -> List[bool]:
+        """
+        Upsert many objects in a single unordered bulk write.
+
+        Returns one flag per input object, in order.
+        """
+        groups = replace_groups(objs, id_field)
+        results = await self.write_operations(groups, db_name, collection_name)
+        return [ok and bool(group) for ok, group in zip(results, groups)]
+
+    async def write_operations(self, groups: Sequence[Sequence[Any]], db_name: str,
+                               collection_name: str) -> List[bool]:
+        """
+        Run groups of pymongo write operations as one unordered bulk write.
+
+        Returns one flag per group that is True only if every operation in it succeeded.
+        """
+        results = [False] * len(groups)
+        operations = [operation for group in groups for operation in group]
+        if not operations:
+            return [True] * len(groups)
+        if not self.client:
+            if not await self.connect():
+                return results
+
+        collection = self.client[db_name][collection_name]
+
+        failed = set()
+        try:
+            result = await collection.bulk_write(operations, ordered=False)
+            logger.info(f"Bulk wrote {len(operations)} {collection_name} operations "
+                        f"({result.upserted_count} inserted, {result.modified_count} updated)")
+        except BulkWriteError as e:
+            failed = failed_indexes(e, collection_name)
+        except Exception as e:
+            logger.error(f"Error bulk writing to MongoDB: {e}")
+            return results
+
+        return group_results(groups, failed)
+
+    async def get(self, obj_id: Any, obj_class: Type, db_name: str, collection_name: str,
+                  id_field: str = 'game_id') -> Optional[Any]:
+        """
+        Retrieve an object by ID and reconstruct it via from_dict().
+        """
+        data = await self.get_document(obj_id, db_name, collection_name, id_field)
+        return obj_class.from_dict(data) if data else None
+
+    async def get_document(self, obj_id: Any, db_name: str, collection_name: str, id_field: str = 'game_id',
+                           projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the raw document for an ID without building a model.
+        """
+        if not self.client:
+            if not await self.connect():
+                return None
+
+        try:
+            return await self.client[db_name][collection_name].find_one({id_field: obj_id}, projection)
+        except Exception as e:
+            logger.error(f"Error retrieving document from MongoDB: {e}")
+            return None
+
+    async def find_documents(self, query: Dict[str, Any], db_name: str, collection_name: str,
+                             projection: Optional[Dict[str, Any]] = None,
+                             sort: Optional[List[Any]] = None,
+                             limit: int = 0) -> List[Dict[str, Any]]:
+        """
+        Run a find query and return the raw documents.
+        """
+        if not self.client:
+            if not await self.connect():
+                return []
+
+        try:
+            cursor = self.client[db_name][collection_name].find(query, projection)
+            if sort:
+                cursor = cursor.sort(sort)
+            if limit:
+                cursor = cursor.limit(limit)
+            return await cursor.to_list(None)
+        except Exception as e:
+            logger.error(f"Error querying MongoDB: {e}")
+            return []
+
+    async def existing_ids(self, obj_ids: Sequence[Any], db_name: str, collection_name: str,
+                           id_field: str = 'game_id') -> Set[Any]:
+        """
+        Return which of the given IDs already have a stored document.
+        """
+        if not obj_ids:
+            return set()
+        documents = await self.find_documents({id_field: {'$in': list(obj_ids)}}, db_name, collection_name,
+                                              projection={id_field: 1, '_id': 0})
+        return {document[id_field] for document in documents}
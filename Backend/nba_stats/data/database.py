@@ -1,13 +1,61 @@
-from pymongo import MongoClient
-from typing import Optional, Type, Any
+from pymongo import MongoClient, ReplaceOne
+from pymongo.errors import BulkWriteError
+from typing import Optional, Type, Any, Dict, List, Sequence, Set
 import logging
+import threading
 
-from ..config import MONGO_URI
+from ..config import (
+    MONGO_URI,
+    MONGO_MAX_POOL_SIZE,
+    MONGO_MIN_POOL_SIZE,
+    MONGO_MAX_IDLE_TIME_MS,
+    MONGO_CONNECT_TIMEOUT_MS,
+    MONGO_SOCKET_TIMEOUT_MS,
+    MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    MONGO_HEARTBEAT_FREQUENCY_MS,
+)
 
 logger = logging.getLogger(__name__)
 
+def replace_groups(objs: Sequence[Any], id_field: str = 'game_id') -> List[List[ReplaceOne]]:
+    """One upsert group per object; an object without an ID gets an empty group."""
+    groups = []
+    for obj in objs:
+        obj_id = getattr(obj, id_field, None)
+        if obj_id is None:
+            logger.error(f"Object missing id field: {id_field}")
+            groups.append([])
+            continue
+        groups.append([ReplaceOne({id_field: obj_id}, obj.to_dict(), upsert=True)])
+    return groups
+
+def group_results(groups: Sequence[Sequence[Any]], failed: Set[int]) -> List[bool]:
+    """Map failed operation indexes of a flattened bulk write back to one flag per group."""
+    results = []
+    op_index = 0
+    for group in groups:
+        results.append(not any(index in failed for index in range(op_index, op_index + len(group))))
+        op_index += len(group)
+    return results
+
+def failed_indexes(error: BulkWriteError, collection_name: str) -> Set[int]:
+    write_errors = error.details.get('writeErrors', [])
+    for write_error in write_errors:
+        logger.error(f"Error writing {collection_name} operation {write_error['index']}: {write_error.get('errmsg')}")
+    return {write_error['index'] for write_error in write_errors}
+
 class MongoDBClient:
-    """Generic MongoDB client for any type of document."""
+    """
+    Generic MongoDB client for any type of document.
+
+    All instances share one pooled MongoClient per URI for the lifetime of the
+    process. The pool is started lazily on first use, and pymongo's background
+    monitor keeps it healthy with heartbeats, so connect() only pings the
+    server once, when the pool is created.
+    """
+
+    _pool: Dict[str, MongoClient] = {}
+    _pool_lock = threading.Lock()
 
     def __init__(self, uri: Optional[str] = None):
         self.uri = uri or MONGO_URI
@@ -20,21 +68,62 @@ class MongoDBClient:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.close()
     
+    @classmethod
+    def _get_pooled_client(cls, uri: str) -> MongoClient:
+        """Return the shared client for a URI, creating and pinging it on first use."""
+        with cls._pool_lock:
+            client = cls._pool.get(uri)
+            if client is None:
+                client = MongoClient(
+                    uri,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    minPoolSize=MONGO_MIN_POOL_SIZE,
+                    maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+                    connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+                    socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+                    serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                    heartbeatFrequencyMS=MONGO_HEARTBEAT_FREQUENCY_MS,
+                )
+                try:
+                    client.admin.command('ping')
+                except Exception:
+                    client.close()
+                    raise
+                cls._pool[uri] = client
+                logger.info(f"Connected to MongoDB (pool size {MONGO_MIN_POOL_SIZE}-{MONGO_MAX_POOL_SIZE})")
+            return client
+
+    @classmethod
+    def close_pool(cls) -> None:
+        """Close every pooled connection. Call once on process shutdown."""
+        with cls._pool_lock:
+            for client in cls._pool.values():
+                client.close()
+            cls._pool.clear()
+
     def connect(self) -> bool:
-        """Establish connection to MongoDB."""
+        """Attach to the shared MongoDB connection pool."""
         try:
-            self.client = MongoClient(self.uri)
-            self.client.server_info()
-            logger.info(f"Connected to MongoDB")
+            self.client = self._get_pooled_client(self.uri)
             return True
         except Exception as e:
             logger.error(f"MongoDB connection error: {e}")
             return False
+
+    def ping(self) -> bool:
+        """Check that the server is reachable through the pool."""
+        if not self.client:
+            if not self.connect():
+                return False
+        try:
+            self.client.admin.command('ping')
+            return True
+        except Exception as e:
+            logger.error(f"MongoDB health check failed: {e}")
+            return False
     
     def close(self) -> None:
-        """Close the MongoDB connection."""
-        if self.client:
-            self.client.close()
+        """Release this instance's handle; the shared pool stays open for reuse."""
         self.client = None
 
     def save(self, obj: Any, db_name: str, collection_name: str, id_field: str = 'game_id') -> bool:
@@ -55,18 +144,57 @@ class MongoDBClient:
                 logger.error(f"Object missing id field: {id_field}")
                 return False
 
-            existing = collection.find_one({id_field: obj_id})
-            if existing:
-                collection.replace_one({id_field: obj_id}, obj_dict)
-                logger.info(f"Updated {collection_name} record with {id_field}={obj_id}")
+            result = collection.replace_one({id_field: obj_id}, obj_dict, upsert=True)
+            if result.upserted_id is not None:
+                logger.info(f"Inserted new record with _id: {result.upserted_id}")
             else:
-                result = collection.insert_one(obj_dict)
-                logger.info(f"Inserted new record with _id: {result.inserted_id}")
+                logger.info(f"Updated {collection_name} record with {id_field}={obj_id}")
             return True
         except Exception as e:
             logger.error(f"Error saving object to MongoDB: {e}")
             return False
 
+    def save_many(self, objs: Sequence[Any], db_name: str, collection_name: str, id_field: str = 'game_id') -> List[bool]:
+        """
+        Upsert many objects in a single unordered bulk write.
+
+        Returns one flag per input object, in order, so a failed document
+        does not hide the ones that were written.
+        """
+        groups = replace_groups(objs, id_field)
+        results = self.write_operations(groups, db_name, collection_name)
+        return [ok and bool(group) for ok, group in zip(results, groups)]
+
+    def write_operations(self, groups: Sequence[Sequence[Any]], db_name: str, collection_name: str) -> List[bool]:
+        """
+        Run groups of pymongo write operations as one unordered bulk write.
+
+        Each group usually holds the operations for one document. Returns one
+        flag per group that is True only if every operation in it succeeded.
+        """
+        results = [False] * len(groups)
+        operations = [operation for group in groups for operation in group]
+        if not operations:
+            return [True] * len(groups)
+        if not self.client:
+            if not self.connect():
+                return results
+
+        collection = self.client[db_name][collection_name]
+
+        failed = set()
+        try:
+            result = collection.bulk_write(operations, ordered=False)
+            logger.info(f"Bulk wrote {len(operations)} {collection_name} operations "
+                        f"({result.upserted_count} inserted, {result.modified_count} updated)")
+        except BulkWriteError as e:
+            failed = failed_indexes(e, collection_name)
+        except Exception as e:
+            logger.error(f"Error bulk writing to MongoDB: {e}")
+            return results
+
+        return group_results(groups, failed)
+
     def get(self, obj_id: Any, obj_class: Type, db_name: str, collection_name: str, id_field: str = 'game_id') -> Optional[Any]:
         """
         Retrieve an object by ID and reconstruct it via from_dict().
@@ -86,3 +214,58 @@ class MongoDBClient:
         except Exception as e:
             logger.error(f"Error retrieving object from MongoDB: {e}")
             return None
+
+
+    def get_document(self, obj_id: Any, db_name: str, collection_name: str, id_field: str = 'game_id',
+                     projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve the raw document for an ID without building a model.
+        """
+        if not self.client:
+            if not self.connect():
+                return None
+
+        try:
+            return self.client[db_name][collection_name].find_one({id_field: obj_id}, projection)
+        except Exception as e:
+            logger.error(f"Error retrieving document from MongoDB: {e}")
+            return None
+
+    def find_documents(self, query: Dict[str, Any], db_name: str, collection_name: str,
+                       projection: Optional[Dict[str, Any]] = None,
+                       sort: Optional[List[Any]] = None,
+                       limit: int = 0) -> List[Dict[str, Any]]:
+        """
+        Run a find query and return the raw documents.
+        """
+        if not self.client:
+            if not self.connect():
+                return []
+
+        try:
+            cursor = self.client[db_name][collection_name].find(query, projection)
+            if sort:
+                cursor = cursor.sort(sort)
+            if limit:
+                cursor = cursor.limit(limit)
+            return list(cursor)
+        except Exception as e:
+            logger.error(f"Error querying MongoDB: {e}")
+            return []
+
+    def existing_ids(self, obj_ids: Sequence[Any], db_name: str, collection_name: str, id_field: str = 'game_id') -> Set[Any]:
+        """
+        Return which of the given IDs already have a stored document.
+        """
+        if not obj_ids:
+            return set()
+        if not self.client:
+            if not self.connect():
+                return set()
+
+        try:
+            cursor = self.client[db_name][collection_name].find({id_field: {'$in': list(obj_ids)}}, {id_field: 1, '_id': 0})
+            return {document[id_field] for document in cursor}
+        except Exception as e:
+            logger.error(f"Error checking stored ids in MongoDB: {e}")
+            return set()
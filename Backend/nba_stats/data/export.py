@@ -0,0 +1,257 @@
+import datetime
+import json
+import logging
+import math
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, List, Any, Iterator, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from bson import ObjectId
+
+from ..config import COLLECTION_NAME_static, EXPORT_DIR, EXPORT_BATCH_SIZE
+from ..utils.seasons import season_from_game_id, season_type_from_game_id
+from .database import MongoDBClient
+from .models import PLAYER_STAT_FIELDS, TEAM_STAT_FIELDS
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMNS = ['season', 'game_date']
+UNKNOWN_PARTITION = 'unknown'
+
+GAME_FIELDS = [
+    pa.field('game_id', pa.string()),
+    pa.field('season', pa.string()),
+    pa.field('season_type', pa.string()),
+    pa.field('game_date', pa.string()),
+    pa.field('retrieved_at', pa.timestamp('us')),
+]
+STRING_STAT_FIELDS = {'TEAM_ABBREVIATION', 'PLAYER_NAME', 'START_POSITION', 'MIN', 'TEAM_CITY', 'TEAM_NAME'}
+INTEGER_STAT_FIELDS = {'PLAYER_ID', 'TEAM_ID'}
+
+def _stat_type(field: str) -> pa.DataType:
+    if field in STRING_STAT_FIELDS:
+        return pa.string()
+    if field in INTEGER_STAT_FIELDS:
+        return pa.int64()
+    return pa.float64()
+
+PLAYER_SCHEMA = pa.schema(GAME_FIELDS + [pa.field(field, _stat_type(field)) for field in PLAYER_STAT_FIELDS])
+
+# Team totals as the static feed names them; live rows fill them from their flattened statistics
+LIVE_TEAM_STATISTICS_COLUMNS = {
+    'MIN': 'statistics_minutesCalculated',
+    'PTS': 'statistics_points',
+    'FGM': 'statistics_fieldGoalsMade',
+    'FGA': 'statistics_fieldGoalsAttempted',
+    'FG_PCT': 'statistics_fieldGoalsPercentage',
+    'FG3M': 'statistics_threePointersMade',
+    'FG3A': 'statistics_threePointersAttempted',
+    'FG3_PCT': 'statistics_threePointersPercentage',
+    'FTM': 'statistics_freeThrowsMade',
+    'FTA': 'statistics_freeThrowsAttempted',
+    'FT_PCT': 'statistics_freeThrowsPercentage',
+    'OREB': 'statistics_reboundsOffensive',
+    'DREB': 'statistics_reboundsDefensive',
+    'REB': 'statistics_reboundsTotal',
+    'AST': 'statistics_assists',
+    'STL': 'statistics_steals',
+    'BLK': 'statistics_blocks',
+    'TO': 'statistics_turnovers',
+    'PF': 'statistics_foulsPersonal',
+}
+TEAM_EXPORT_FIELDS = TEAM_STAT_FIELDS + tuple(LIVE_TEAM_STATISTICS_COLUMNS) + ('PLUS_MINUS',)
+TEAM_SCHEMA = pa.schema(GAME_FIELDS + [pa.field(field, _stat_type(field)) for field in TEAM_EXPORT_FIELDS])
+
+def _flatten_row(row: Dict[str, Any], prefix: str = '', out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Flatten nested dicts (live team 'statistics') into prefixed columns; lists are dropped."""
+    if out is None:
+        out = {}
+    for key, value in row.items():
+        if isinstance(value, dict):
+            _flatten_row(value, f"{prefix}{key}_", out)
+        elif not isinstance(value, list):
+            out[f"{prefix}{key}"] = value
+    return out
+
+def _coerce(value: Any, data_type: pa.DataType) -> Any:
+    """Make a stored value fit its column: NaN and unparseable numbers become nulls."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if pa.types.is_string(data_type):
+        return str(value)
+    try:
+        return int(value) if pa.types.is_integer(data_type) else float(value)
+    except (TypeError, ValueError):
+        return None
+
+class ExportState:
+    """Last exported _id per collection, persisted to a JSON file for incremental runs."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.last_ids: Dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.last_ids = json.load(f).get('last_ids', {})
+
+    def last_id(self, collection_name: str) -> Optional[ObjectId]:
+        last_id = self.last_ids.get(collection_name)
+        return ObjectId(last_id) if last_id else None
+
+    def advance(self, collection_name: str, last_id: ObjectId) -> None:
+        self.last_ids[collection_name] = str(last_id)
+
+    def save(self) -> None:
+        """Write the state atomically so a crash never leaves a torn file."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'last_ids': self.last_ids}, f)
+        os.replace(tmp_path, self.path)
+
+class BoxScoreExporter:
+    """
+    Exports stored box scores to Parquet as one row per player and per team of each game.
+
+    Each collection is read with a cursor in _id order, batch_size games at
+    a time; every batch becomes one Arrow table per kind, written to
+    <out_dir>/<collection>_players and <collection>_teams, partitioned by
+    season=YYYY-YY/game_date=YYYY-MM-DD. Only one batch is in memory at a
+    time. Player and team columns have fixed schemas, so files written by
+    different batches and runs line up; live team rows are mapped onto the
+    static feed's team totals.
+
+    Incremental runs export only documents with an _id past the one recorded
+    in the state file, which is advanced after every batch, so an
+    interrupted run resumes at the next batch. Only the static collection is
+    exported by default: live box scores are replaced in place while a game
+    is on and keep their _id, so an incremental export would keep a game's
+    mid-game stats for good. Pass the live collection explicitly for a full
+    run. A full run replaces the datasets.
+
+    Box score documents carry no game date: it is looked up from the stored
+    scoreboards. Games without one, such as backfilled seasons, go to
+    game_date=unknown rather than the day they were retrieved.
+    """
+
+    def __init__(self,
+                 db_client: Optional[MongoDBClient] = None,
+                 out_dir: str = EXPORT_DIR,
+                 batch_size: int = EXPORT_BATCH_SIZE,
+                 state_path: Optional[str] = None,
+                 db_name: str = "Boxscores",
+                 collection_names: Sequence[str] = (COLLECTION_NAME_static,)):
+        self.db_client = db_client or MongoDBClient()
+        self.out_dir = out_dir
+        self.batch_size = batch_size
+        self.state = ExportState(state_path or os.path.join(out_dir, 'export_state.json'))
+        self.db_name = db_name
+        self.collection_names = list(collection_names)
+        self._game_dates: Optional[Dict[str, str]] = None
+
+    def _load_game_dates(self) -> Dict[str, str]:
+        """gameId -> scoreboard date, from every stored scoreboard (one small document per day)."""
+        if self._game_dates is None:
+            self._game_dates = {}
+            cursor = self.db_client.client["Scoreboards"]["scoreboard"].find({}, {'game_date': 1, 'games.gameId': 1})
+            for scoreboard in cursor:
+                for game in scoreboard.get('games', []):
+                    self._game_dates[game['gameId']] = scoreboard['game_date']
+        return self._game_dates
+
+    def _game_columns(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        game_id = document.get('game_id')
+        retrieved_at = document.get('retrieved_at')
+        game_date = self._load_game_dates().get(game_id)
+        return {
+            'game_id': game_id,
+            'season': season_from_game_id(game_id) or UNKNOWN_PARTITION,
+            'season_type': season_type_from_game_id(game_id),
+            'game_date': game_date or UNKNOWN_PARTITION,
+            'retrieved_at': retrieved_at if isinstance(retrieved_at, datetime.datetime) else None,
+        }
+
+    def _player_table(self, documents: List[Dict[str, Any]]) -> pa.Table:
+        columns: Dict[str, List[Any]] = {field.name: [] for field in PLAYER_SCHEMA}
+        for document in documents:
+            game = self._game_columns(document)
+            for row in document.get('player_stats', []):
+                for field in PLAYER_SCHEMA:
+                    value = game[field.name] if field.name in game else _coerce(row.get(field.name), field.type)
+                    columns[field.name].append(value)
+        return pa.Table.from_pydict(columns, schema=PLAYER_SCHEMA)
+
+    def _team_table(self, documents: List[Dict[str, Any]]) -> pa.Table:
+        columns: Dict[str, List[Any]] = {field.name: [] for field in TEAM_SCHEMA}
+        for document in documents:
+            game = self._game_columns(document)
+            for team in document.get('team_stats', []):
+                row = _flatten_row(team)
+                for field in TEAM_SCHEMA:
+                    if field.name in game:
+                        value = game[field.name]
+                    else:
+                        value = row.get(field.name, row.get(LIVE_TEAM_STATISTICS_COLUMNS.get(field.name)))
+                        value = _coerce(value, field.type)
+                    columns[field.name].append(value)
+        return pa.Table.from_pydict(columns, schema=TEAM_SCHEMA)
+
+    def _write(self, table: pa.Table, dataset: str, basename: str) -> None:
+        if table.num_rows == 0:
+            return
+        pq.write_to_dataset(table, root_path=os.path.join(self.out_dir, dataset),
+                            partition_cols=PARTITION_COLUMNS,
+                            basename_template=f"{basename}-{{i}}.parquet",
+                            existing_data_behavior='overwrite_or_ignore')
+
+    def _batches(self, collection_name: str, after: Optional[ObjectId]) -> Iterator[List[Dict[str, Any]]]:
+        query = {'_id': {'$gt': after}} if after else {}
+        cursor = (self.db_client.client[self.db_name][collection_name]
+                  .find(query, {'arena': 0})
+                  .sort('_id', 1)
+                  .batch_size(self.batch_size))
+        batch = []
+        for document in cursor:
+            batch.append(document)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def export_collection(self, collection_name: str, incremental: bool = True) -> int:
+        """Export one collection. Returns the number of games written."""
+        players_dataset = f"{collection_name}_players"
+        teams_dataset = f"{collection_name}_teams"
+        after = self.state.last_id(collection_name) if incremental else None
+        if not incremental:
+            for dataset in (players_dataset, teams_dataset):
+                shutil.rmtree(os.path.join(self.out_dir, dataset), ignore_errors=True)
+
+        run_id = uuid.uuid4().hex[:8]
+        games = 0
+        for number, documents in enumerate(self._batches(collection_name, after)):
+            basename = f"part-{run_id}-{number:05d}"
+            self._write(self._player_table(documents), players_dataset, basename)
+            self._write(self._team_table(documents), teams_dataset, basename)
+            games += len(documents)
+            self.state.advance(collection_name, documents[-1]['_id'])
+            self.state.save()
+            logger.info(f"Exported {games} {collection_name} games")
+        return games
+
+    def run(self, incremental: bool = True) -> Dict[str, int]:
+        """Export every configured collection. Returns games written per collection."""
+        if not self.db_client.client and not self.db_client.connect():
+            return {}
+        start = time.perf_counter()
+        exported = {collection_name: self.export_collection(collection_name, incremental)
+                    for collection_name in self.collection_names}
+        logger.info(f"Export finished in {time.perf_counter() - start:.1f}s: {exported}")
+        return exported
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fields that change on every poll without the underlying data changing
+VOLATILE_FIELDS = {'_id', 'retrieved_at'}
+
+def document_fingerprint(obj: Any) -> str:
+    """Hash a model's contents, ignoring volatile fields."""
+    data = {key: value for key, value in obj.to_dict().items() if key not in VOLATILE_FIELDS}
+    encoded = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+class FingerprintCache:
+    """
+    Remembers the fingerprint of the last document written per (kind, id).
+
+    Callers check a fresh document with changed(), skip persistence when it
+    returns None, and call record() once the write has succeeded, so a failed
+    write is retried on the next poll.
+    """
+
+    def __init__(self):
+        self._fingerprints: Dict[Tuple[str, Any], str] = {}
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self.written = 0
+
+    def changed(self, kind: str, obj: Any, id_field: str = 'game_id') -> Optional[str]:
+        """Return the new fingerprint if the document differs from the last write, else None."""
+        fingerprint = document_fingerprint(obj)
+        key = (kind, getattr(obj, id_field, None))
+        with self._lock:
+            if self._fingerprints.get(key) == fingerprint:
+                self.skipped += 1
+                return None
+        return fingerprint
+
+    def record(self, kind: str, obj_id: Any, fingerprint: str) -> None:
+        """Record a successful write."""
+        with self._lock:
+            self._fingerprints[(kind, obj_id)] = fingerprint
+            self.written += 1
+
+    def remember(self, kind: str, obj_id: Any, fingerprint: str) -> None:
+        """Record a fingerprint for a document that turned out to be stored already."""
+        with self._lock:
+            self._fingerprints[(kind, obj_id)] = fingerprint
+
+    def forget(self, obj_id: Any) -> None:
+        """Drop every fingerprint kept for an ID."""
+        with self._lock:
+            for key in [key for key in self._fingerprints if key[1] == obj_id]:
+                del self._fingerprints[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'written': self.written, 'skipped': self.skipped, 'tracked': len(self._fingerprints)}
@@ -0,0 +1,334 @@
+import datetime
+import logging
+import lzma
+from typing import Dict, List, Any, Optional, Tuple
+
+import bson
+from bson.binary import Binary
+from pymongo import InsertOne, UpdateOne
+
+from ..config import COLLECTION_NAME_history, BOX_SCORE_HISTORY_KEYFRAME_INTERVAL
+from ..utils.game_clock import elapsed_game_seconds
+from .database import MongoDBClient
+from .fingerprint import VOLATILE_FIELDS
+from .models import BoxScoreData
+
+logger = logging.getLogger(__name__)
+
+KEYFRAME = 'keyframe'
+DELTA = 'delta'
+
+# A leaf's location in a document: dict keys and list indexes, e.g. ('player_stats', 3, 'PTS')
+Path = Tuple[Any, ...]
+
+def flatten(value: Any, prefix: Path = (), out: Optional[Dict[Path, Any]] = None) -> Dict[Path, Any]:
+    """Flatten nested dicts and lists into {path: leaf value}. Empty containers are leaves."""
+    if out is None:
+        out = {}
+    if isinstance(value, dict) and value:
+        for key, item in value.items():
+            flatten(item, prefix + (key,), out)
+    elif isinstance(value, list) and value:
+        for index, item in enumerate(value):
+            flatten(item, prefix + (index,), out)
+    else:
+        out[prefix] = value
+    return out
+
+def _listify(node: Any) -> Any:
+    if not isinstance(node, dict):
+        return node
+    if node and all(isinstance(key, int) for key in node):
+        return [_listify(node[index]) for index in sorted(node)]
+    return {key: _listify(item) for key, item in node.items()}
+
+def unflatten(flat: Dict[Path, Any]) -> Dict[str, Any]:
+    """Rebuild the nested document from flatten() output. Integer path parts become list indexes."""
+    root: Dict[Any, Any] = {}
+    for path, value in flat.items():
+        node = root
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+    return _listify(root)
+
+def _differs(old: Any, new: Any) -> bool:
+    # 1 == 1.0 == True, but a changed type is still a change worth recording
+    return type(old) is not type(new) or old != new
+
+def encode_path(path: Path) -> str:
+    """'player_stats.3.PTS'. Feed keys never contain dots, and all-digit parts are list indexes."""
+    return '.'.join(str(part) for part in path)
+
+def decode_path(encoded: str) -> Path:
+    return tuple(int(part) if part.isdigit() else part for part in encoded.split('.'))
+
+def pack_segment(data: Dict[str, Any], deltas: List[Dict[str, Any]]) -> Binary:
+    """Compress a closed segment's keyframe and deltas into one BSON blob."""
+    return Binary(lzma.compress(bson.encode({'data': data, 'deltas': deltas})))
+
+def unpack_segment(segment: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """A stored segment's keyframe and deltas, packed or not."""
+    if 'packed' in segment:
+        unpacked = bson.decode(lzma.decompress(segment['packed']))
+        return unpacked['data'], unpacked['deltas']
+    return segment['data'], segment.get('deltas', [])
+
+def _is_final(box_score_data: BoxScoreData) -> bool:
+    return (box_score_data.game_status or '').lower().startswith('final')
+
+class HistoryEntry:
+    """One planned history record (a new keyframe segment or a delta) and the game state it leads to."""
+
+    def __init__(self, game_id: str, seq: int, state: Dict[Path, Any],
+                 segment: Optional[Dict[str, Any]] = None,
+                 delta: Optional[Dict[str, Any]] = None,
+                 segment_seq: Optional[int] = None,
+                 close: Optional[Dict[str, Any]] = None,
+                 final: bool = False):
+        self.game_id = game_id
+        self.seq = seq
+        self.state = state
+        self.segment = segment
+        self.delta = delta
+        self.segment_seq = segment_seq if segment is None else seq
+        # The previous segment ({'seq', 'data', 'deltas'}) to pack when this entry starts a new one
+        self.close = close
+        # Final box score: the segment is packed as soon as this entry is written
+        self.final = final
+
+    @property
+    def is_keyframe(self) -> bool:
+        return self.segment is not None
+
+    @property
+    def kind(self) -> str:
+        return KEYFRAME if self.is_keyframe else DELTA
+
+class BoxScoreHistory:
+    """
+    Time series of live box scores stored as compact per-poll deltas.
+
+    Records are grouped into one document per segment: a full keyframe of
+    the box score followed by the deltas of the next polls, each holding
+    only the leaves that changed as [path, value] pairs plus the paths that
+    disappeared. A new segment starts every keyframe_interval records, so a
+    rebuild never replays more than that many deltas, and grouping keeps the
+    per-poll overhead to a few bytes. Every record carries seq, retrieved_at
+    and game_seconds (elapsed game time), so at() can rebuild the box score
+    at a wall-clock time or a game clock.
+
+    Only the segment a live game is appending to is stored as plain fields.
+    When a new keyframe starts, and when the final box score is recorded,
+    the closed segment's keyframe and deltas are replaced by one lzma
+    compressed BSON blob ('packed'); its seq, end_seq, retrieved_at and
+    game_seconds stay plain for lookups. The repeated paths of the deltas
+    compress well, so a finished game's history is a few box scores in size
+    (see box_score_history_benchmark_main).
+
+    Like PlayByPlayTracker, plan() diffs a fresh box score against the last
+    recorded state and commit() adopts it once the write succeeded, so a
+    failed write is folded into the next delta.
+    """
+
+    def __init__(self,
+                 db_client: Optional[MongoDBClient] = None,
+                 db_name: str = "Boxscores",
+                 collection_name: str = COLLECTION_NAME_history,
+                 keyframe_interval: int = BOX_SCORE_HISTORY_KEYFRAME_INTERVAL):
+        self.db_client = db_client or MongoDBClient()
+        self.db_name = db_name
+        self.collection_name = collection_name
+        self.keyframe_interval = keyframe_interval
+        self._state: Dict[str, Dict[Path, Any]] = {}
+        self._seq: Dict[str, int] = {}
+        self._segment_seq: Dict[str, Optional[int]] = {}
+        self._since_keyframe: Dict[str, int] = {}
+        # Keyframe and deltas of each game's open segment, kept to pack it once it closes
+        self._open: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _snapshot(box_score_data: BoxScoreData) -> Dict[Path, Any]:
+        data = {key: value for key, value in box_score_data.to_dict().items() if key not in VOLATILE_FIELDS}
+        return flatten(data)
+
+    @staticmethod
+    def _apply(state: Dict[Path, Any], delta: Dict[str, Any]) -> None:
+        for path in delta.get('unset', []):
+            state.pop(decode_path(path), None)
+        for path, value in delta.get('set', []):
+            state[decode_path(path)] = value
+
+    def _find_segment(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        segments = self.db_client.find_documents(query, self.db_name, self.collection_name,
+                                                 sort=[('seq', -1)], limit=1)
+        return segments[0] if segments else None
+
+    def is_loaded(self, game_id: str) -> bool:
+        return game_id in self._state
+
+    def _ensure_loaded(self, game_id: str) -> None:
+        """Pick up where a previous process left off."""
+        if game_id not in self._state:
+            self.load(game_id, self._find_segment({'game_id': game_id}))
+
+    def load(self, game_id: str, segment: Optional[Dict[str, Any]]) -> None:
+        """Resume a game from its latest stored segment (None if it has no history yet)."""
+        if segment is None:
+            self._state[game_id] = {}
+            self._seq[game_id] = 0
+            self._segment_seq[game_id] = None
+            self._since_keyframe[game_id] = 0
+            self._open[game_id] = None
+            return
+        data, deltas = unpack_segment(segment)
+        state = flatten(data)
+        for delta in deltas:
+            self._apply(state, delta)
+        self._state[game_id] = state
+        self._seq[game_id] = deltas[-1]['seq'] if deltas else segment['seq']
+        self._segment_seq[game_id] = segment['seq']
+        if 'packed' in segment:
+            # A packed segment is closed; the next record starts a new one
+            self._since_keyframe[game_id] = self.keyframe_interval
+            self._open[game_id] = None
+        else:
+            self._since_keyframe[game_id] = len(deltas)
+            self._open[game_id] = {'seq': segment['seq'], 'data': data, 'deltas': list(deltas)}
+        logger.info(f"Loaded box score history for game {game_id} at seq {self._seq[game_id]}")
+
+    def plan(self, box_score_data: BoxScoreData) -> Optional[HistoryEntry]:
+        """Diff a box score against the last recorded state. Returns None if nothing changed."""
+        game_id = box_score_data.game_id
+        self._ensure_loaded(game_id)
+        previous = self._state[game_id]
+        current = self._snapshot(box_score_data)
+
+        changed = [[encode_path(path), value] for path, value in current.items()
+                   if path not in previous or _differs(previous[path], value)]
+        removed = [encode_path(path) for path in previous if path not in current]
+        if previous and not changed and not removed:
+            return None
+
+        seq = self._seq[game_id] + 1
+        game_seconds = elapsed_game_seconds(box_score_data.period, box_score_data.game_clock)
+        final = _is_final(box_score_data)
+        if not previous or self._since_keyframe[game_id] + 1 >= self.keyframe_interval:
+            segment = {
+                'game_id': game_id,
+                'seq': seq,
+                'end_seq': seq,
+                'retrieved_at': box_score_data.retrieved_at,
+                'data': unflatten(current),
+                'deltas': [],
+            }
+            if game_seconds is not None:
+                # Left out before tip-off so the first timed delta's $min can fill it in (null sorts below numbers)
+                segment['game_seconds'] = game_seconds
+            return HistoryEntry(game_id, seq, current, segment=segment, close=self._open[game_id], final=final)
+
+        delta = {'seq': seq, 'retrieved_at': box_score_data.retrieved_at, 'game_seconds': game_seconds, 'set': changed}
+        if removed:
+            delta['unset'] = removed
+        return HistoryEntry(game_id, seq, current, delta=delta, segment_seq=self._segment_seq[game_id], final=final)
+
+    def _pack_operation(self, game_id: str, segment_seq: int, data: Dict[str, Any],
+                        deltas: List[Dict[str, Any]]) -> UpdateOne:
+        return UpdateOne({'game_id': game_id, 'seq': segment_seq},
+                         {'$set': {'packed': pack_segment(data, deltas)}, '$unset': {'data': '', 'deltas': ''}})
+
+    def to_operations(self, entry: HistoryEntry) -> List[Any]:
+        """Insert a new segment (packing the one it closes), or append a delta to the current one."""
+        if entry.is_keyframe:
+            operations = []
+            if entry.close:
+                operations.append(self._pack_operation(entry.game_id, entry.close['seq'], entry.close['data'],
+                                                       entry.close['deltas']))
+            segment = entry.segment
+            if entry.final:
+                segment = {key: value for key, value in segment.items() if key not in ('data', 'deltas')}
+                segment['packed'] = pack_segment(entry.segment['data'], [])
+            return operations + [InsertOne(segment)]
+
+        if entry.final:
+            # Write the last delta straight into the packed segment
+            current = self._open[entry.game_id]
+            update = {'$set': {'end_seq': entry.seq,
+                               'packed': pack_segment(current['data'], current['deltas'] + [entry.delta])},
+                      '$unset': {'data': '', 'deltas': ''}}
+        else:
+            update = {'$push': {'deltas': entry.delta}, '$set': {'end_seq': entry.seq}}
+        if entry.delta['game_seconds'] is not None:
+            # Segments are found by their earliest game time; this also creates it on a pregame keyframe
+            update['$min'] = {'game_seconds': entry.delta['game_seconds']}
+        return [UpdateOne({'game_id': entry.game_id, 'seq': entry.segment_seq}, update)]
+
+    def commit(self, entry: HistoryEntry) -> None:
+        """Adopt a planned entry's state after its record was written."""
+        game_id = entry.game_id
+        self._state[game_id] = entry.state
+        self._seq[game_id] = entry.seq
+        self._segment_seq[game_id] = entry.segment_seq
+        if entry.final:
+            # The segment is packed; anything recorded after the final box score starts a new one
+            self._since_keyframe[game_id] = self.keyframe_interval
+            self._open[game_id] = None
+        elif entry.is_keyframe:
+            self._since_keyframe[game_id] = 0
+            self._open[game_id] = {'seq': entry.seq, 'data': entry.segment['data'], 'deltas': []}
+        else:
+            self._since_keyframe[game_id] += 1
+            self._open[game_id]['deltas'].append(entry.delta)
+
+    def record(self, box_score_data: BoxScoreData) -> bool:
+        """Plan, write and commit one box score. Returns False only if the write failed."""
+        entry = self.plan(box_score_data)
+        if entry is None:
+            return True
+        ok = self.db_client.write_operations([self.to_operations(entry)], self.db_name, self.collection_name)[0]
+        if ok:
+            self.commit(entry)
+        return ok
+
+    def forget(self, game_id: str) -> None:
+        self._state.pop(game_id, None)
+        self._seq.pop(game_id, None)
+        self._segment_seq.pop(game_id, None)
+        self._since_keyframe.pop(game_id, None)
+        self._open.pop(game_id, None)
+
+    def at(self, game_id: str,
+           timestamp: Optional[datetime.datetime] = None,
+           game_seconds: Optional[float] = None) -> Optional[BoxScoreData]:
+        """
+        Rebuild the box score as it was at a wall-clock time or at an elapsed game time.
+
+        Returns the last recorded state at or before the given point, or None
+        if there is none.
+        """
+        if (timestamp is None) == (game_seconds is None):
+            raise ValueError("Pass exactly one of timestamp or game_seconds")
+        field, value = ('retrieved_at', timestamp) if timestamp is not None else ('game_seconds', game_seconds)
+        segment = self._find_segment({'game_id': game_id, field: {'$lte': value}})
+        if segment is None:
+            return None
+
+        data, deltas = unpack_segment(segment)
+        state = flatten(data)
+        retrieved_at = segment['retrieved_at']
+        # Replay up to the last delta at or before the target
+        last = max((index for index, delta in enumerate(deltas)
+                    if delta.get(field) is not None and delta[field] <= value), default=-1)
+        for delta in deltas[:last + 1]:
+            self._apply(state, delta)
+            retrieved_at = delta['retrieved_at']
+
+        document = unflatten(state)
+        document['retrieved_at'] = retrieved_at
+        return BoxScoreData.from_dict(document)
+    def at_game_clock(self, game_id: str, period: int, clock: str) -> Optional[BoxScoreData]:
+        """Rebuild the box score at a period and live game clock, e.g. (4, 'PT02M00.00S')."""
+        game_seconds = elapsed_game_seconds(period, clock)
+        if game_seconds is None:
+            return None
+        return self.at(game_id, game_seconds=game_seconds)
@@ -0,0 +1,212 @@
+import datetime
+import logging
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
+from ..config import COLLECTION_NAME_live, COLLECTION_NAME_static, COLLECTION_NAME_history, AGGREGATES_DB_NAME
+from .aggregates import PLAYER_SEASON, TEAM_SEASON, SEASON_LEADERS, SEASON_ACCUMULATORS
+from .database import MongoDBClient
+
+logger = logging.getLogger(__name__)
+
+class IndexSpec:
+    """One index a collection is expected to have."""
+
+    def __init__(self, db_name: str, collection_name: str, keys: Sequence[Tuple[str, int]], unique: bool = False):
+        self.db_name = db_name
+        self.collection_name = collection_name
+        self.keys = list(keys)
+        self.unique = unique
+
+    @property
+    def name(self) -> str:
+        return '_'.join(f"{field}_{direction}" for field, direction in self.keys)
+
+    def to_model(self) -> IndexModel:
+        return IndexModel(self.keys, name=self.name, unique=self.unique)
+
+    def __repr__(self) -> str:
+        unique = ' unique' if self.unique else ''
+        return f"{self.db_name}.{self.collection_name} {self.keys}{unique}"
+
+def _box_score_indexes(collection_name: str) -> List[IndexSpec]:
+    return [
+        IndexSpec("Boxscores", collection_name, [('game_id', ASCENDING)], unique=True),
+        # Multikey: one entry per player / team row
+        IndexSpec("Boxscores", collection_name, [('player_stats.PLAYER_NAME', ASCENDING)]),
+        IndexSpec("Boxscores", collection_name, [('team_stats.TEAM_ABBREVIATION', ASCENDING)]),
+    ]
+
+# Every save/get filters on game_id (game_date for scoreboards); history is read newest segment first
+INDEXES: List[IndexSpec] = [
+    *_box_score_indexes(COLLECTION_NAME_live),
+    *_box_score_indexes(COLLECTION_NAME_static),
+    IndexSpec("Boxscores", COLLECTION_NAME_history, [('game_id', ASCENDING), ('seq', ASCENDING)], unique=True),
+    IndexSpec("PlayByPlay", "play_by_play", [('game_id', ASCENDING)], unique=True),
+    IndexSpec("PlayByPlay", "game_state", [('game_id', ASCENDING)], unique=True),
+    IndexSpec("Scoreboards", "scoreboard", [('game_date', ASCENDING)], unique=True),
+]
+
+class QuerySpec:
+    """
+    A query shape the code issues (a read, or the filter of a write), with sample values.
+
+    full_read marks a read of the whole collection, which is a scan however
+    it runs; check_queries() does not report it.
+    """
+
+    def __init__(self, db_name: str, collection_name: str, query: Dict[str, Any], issued_by: str,
+                 sort: Optional[Sequence[Tuple[str, int]]] = None, full_read: bool = False):
+        self.db_name = db_name
+        self.collection_name = collection_name
+        self.query = query
+        self.issued_by = issued_by
+        self.sort = list(sort) if sort else None
+        self.full_read = full_read
+
+    def __repr__(self) -> str:
+        sort = f" sorted by {self.sort}" if self.sort else ""
+        return f"{self.db_name}.{self.collection_name} {list(self.query) or 'all documents'}{sort} ({self.issued_by})"
+
+_GAME_ID = '0000000000'
+
+def _box_score_queries(collection_name: str) -> List[QuerySpec]:
+    return [
+        QuerySpec("Boxscores", collection_name, {'game_id': _GAME_ID}, "MongoDBClient.save_many / get"),
+        QuerySpec("Boxscores", collection_name, {'game_id': {'$in': [_GAME_ID]}}, "MongoDBClient.existing_ids"),
+        # The exporter resumes after the last exported _id
+        QuerySpec("Boxscores", collection_name, {'_id': {'$gt': ObjectId()}}, "BoxScoreExporter incremental",
+                  sort=[('_id', ASCENDING)]),
+        QuerySpec("Boxscores", collection_name, {}, "BoxScoreExporter full", sort=[('_id', ASCENDING)],
+                  full_read=True),
+    ]
+
+def _by_id(db_name: str, collection_name: str, issued_by: str) -> QuerySpec:
+    return QuerySpec(db_name, collection_name, {'_id': ''}, issued_by)
+
+# Every query the code issues against MongoDB; check_queries() explains each one
+QUERIES: List[QuerySpec] = [
+    *_box_score_queries(COLLECTION_NAME_live),
+    *_box_score_queries(COLLECTION_NAME_static),
+    QuerySpec("Boxscores", COLLECTION_NAME_static, {}, "AggregateEngine.catch_up", full_read=True),
+    QuerySpec("Boxscores", COLLECTION_NAME_history, {'game_id': _GAME_ID}, "BoxScoreHistory load",
+              sort=[('seq', DESCENDING)]),
+    QuerySpec("Boxscores", COLLECTION_NAME_history,
+              {'game_id': _GAME_ID, 'retrieved_at': {'$lte': datetime.datetime(2000, 1, 1)}},
+              "BoxScoreHistory.at (timestamp)", sort=[('seq', DESCENDING)]),
+    QuerySpec("Boxscores", COLLECTION_NAME_history, {'game_id': _GAME_ID, 'game_seconds': {'$lte': 0}},
+              "BoxScoreHistory.at (game clock)", sort=[('seq', DESCENDING)]),
+    QuerySpec("Boxscores", COLLECTION_NAME_history, {'game_id': _GAME_ID, 'seq': 1}, "BoxScoreHistory delta append"),
+    QuerySpec("PlayByPlay", "play_by_play", {'game_id': _GAME_ID}, "PlayByPlayTracker load / write"),
+    QuerySpec("PlayByPlay", "game_state", {'game_id': _GAME_ID}, "GameStateEngine load / checkpoint"),
+    QuerySpec("Scoreboards", "scoreboard", {'game_date': ''}, "scoreboard_main save"),
+    QuerySpec("Scoreboards", "scoreboard", {}, "BoxScoreExporter game dates", full_read=True),
+    _by_id(AGGREGATES_DB_NAME, PLAYER_SEASON, "AggregateEngine player seasons"),
+    _by_id(AGGREGATES_DB_NAME, TEAM_SEASON, "AggregateEngine team seasons"),
+    _by_id(AGGREGATES_DB_NAME, SEASON_LEADERS, "AggregateEngine leaders"),
+    _by_id(AGGREGATES_DB_NAME, SEASON_ACCUMULATORS, "AggregateEngine checkpoints"),
+]
+
+def _stages(plan: Dict[str, Any]):
+    """Every stage name in an explain() plan tree."""
+    yield plan.get('stage')
+    for child in ('inputStage', 'queryPlan'):
+        if child in plan:
+            yield from _stages(plan[child])
+    for child_plan in plan.get('inputStages', []):
+        yield from _stages(child_plan)
+
+class IndexManager:
+    """
+    Creates the declared indexes at startup and checks that reads use them.
+
+    ensure() creates whatever is missing; create_indexes is a no-op for
+    indexes that already exist, so it is safe on every start. A unique
+    index on a collection that already holds duplicates fails to build and
+    is reported rather than raised. check_queries() explains every query
+    shape in QUERIES, which lists each read and write filter the code
+    issues, and reports the ones that would run as a collection scan;
+    reads of a whole collection are expected to scan and are skipped.
+    """
+
+    def __init__(self, db_client: Optional[MongoDBClient] = None, specs: Sequence[IndexSpec] = INDEXES,
+                 queries: Sequence[QuerySpec] = QUERIES):
+        self.db_client = db_client or MongoDBClient()
+        self.specs = list(specs)
+        self.queries = list(queries)
+
+    def _collection(self, spec):
+        return self.db_client.client[spec.db_name][spec.collection_name]
+
+    def _connected(self) -> bool:
+        return bool(self.db_client.client) or self.db_client.connect()
+
+    def _by_collection(self) -> Dict[Tuple[str, str], List[IndexSpec]]:
+        groups: Dict[Tuple[str, str], List[IndexSpec]] = {}
+        for spec in self.specs:
+            groups.setdefault((spec.db_name, spec.collection_name), []).append(spec)
+        return groups
+
+    def ensure(self) -> List[IndexSpec]:
+        """Create missing indexes. Returns the specs that could not be built."""
+        if not self._connected():
+            return list(self.specs)
+        failed = []
+        for specs in self._by_collection().values():
+            collection = self._collection(specs[0])
+            for spec in specs:
+                # One at a time, so a unique index blocked by duplicates does not stop the others
+                try:
+                    collection.create_indexes([spec.to_model()])
+                except Exception as e:
+                    failed.append(spec)
+                    logger.error(f"Could not create index {spec}: {e}")
+        logger.info(f"Ensured {len(self.specs) - len(failed)} of {len(self.specs)} MongoDB indexes")
+        return failed
+
+    def missing(self) -> List[IndexSpec]:
+        """Declared indexes that do not exist, compared by key pattern."""
+        if not self._connected():
+            return list(self.specs)
+        missing = []
+        for (db_name, collection_name), specs in self._by_collection().items():
+            try:
+                existing = [list(index['key'].items()) for index in self._collection(specs[0]).list_indexes()]
+            except Exception as e:
+                logger.error(f"Could not list indexes of {db_name}.{collection_name}: {e}")
+                existing = []
+            missing.extend(spec for spec in specs if spec.keys not in existing)
+        return missing
+
+    def check_queries(self) -> List[QuerySpec]:
+        """Explain each declared query. Returns the ones that would scan the collection without reading all of it."""
+        queries = [query for query in self.queries if not query.full_read]
+        if not self._connected():
+            return queries
+        scans = []
+        for query in queries:
+            try:
+                cursor = self._collection(query).find(query.query)
+                if query.sort:
+                    cursor = cursor.sort(query.sort)
+                explained = cursor.limit(1).explain()
+            except Exception as e:
+                # An unexplained query is not known to be covered
+                scans.append(query)
+                logger.warning(f"Could not explain {query}: {e}")
+                continue
+            plan = explained.get('queryPlanner', {}).get('winningPlan', {})
+            if 'COLLSCAN' in _stages(plan):
+                scans.append(query)
+                logger.warning(f"{query} runs as a collection scan")
+        return scans
+
+    def verify(self) -> Dict[str, List[Any]]:
+        """Create missing indexes, then report what is still missing and which reads still scan."""
+        failed = self.ensure()
+        report = {'failed': failed, 'missing': self.missing(), 'collection_scans': self.check_queries()}
+        if not any(report.values()):
+            logger.info("All MongoDB reads are covered by an index")
+        return report
@@ -1,19 +1,138 @@
 import datetime
-from typing import Dict, List, Any, Type, TypeVar, Optional
+from collections.abc import Mapping
+from typing import Dict, List, Any, Type, TypeVar, Optional, Iterator, Sequence, Union
 
 T = TypeVar('T', bound='BaseDataModel')
+S = TypeVar('S', bound='StatLine')
+
+_MISSING = object()
+
+class StatLine(Mapping):
+    """
+    Base class for compact, slotted stat records.
+
+    Known columns are stored in __slots__ and read as attributes
+    (line.PTS) or like a dict (line['PTS'], line.get('PTS')), so code written
+    against the old dict rows keeps working. Any other keys go to the extra
+    dict. Columns that were never given are left out of to_dict(), so a
+    record round-trips to the same document it was built from.
+    """
+
+    __slots__ = ('extra',)
+    FIELDS: Sequence[str] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+        # Slot descriptors' setters, which skip the generic attribute lookup
+        cls._setters = {field: getattr(cls, field).__set__ for field in cls.FIELDS}
+
+    def __init__(self, **values: Any):
+        self._fill(values)
+
+    def _fill(self, values: Dict[str, Any]) -> None:
+        extra = None
+        setters = self._setters
+        for key, value in values.items():
+            setter = setters.get(key)
+            if setter is not None:
+                setter(self, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls: Type[S], data: Dict[str, Any]) -> S:
+        """Build a record from a row dict or Mongo subdocument."""
+        # Skips the **kwargs repacking of cls(**data)
+        line = cls.__new__(cls)
+        line._fill(data)
+        return line
+
+    @classmethod
+    def from_list(cls: Type[S], rows: Sequence[Union[Dict[str, Any], S]]) -> List[S]:
+        """Convert row dicts to records, passing through rows that already are records."""
+        from_dict = cls.from_dict
+        return [row if type(row) is cls else from_dict(row) for row in rows]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a new plain dict, e.g. for a Mongo document."""
+        data = {}
+        for field in self.FIELDS:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING:
+                data[field] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._field_set:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for field in self.FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+PLAYER_STAT_FIELDS = (
+    'TEAM_ABBREVIATION', 'PLAYER_NAME', 'PLAYER_ID', 'START_POSITION',
+    'MIN', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TO',
+    'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT',
+)
+
+class PlayerStatLine(StatLine):
+    """One player's line in a live or static box score."""
+
+    __slots__ = PLAYER_STAT_FIELDS
+    FIELDS = PLAYER_STAT_FIELDS
+
+TEAM_STAT_FIELDS = (
+    'TEAM_ID', 'TEAM_CITY', 'TEAM_NAME', 'TEAM_ABBREVIATION', 'TEAM_SCORE',
+)
+
+class TeamStatLine(StatLine):
+    """
+    One team's line in a box score. The identifying columns are slots; the
+    rest (the live feed's nested statistics, the static feed's totals) stay
+    in extra.
+    """
+
+    __slots__ = TEAM_STAT_FIELDS
+    FIELDS = TEAM_STAT_FIELDS
+
+def _to_document(value: Any) -> Any:
+    if isinstance(value, list):
+        return [item.to_dict() if isinstance(item, StatLine) else item for item in value]
+    return value
 
 class BaseDataModel:
     """Base class for data models providing serialization helpers."""
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert the instance attributes to a dictionary."""
-        return self.__dict__
+        """Convert the instance attributes to a new dictionary, with stat lines as plain dicts."""
+        return {key: _to_document(value) for key, value in self.__dict__.items()}
 
     @classmethod
     def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
-        """Create an instance from a dictionary."""
-        return cls(**data)
+        """Create an instance from a dictionary, such as a stored Mongo document."""
+        return cls(**{key: value for key, value in data.items() if key != '_id'})
 
 class BoxScoreData(BaseDataModel):
     """Data model for live box score information."""
@@ -22,27 +141,31 @@ class BoxScoreData(BaseDataModel):
                  game_id: str, 
                  game_status: str, 
                  arena: Dict[str, Any], 
-                 player_stats: List[Dict[str, Any]], 
-                 team_stats: List[Dict[str, Any]],
-                 retrieved_at: Optional[datetime.datetime] = None):
+                 player_stats: Sequence[Union[Dict[str, Any], PlayerStatLine]], 
+                 team_stats: Sequence[Union[Dict[str, Any], TeamStatLine]],
+                 retrieved_at: Optional[datetime.datetime] = None,
+                 period: Optional[int] = None,
+                 game_clock: Optional[str] = None):
         self.game_id = game_id
         self.game_status = game_status
         self.arena = arena
-        self.player_stats = player_stats
-        self.team_stats = team_stats
+        self.player_stats = PlayerStatLine.from_list(player_stats)
+        self.team_stats = TeamStatLine.from_list(team_stats)
         self.retrieved_at = retrieved_at or datetime.datetime.now()
+        self.period = period
+        self.game_clock = game_clock
 
 class StaticBoxScoreData(BaseDataModel):
     """Data model for static (historical) box score information."""
 
     def __init__(self, 
                  game_id: str, 
-                 player_stats: List[Dict[str, Any]], 
-                 team_stats: List[Dict[str, Any]],
+                 player_stats: Sequence[Union[Dict[str, Any], PlayerStatLine]], 
+                 team_stats: Sequence[Union[Dict[str, Any], TeamStatLine]],
                  retrieved_at: Optional[datetime.datetime] = None):
         self.game_id = game_id
-        self.player_stats = player_stats
-        self.team_stats = team_stats
+        self.player_stats = PlayerStatLine.from_list(player_stats)
+        self.team_stats = TeamStatLine.from_list(team_stats)
         self.retrieved_at = retrieved_at or datetime.datetime.now()
 
 class ScoreboardData(BaseDataModel):
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+from typing import Dict, List, Any, Optional
+
+from pymongo import ReplaceOne, UpdateOne
+
+from .models import PlayByPlayData
+
+logger = logging.getLogger(__name__)
+
+def action_digest(action: Dict[str, Any]) -> str:
+    """Return a short, stable digest of one play-by-play action."""
+    encoded = json.dumps(action, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+class PlayByPlayUpdate:
+    """The actions one poll adds or corrects for a single game."""
+
+    def __init__(self,
+                 game_id: str,
+                 play_by_play_data: PlayByPlayData,
+                 new_plays: List[Dict[str, Any]],
+                 corrected_plays: List[Dict[str, Any]],
+                 digests: Dict[int, str],
+                 full_write: bool,
+                 removed_action_numbers: Optional[List[int]] = None):
+        self.game_id = game_id
+        self.play_by_play_data = play_by_play_data
+        self.new_plays = new_plays
+        self.corrected_plays = corrected_plays
+        self.digests = digests
+        self.full_write = full_write
+        # Stored actions the feed no longer has (e.g. voided plays)
+        self.removed_action_numbers = removed_action_numbers or []
+
+    def is_empty(self) -> bool:
+        return (not self.full_write and not self.new_plays and not self.corrected_plays
+                and not self.removed_action_numbers)
+
+    def to_operations(self, id_field: str = 'game_id') -> List[Any]:
+        """Build the Mongo write operations for this update."""
+        if self.full_write:
+            return [ReplaceOne({id_field: self.game_id}, self.play_by_play_data.to_dict(), upsert=True)]
+
+        # A $push, a $pull and a positional $set on the same array conflict, so each is its own operation.
+        operations = [UpdateOne({id_field: self.game_id}, {'$set': {'retrieved_at': self.play_by_play_data.retrieved_at}})]
+        if self.new_plays:
+            # Skipped if an earlier, unacknowledged write already pushed them
+            new_action_numbers = [play['actionNumber'] for play in self.new_plays]
+            operations.append(UpdateOne(
+                {id_field: self.game_id, 'plays.actionNumber': {'$nin': new_action_numbers}},
+                {'$push': {'plays': {'$each': self.new_plays, '$sort': {'actionNumber': 1}}}}
+            ))
+        if self.removed_action_numbers:
+            operations.append(UpdateOne(
+                {id_field: self.game_id},
+                {'$pull': {'plays': {'actionNumber': {'$in': self.removed_action_numbers}}}}
+            ))
+        for play in self.corrected_plays:
+            operations.append(UpdateOne(
+                {id_field: self.game_id, 'plays.actionNumber': play['actionNumber']},
+                {'$set': {'plays.$': play}}
+            ))
+        return operations
+
+class PlayByPlayTracker:
+    """
+    Tracks which play-by-play actions are already stored for each game.
+
+    State is a digest per actionNumber, so each poll only appends actions that
+    were never written, rewrites actions whose contents the league changed and
+    pulls actions the league deleted. After a restart the state is rebuilt from
+    the stored document with load().
+    """
+
+    def __init__(self):
+        self._stored: Dict[str, Optional[Dict[int, str]]] = {}
+
+    def is_loaded(self, game_id: str) -> bool:
+        return game_id in self._stored
+
+    def load(self, game_id: str, stored_plays: Optional[List[Dict[str, Any]]]) -> None:
+        """Seed a game's state from the plays already in the database (None if nothing is stored)."""
+        if stored_plays is None:
+            self._stored[game_id] = None
+            return
+        self._stored[game_id] = {play['actionNumber']: action_digest(play) for play in stored_plays}
+        logger.info(f"Loaded {len(stored_plays)} stored plays for game {game_id}")
+
+    def last_action_number(self, game_id: str) -> int:
+        stored = self._stored.get(game_id)
+        return max(stored, default=0) if stored else 0
+
+    def plan(self, play_by_play_data: PlayByPlayData) -> PlayByPlayUpdate:
+        """Work out which actions of a fresh poll need to be written."""
+        game_id = play_by_play_data.game_id
+        stored = self._stored.get(game_id)
+        digests = {play['actionNumber']: action_digest(play) for play in play_by_play_data.plays}
+
+        if stored is None:
+            return PlayByPlayUpdate(game_id, play_by_play_data, [], [], digests, full_write=True)
+
+        last_stored = max(stored, default=0)
+        new_plays = []
+        corrected_plays = []
+        for play in play_by_play_data.plays:
+            action_number = play['actionNumber']
+            if action_number > last_stored or action_number not in stored:
+                new_plays.append(play)
+            elif stored[action_number] != digests[action_number]:
+                corrected_plays.append(play)
+
+        removed = sorted(action_number for action_number in stored if action_number not in digests)
+        if removed and len(removed) * 2 > len(stored):
+            # Deletions are a handful of voided plays; losing most of the game is a truncated feed
+            logger.warning(f"Play-by-play for game {game_id} is missing {len(removed)} of {len(stored)} "
+                           f"stored actions, not removing them")
+            removed = []
+
+        return PlayByPlayUpdate(game_id, play_by_play_data, new_plays, corrected_plays, digests,
+                                full_write=False, removed_action_numbers=removed)
+
+    def commit(self, update: PlayByPlayUpdate) -> None:
+        """Record that an update was written successfully."""
+        if update.full_write:
+            self._stored[update.game_id] = dict(update.digests)
+            return
+        stored = self._stored.get(update.game_id) or {}
+        for play in update.new_plays + update.corrected_plays:
+            stored[play['actionNumber']] = update.digests[play['actionNumber']]
+        for action_number in update.removed_action_numbers:
+            stored.pop(action_number, None)
+        self._stored[update.game_id] = stored
+
+    def forget(self, game_id: str) -> None:
+        """Drop a game's state, e.g. once it is final or after a failed write left the stored plays unknown."""
+        self._stored.pop(game_id, None)
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from typing import Optional
+
+from aiohttp import web
+
+from ..config import LIVE_API_HOST, LIVE_API_PORT, LIVE_STREAM_HEARTBEAT_SECONDS
+from .broker import PlayBroker, END_OF_STREAM
+from .store import LiveStore, CachedResponse, encode_json
+
+logger = logging.getLogger(__name__)
+
+STORE_KEY = web.AppKey("live_store", LiveStore)
+BROKER_KEY = web.AppKey("play_broker", PlayBroker)
+
+# Clients may keep a copy but must revalidate it, which the ETag makes cheap
+CACHE_CONTROL = "no-cache"
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+def _error(status: int, message: str) -> web.Response:
+    return web.Response(status=status, body=encode_json({'error': message}), content_type='application/json')
+
+def respond(request: web.Request, cached: Optional[CachedResponse], missing: str) -> web.Response:
+    """Serve a pre-serialized response: 304 when the ETag matches, gzipped when the client accepts it."""
+    if cached is None:
+        return _error(404, missing)
+    headers = {'ETag': cached.etag, 'Cache-Control': CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+    if _etag_matches(request.headers.get('If-None-Match'), cached.etag):
+        return web.Response(status=304, headers=headers)
+    if cached.gzip_body is not None and 'gzip' in request.headers.get('Accept-Encoding', ''):
+        headers['Content-Encoding'] = 'gzip'
+        return web.Response(body=cached.gzip_body, headers=headers, content_type='application/json')
+    return web.Response(body=cached.body, headers=headers, content_type='application/json')
+
+async def health(request: web.Request) -> web.Response:
+    stats = request.app[STORE_KEY].stats()
+    if BROKER_KEY in request.app:
+        stats.update(request.app[BROKER_KEY].stats())
+    return web.Response(body=encode_json({'status': 'ok', **stats}), content_type='application/json')
+
+async def games(request: web.Request) -> web.Response:
+    return respond(request, request.app[STORE_KEY].games(), "No games")
+
+async def scoreboard(request: web.Request) -> web.Response:
+    return respond(request, request.app[STORE_KEY].scoreboard(), "Scoreboard not loaded yet")
+
+async def box_score(request: web.Request) -> web.Response:
+    game_id = request.match_info['game_id']
+    return respond(request, request.app[STORE_KEY].box_score(game_id), f"No live box score for game {game_id}")
+
+async def game_state(request: web.Request) -> web.Response:
+    game_id = request.match_info['game_id']
+    return respond(request, request.app[STORE_KEY].game_state(game_id), f"No game state for game {game_id}")
+
+async def play_by_play(request: web.Request) -> web.Response:
+    game_id = request.match_info['game_id']
+    tail = request.query.get('tail')
+    if tail is not None:
+        try:
+            tail = int(tail)
+        except ValueError:
+            return _error(400, "tail must be an integer")
+    cached = request.app[STORE_KEY].play_by_play_tail(game_id, tail)
+    return respond(request, cached, f"No live play-by-play for game {game_id}")
+
+async def play_stream(request: web.Request) -> web.StreamResponse:
+    """
+    New actions of a game as server-sent events.
+
+    A client resumes with the Last-Event-ID header (sent automatically by
+    EventSource) or ?after=<actionNumber>, and first gets the actions it
+    missed. Without either, only actions published from now on are sent.
+    The game starting and going final are sent as 'start' and 'final' events.
+    """
+    game_id = request.match_info['game_id']
+    cursor = request.headers.get('Last-Event-ID') or request.query.get('after')
+    try:
+        after = int(cursor) if cursor is not None else None
+    except ValueError:
+        return _error(400, "Last-Event-ID and after must be actionNumbers")
+
+    broker = request.app[BROKER_KEY]
+    subscription = broker.subscribe(game_id, after)
+    response = web.StreamResponse(headers={
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+    try:
+        await response.prepare(request)
+        while True:
+            try:
+                chunk = await asyncio.wait_for(subscription.queue.get(), LIVE_STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment line, keeps idle connections from being closed by proxies
+                chunk = b': keepalive\n\n'
+            if chunk is END_OF_STREAM:
+                break
+            await response.write(chunk)
+    except (ConnectionResetError, asyncio.CancelledError):
+        logger.debug(f"Stream client for game {game_id} disconnected")
+        raise
+    finally:
+        broker.unsubscribe(subscription)
+    return response
+
+def create_app(store: LiveStore, broker: Optional[PlayBroker] = None) -> web.Application:
+    """The read API over a LiveStore (and PlayBroker, for streaming); no handler touches the database."""
+    app = web.Application()
+    app[STORE_KEY] = store
+    app.router.add_get('/health', health)
+    app.router.add_get('/games', games)
+    app.router.add_get('/scoreboard', scoreboard)
+    app.router.add_get('/games/{game_id}/boxscore', box_score)
+    app.router.add_get('/games/{game_id}/playbyplay', play_by_play)
+    app.router.add_get('/games/{game_id}/state', game_state)
+    if broker is not None:
+        app[BROKER_KEY] = broker
+        app.router.add_get('/games/{game_id}/playbyplay/stream', play_stream)
+    return app
+
+async def start_live_api(store: LiveStore, broker: Optional[PlayBroker] = None,
+                         host: str = LIVE_API_HOST, port: int = LIVE_API_PORT) -> web.AppRunner:
+    """Serve the read API on the running event loop. Stop it with `await runner.cleanup()`."""
+    runner = web.AppRunner(create_app(store, broker), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Live read API listening on http://{host}:{port}")
+    return runner
@@ -0,0 +1,161 @@
+import asyncio
+import bisect
+import logging
+from typing import Dict, List, Any, Optional, Set
+
+from ..config import LIVE_STREAM_QUEUE_SIZE, LIVE_STREAM_REPLAY_LIMIT
+from ..data.models import PlayByPlayData
+from .store import encode_json
+
+logger = logging.getLogger(__name__)
+
+# Ends a subscriber's stream: the game finished, the server is stopping, or the client fell behind
+END_OF_STREAM = None
+
+def encode_event(play: Dict[str, Any]) -> bytes:
+    """One play as a server-sent event, with its actionNumber as the event ID for resuming."""
+    return b'id: %d\nevent: play\ndata: %s\n\n' % (play['actionNumber'], encode_json(play))
+
+def encode_status_event(game_id: str, kind: str) -> bytes:
+    """A game lifecycle change (e.g. 'final') as a server-sent event; no ID, so resume cursors are unaffected."""
+    return b'event: %s\ndata: %s\n\n' % (kind.encode('utf-8'), encode_json({'game_id': game_id}))
+
+class Subscription:
+    """One client's queue of encoded event chunks."""
+
+    def __init__(self, game_id: str, queue_size: int):
+        self.game_id = game_id
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, chunk: Optional[bytes]) -> bool:
+        """Queue a chunk without waiting. Returns False if the client has fallen too far behind."""
+        try:
+            self.queue.put_nowait(chunk)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self) -> None:
+        # Whatever is still queued is dropped; the client resumes from its last event ID
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(END_OF_STREAM)
+
+class _GameEvents:
+    """Encoded events of one game in actionNumber order, kept for resuming clients."""
+
+    def __init__(self):
+        self.action_numbers: List[int] = []
+        self.frames: List[bytes] = []
+
+    @property
+    def last_action_number(self) -> int:
+        return self.action_numbers[-1] if self.action_numbers else -1
+
+    def append(self, action_number: int, frame: bytes, limit: int) -> None:
+        self.action_numbers.append(action_number)
+        self.frames.append(frame)
+        if len(self.frames) > limit:
+            del self.action_numbers[:-limit]
+            del self.frames[:-limit]
+
+    def after(self, action_number: int) -> bytes:
+        return b''.join(self.frames[bisect.bisect_right(self.action_numbers, action_number):])
+
+class PlayBroker:
+    """
+    Fans new play-by-play actions out to streaming clients.
+
+    publish() encodes each new action once and hands the same bytes to
+    every subscriber of the game, so fan-out costs one queue put per client
+    rather than one serialization. Recent events are kept per game, so a
+    client that reconnects with its last actionNumber gets what it missed
+    before the live events. A client whose queue fills up is disconnected
+    instead of slowing down the poller, and resumes the same way.
+
+    Runs on the event loop; publish() and subscribe() must not be called
+    from worker threads.
+    """
+
+    def __init__(self, queue_size: int = LIVE_STREAM_QUEUE_SIZE, replay_limit: int = LIVE_STREAM_REPLAY_LIMIT):
+        self.queue_size = queue_size
+        self.replay_limit = replay_limit
+        self._events: Dict[str, _GameEvents] = {}
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self.dropped = 0
+
+    def publish(self, play_by_play_data: PlayByPlayData) -> int:
+        """Broadcast the actions newer than the last published one. Returns how many there were."""
+        game_id = play_by_play_data.game_id
+        events = self._events.setdefault(game_id, _GameEvents())
+        last = events.last_action_number
+        frames = []
+        for play in play_by_play_data.plays:
+            action_number = play.get('actionNumber')
+            if action_number is None or action_number <= last:
+                continue
+            frame = encode_event(play)
+            events.append(action_number, frame, self.replay_limit)
+            frames.append(frame)
+            last = action_number
+        if frames:
+            self._broadcast(game_id, b''.join(frames))
+        return len(frames)
+
+    def _broadcast(self, game_id: str, chunk: Optional[bytes]) -> None:
+        subscribers = self._subscribers.get(game_id)
+        if not subscribers:
+            return
+        lagging = [subscription for subscription in subscribers if not subscription.offer(chunk)]
+        for subscription in lagging:
+            subscribers.discard(subscription)
+            subscription.close()
+        if lagging:
+            self.dropped += len(lagging)
+            logger.warning(f"Disconnected {len(lagging)} stream subscribers of game {game_id} that fell behind")
+
+    def announce(self, game_id: str, kind: str) -> None:
+        """Tell a game's current subscribers that it started or went final."""
+        self._broadcast(game_id, encode_status_event(game_id, kind))
+
+    def subscribe(self, game_id: str, after: Optional[int] = None) -> Subscription:
+        """
+        Start a subscription, queueing the buffered events after `after` first.
+
+        Without a cursor only actions published from now on are sent.
+        """
+        subscription = Subscription(game_id, self.queue_size)
+        events = self._events.get(game_id)
+        if after is not None and events:
+            missed = events.after(after)
+            if missed:
+                subscription.offer(missed)
+        self._subscribers.setdefault(game_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.game_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.game_id]
+
+    def finish(self, game_id: str) -> None:
+        """End the streams of a finished game and drop its buffered events."""
+        for subscription in self._subscribers.pop(game_id, set()):
+            subscription.close()
+        self._events.pop(game_id, None)
+
+    def close(self) -> None:
+        """End every stream, e.g. before the server shuts down."""
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.close()
+        self._subscribers.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'stream_games': len(self._events),
+            'stream_subscribers': sum(len(subscribers) for subscribers in self._subscribers.values()),
+            'stream_dropped': self.dropped,
+        }
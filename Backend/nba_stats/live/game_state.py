@@ -0,0 +1,420 @@
+import logging
+from typing import Dict, List, Any, Optional, Sequence, Set
+
+from pymongo import UpdateOne
+
+from ..config import GAME_STATE_RUN_MIN_POINTS
+from ..data.models import BoxScoreData, PlayByPlayData
+from ..utils.game_clock import elapsed_game_seconds
+
+logger = logging.getLogger(__name__)
+
+HOME = 'home'
+AWAY = 'away'
+SIDES = {'h': HOME, 'v': AWAY}
+LINEUP_SIZE = 5
+# Charged to players who may be on the bench, so they say nothing about who is on the court
+OFF_COURT_ACTION_TYPES = {'substitution', 'ejection', 'timeout'}
+
+def _score(value: Any) -> Optional[int]:
+    """Live actions carry the running score as strings; '' before the first basket."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def lineup_key(person_ids: Sequence[int]) -> str:
+    """Order-independent key of a lineup, usable as a Mongo field name."""
+    return '-'.join(str(person_id) for person_id in sorted(person_ids))
+
+def _acts_on_court(action: Dict[str, Any]) -> bool:
+    if action.get('actionType') in OFF_COURT_ACTION_TYPES:
+        return False
+    return not (action.get('actionType') == 'foul' and action.get('subType') == 'technical')
+
+def new_actions(play_by_play_data: PlayByPlayData, after: int) -> List[Dict[str, Any]]:
+    """
+    Actions numbered after `after`, in action order. Scans back from the end of
+    the list, so finding them costs O(new actions) rather than O(game).
+    """
+    found = []
+    for action in reversed(play_by_play_data.plays):
+        if action['actionNumber'] <= after:
+            break
+        found.append(action)
+    found.sort(key=lambda action: action['actionNumber'])
+    return found
+
+class TeamState:
+    """One team's players on the court, the stint they are playing, and the stints and lineups so far."""
+
+    def __init__(self, tricode: str):
+        self.tricode = tricode
+        self.side: Optional[str] = None
+        self.on_court: List[int] = []
+        # The lineup the open stint is credited to; trails on_court until play resumes after substitutions
+        self.stint: Optional[Dict[str, Any]] = None
+        self.stints: List[Dict[str, Any]] = []
+        self.lineups: Dict[str, Dict[str, Any]] = {}
+        self.plus_minus: Dict[str, int] = {}
+        # Action number each player last acted or checked in at
+        self.last_seen: Dict[str, int] = {}
+
+    def _close_stint(self, action_number: int, seconds: Optional[float]) -> None:
+        stint = self.stint
+        stint['end_action'] = action_number
+        stint['end_seconds'] = seconds
+        if seconds is not None and stint['start_seconds'] is not None:
+            stint['seconds'] = max(0.0, seconds - stint['start_seconds'])
+        stint['plus_minus'] = stint['points_for'] - stint['points_against']
+        self.stints.append(stint)
+
+        lineup = self.lineups.setdefault(lineup_key(stint['lineup']), {
+            'lineup': stint['lineup'], 'stints': 0, 'seconds': 0.0, 'points_for': 0, 'points_against': 0,
+        })
+        lineup['stints'] += 1
+        lineup['seconds'] += stint.get('seconds', 0.0)
+        lineup['points_for'] += stint['points_for']
+        lineup['points_against'] += stint['points_against']
+        self.stint = None
+
+    def sync_stint(self, action_number: int, period: Optional[int], seconds: Optional[float]) -> None:
+        """Close the open stint and open one for the current lineup if they differ."""
+        if self.stint is not None and self.stint['lineup'] == sorted(self.on_court):
+            return
+        if self.stint is not None:
+            self._close_stint(action_number, seconds)
+        if self.on_court:
+            self.stint = {'lineup': sorted(self.on_court), 'period': period, 'start_action': action_number,
+                          'start_seconds': seconds, 'points_for': 0, 'points_against': 0}
+
+    def saw(self, person_id: int, action_number: int) -> None:
+        self.last_seen[str(person_id)] = action_number
+
+    def put_on_court(self, person_id: int) -> None:
+        """
+        Put a player who acted without a recorded substitution on the court. With
+        five already on, the one seen least recently goes to the bench: after an
+        unrecorded substitution between periods that is a player who has not
+        acted since the previous period.
+        """
+        if len(self.on_court) >= LINEUP_SIZE:
+            stale = min(self.on_court, key=lambda on_court_id: self.last_seen.get(str(on_court_id), 0))
+            self.on_court.remove(stale)
+        self.on_court.append(person_id)
+
+    def score(self, points_for: int, points_against: int) -> None:
+        """Credit a scoring change to the open stint and the plus-minus of everyone on the court."""
+        if self.stint is not None:
+            self.stint['points_for'] += points_for
+            self.stint['points_against'] += points_against
+        for person_id in self.on_court:
+            key = str(person_id)
+            self.plus_minus[key] = self.plus_minus.get(key, 0) + points_for - points_against
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'tricode': self.tricode, 'side': self.side, 'on_court': self.on_court, 'stint': self.stint,
+                'stints': self.stints, 'lineups': self.lineups, 'plus_minus': self.plus_minus,
+                'last_seen': self.last_seen}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TeamState":
+        team = cls(data['tricode'])
+        team.side = data.get('side')
+        team.on_court = list(data.get('on_court', []))
+        team.stint = data.get('stint')
+        team.stints = list(data.get('stints', []))
+        team.lineups = dict(data.get('lineups', {}))
+        team.plus_minus = dict(data.get('plus_minus', {}))
+        team.last_seen = dict(data.get('last_seen', {}))
+        return team
+
+class GameState:
+    """
+    Running lineups, stints, plus-minus and scoring runs of one game, built one action at a time.
+
+    Substitutions move players on and off the court. A stint only closes
+    once play resumes with a different lineup, so the out/in pairs of a
+    substitution never produce zero-length stints. A player who makes a
+    play without a recorded substitution (a missing starter, a sub between
+    periods the feed left out) is put on the court; if five are already on,
+    the teammate seen least recently is benched. Technical fouls, ejections
+    and timeouts can belong to bench players and never move anyone. Every
+    change of the running score is credited to the open stints and to the
+    plus-minus of the players on the court, and extends or ends the current
+    scoring run.
+    """
+
+    def __init__(self, game_id: str, run_min_points: int = GAME_STATE_RUN_MIN_POINTS):
+        self.game_id = game_id
+        self.run_min_points = run_min_points
+        self.last_action_number = 0
+        self.period: Optional[int] = None
+        self.clock: Optional[str] = None
+        self.score = {HOME: 0, AWAY: 0}
+        self.teams: Dict[str, TeamState] = {}
+        self.player_names: Dict[str, str] = {}
+        self.run: Optional[Dict[str, Any]] = None
+        self.runs: List[Dict[str, Any]] = []
+        self.largest_runs: Dict[str, Dict[str, Any]] = {}
+
+    def _team(self, tricode: str) -> TeamState:
+        team = self.teams.get(tricode)
+        if team is None:
+            team = self.teams[tricode] = TeamState(tricode)
+        return team
+
+    def _side_team(self, side: str) -> Optional[TeamState]:
+        for team in self.teams.values():
+            if team.side == side:
+                return team
+        # With one side known, the other team is on the other side
+        if len(self.teams) == 2:
+            other = next((team for team in self.teams.values() if team.side and team.side != side), None)
+            if other is not None:
+                team = next(team for team in self.teams.values() if team is not other)
+                team.side = side
+                return team
+        return None
+
+    def seed_starters(self, box_score_data: BoxScoreData) -> None:
+        """Put each team's starters on the court before the first action is applied."""
+        if self.last_action_number or any(team.on_court for team in self.teams.values()):
+            return
+        for player in box_score_data.player_stats:
+            if player.get('START_POSITION') and player.get('PLAYER_ID') and player.get('TEAM_ABBREVIATION'):
+                team = self._team(player['TEAM_ABBREVIATION'])
+                if len(team.on_court) < LINEUP_SIZE and player['PLAYER_ID'] not in team.on_court:
+                    team.on_court.append(player['PLAYER_ID'])
+                    self.player_names[str(player['PLAYER_ID'])] = player.get('PLAYER_NAME')
+
+    def _end_run(self) -> None:
+        run = self.run
+        if run is None:
+            return
+        if run['points'] >= self.run_min_points:
+            self.runs.append(run)
+        largest = self.largest_runs.get(run['team'])
+        if largest is None or run['points'] > largest['points']:
+            self.largest_runs[run['team']] = run
+        self.run = None
+
+    def _extend_run(self, team: TeamState, points: int, action: Dict[str, Any]) -> None:
+        if self.run is not None and self.run['team'] != team.tricode:
+            self._end_run()
+        if self.run is None:
+            self.run = {'team': team.tricode, 'points': 0, 'period': self.period, 'start_action': action['actionNumber'],
+                        'start_clock': self.clock, 'start_score': dict(self.score)}
+        self.run['points'] += points
+        self.run['end_action'] = action['actionNumber']
+        self.run['end_clock'] = self.clock
+        # Kept current, so the longest run so far includes one still going
+        largest = self.largest_runs.get(team.tricode)
+        if largest is None or self.run['points'] > largest['points']:
+            self.largest_runs[team.tricode] = dict(self.run)
+
+    def _apply_score(self, action: Dict[str, Any]) -> None:
+        home, away = _score(action.get('scoreHome')), _score(action.get('scoreAway'))
+        if home is None or away is None:
+            return
+        deltas = {HOME: home - self.score[HOME], AWAY: away - self.score[AWAY]}
+        if not any(deltas.values()):
+            return
+        home_team, away_team = self._side_team(HOME), self._side_team(AWAY)
+        if home_team:
+            home_team.score(deltas[HOME], deltas[AWAY])
+        if away_team:
+            away_team.score(deltas[AWAY], deltas[HOME])
+        for side, team in ((HOME, home_team), (AWAY, away_team)):
+            # Negative deltas are score corrections: they move plus-minus but not runs
+            if team and deltas[side] > 0:
+                self._extend_run(team, deltas[side], action)
+        self.score = {HOME: home, AWAY: away}
+
+    def apply(self, action: Dict[str, Any]) -> None:
+        """Apply one action; actions at or before the last applied one are ignored."""
+        action_number = action['actionNumber']
+        if action_number <= self.last_action_number:
+            return
+        self.period = action.get('period') or self.period
+        self.clock = action.get('clock') or self.clock
+        seconds = elapsed_game_seconds(self.period, self.clock)
+
+        team = None
+        tricode = action.get('teamTricode')
+        if tricode:
+            team = self._team(tricode)
+            if action.get('location') in SIDES:
+                team.side = SIDES[action['location']]
+
+        person_id = action.get('personId')
+        if team and person_id:
+            if action.get('playerName'):
+                self.player_names[str(person_id)] = action['playerName']
+            if action.get('actionType') == 'substitution':
+                if action.get('subType') == 'out' and person_id in team.on_court:
+                    team.on_court.remove(person_id)
+                elif action.get('subType') == 'in' and person_id not in team.on_court:
+                    # Only finds five on the court if the player going out was never seen going in
+                    team.put_on_court(person_id)
+                    team.saw(person_id, action_number)
+            elif _acts_on_court(action):
+                if person_id not in team.on_court:
+                    team.put_on_court(person_id)
+                team.saw(person_id, action_number)
+
+        if action.get('actionType') != 'substitution':
+            for each in self.teams.values():
+                each.sync_stint(action_number, self.period, seconds)
+        self._apply_score(action)
+        self.last_action_number = action_number
+
+    def apply_many(self, actions: Sequence[Dict[str, Any]]) -> int:
+        before = self.last_action_number
+        applied = 0
+        for action in actions:
+            self.apply(action)
+            applied += self.last_action_number != before
+            before = self.last_action_number
+        return applied
+
+    def summary(self) -> Dict[str, Any]:
+        """Current lineups and the game's derived numbers, without the full stint list."""
+        return {
+            'game_id': self.game_id,
+            'last_action_number': self.last_action_number,
+            'period': self.period,
+            'clock': self.clock,
+            'score': self.score,
+            'teams': {tricode: {'side': team.side,
+                                'on_court': [{'person_id': person_id,
+                                              'name': self.player_names.get(str(person_id))}
+                                             for person_id in team.on_court],
+                                'stint': team.stint,
+                                'stints': len(team.stints),
+                                'plus_minus': team.plus_minus}
+                      for tricode, team in self.teams.items()},
+            'current_run': self.run,
+            'largest_runs': self.largest_runs,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'game_id': self.game_id,
+            'last_action_number': self.last_action_number,
+            'period': self.period,
+            'clock': self.clock,
+            'score': self.score,
+            'teams': {tricode: team.to_dict() for tricode, team in self.teams.items()},
+            'player_names': self.player_names,
+            'run': self.run,
+            'runs': self.runs,
+            'largest_runs': self.largest_runs,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], run_min_points: int = GAME_STATE_RUN_MIN_POINTS) -> "GameState":
+        state = cls(data['game_id'], run_min_points)
+        state.last_action_number = data.get('last_action_number', 0)
+        state.period = data.get('period')
+        state.clock = data.get('clock')
+        state.score = dict(data.get('score', state.score))
+        state.teams = {tricode: TeamState.from_dict(team) for tricode, team in data.get('teams', {}).items()}
+        state.player_names = dict(data.get('player_names', {}))
+        state.run = data.get('run')
+        state.runs = list(data.get('runs', []))
+        state.largest_runs = dict(data.get('largest_runs', {}))
+        return state
+
+class GameStateEngine:
+    """
+    Keeps a GameState per live game and feeds it only the actions it has not seen.
+
+    observe() finds a poll's new actions by scanning back from the end of
+    the play list to the last applied action number, so each poll costs
+    O(new actions) however long the game gets. Actions the league edits or
+    inserts below that number later are not replayed.
+
+    State is checkpointed as one document per game: operations() plans an
+    update for every game that changed and commit() marks the ones that
+    were written. The update $pushes only the stints closed since the last
+    write and $sets the rest of the state, so its size does not grow with
+    the stint list; the lineup totals, plus-minus and runs are still
+    rewritten whole, but those are bounded by the lineups and players a
+    game uses. After a restart load() resumes a game from its stored
+    checkpoint, or from the first action if there is none.
+    """
+
+    def __init__(self, run_min_points: int = GAME_STATE_RUN_MIN_POINTS):
+        self.run_min_points = run_min_points
+        self._games: Dict[str, GameState] = {}
+        self._dirty: Set[str] = set()
+        # Stints per team already in each game's stored checkpoint, and as of the planned write
+        self._written_stints: Dict[str, Dict[str, int]] = {}
+        self._planned_stints: Dict[str, Dict[str, int]] = {}
+
+    def is_loaded(self, game_id: str) -> bool:
+        return game_id in self._games
+
+    def load(self, game_id: str, document: Optional[Dict[str, Any]]) -> None:
+        """Seed a game from its stored checkpoint (None if nothing is stored)."""
+        if document is None:
+            self._games[game_id] = GameState(game_id, self.run_min_points)
+            self._written_stints[game_id] = {}
+            return
+        self._games[game_id] = GameState.from_dict(document, self.run_min_points)
+        self._written_stints[game_id] = {tricode: len(team.stints)
+                                         for tricode, team in self._games[game_id].teams.items()}
+        logger.info(f"Resumed game state for game {game_id} at action {document.get('last_action_number')}")
+
+    def get(self, game_id: str) -> Optional[GameState]:
+        return self._games.get(game_id)
+
+    def observe(self, play_by_play_data: PlayByPlayData, box_score_data: Optional[BoxScoreData] = None) -> int:
+        """Apply a poll's new actions. Returns how many were applied."""
+        game_id = play_by_play_data.game_id
+        state = self._games.get(game_id)
+        if state is None:
+            state = self._games[game_id] = GameState(game_id, self.run_min_points)
+        if box_score_data:
+            state.seed_starters(box_score_data)
+        applied = state.apply_many(new_actions(play_by_play_data, state.last_action_number))
+        if applied:
+            self._dirty.add(game_id)
+        return applied
+
+    def _checkpoint_operation(self, game_id: str, id_field: str) -> UpdateOne:
+        document = self._games[game_id].to_dict()
+        written = self._written_stints.get(game_id, {})
+        updates = {key: value for key, value in document.items() if key != 'teams'}
+        pushes = {}
+        planned = {}
+        for tricode, team in document['teams'].items():
+            stints = team.pop('stints')
+            updates.update({f'teams.{tricode}.{key}': value for key, value in team.items()})
+            if len(stints) > written.get(tricode, 0):
+                pushes[f'teams.{tricode}.stints'] = {'$each': stints[written.get(tricode, 0):]}
+            planned[tricode] = len(stints)
+        self._planned_stints[game_id] = planned
+        update = {'$set': updates}
+        if pushes:
+            update['$push'] = pushes
+        return UpdateOne({id_field: game_id}, update, upsert=True)
+
+    def operations(self, id_field: str = 'game_id') -> Dict[str, List[Any]]:
+        """One checkpoint update per game that changed since its last write, by game ID."""
+        return {game_id: [self._checkpoint_operation(game_id, id_field)]
+                for game_id in sorted(self._dirty) if game_id in self._games}
+
+    def commit(self, game_id: str) -> None:
+        """Record that a game's checkpoint was written."""
+        self._dirty.discard(game_id)
+        if game_id in self._planned_stints:
+            self._written_stints[game_id] = self._planned_stints.pop(game_id)
+
+    def forget(self, game_id: str) -> None:
+        """Drop a game's state, e.g. once it is final."""
+        self._games.pop(game_id, None)
+        self._dirty.discard(game_id)
+        self._written_stints.pop(game_id, None)
+        self._planned_stints.pop(game_id, None)
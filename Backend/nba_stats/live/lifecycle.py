@@ -0,0 +1,154 @@
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+from dateutil import parser
+
+from ..config import (
+    SCOREBOARD_REFRESH_NEAR_TIPOFF_SECONDS,
+    TIPOFF_WINDOW_BEFORE_SECONDS,
+    GAME_GIVE_UP_AFTER_SECONDS,
+)
+from ..data.models import BoxScoreData
+from .scheduler import GAME_STATUS_LIVE, GAME_STATUS_FINAL
+
+logger = logging.getLogger(__name__)
+
+GAME_STARTED = 'start'
+GAME_FINAL = 'final'
+
+class GameEvent:
+    """A lifecycle transition for one game."""
+
+    def __init__(self, kind: str, game_id: str, game: Dict[str, Any]):
+        self.kind = kind
+        self.game_id = game_id
+        self.game = game
+
+    def __repr__(self) -> str:
+        return f"GameEvent({self.kind!r}, {self.game_id!r})"
+
+class TrackedGame:
+    """What the tracker knows about one game."""
+
+    def __init__(self, game_id: str, tip_off: Optional[datetime]):
+        self.game_id = game_id
+        self.tip_off = tip_off
+        self.status = 0
+        self.started = False
+        self.final_seen = False
+        self.final_written = False
+        # Started long ago and never went final (postponed, suspended): no longer polled
+        self.given_up = False
+
+def is_final(box_score_data: Optional[BoxScoreData]) -> bool:
+    """True if a live box score reports the game as over."""
+    return bool(box_score_data) and (box_score_data.game_status or '').lower().startswith('final')
+
+class GameLifecycleTracker:
+    """
+    Follows each scoreboard game from scheduled to final.
+
+    A game starts being polled at its scheduled gameTimeUTC, or earlier if the
+    scoreboard already reports it live, and stays active until the poller has
+    written its final box score. A game that started but is not live
+    give_up_after seconds after its tip-off (postponed, suspended) stops being
+    polled, and a game that drops off the scoreboard is forgotten unless only
+    its final write is outstanding. The scoreboard is refreshed more often
+    around scheduled tip-offs so no opening plays are missed.
+    """
+
+    def __init__(self, default_refresh_seconds: float, give_up_after: float = GAME_GIVE_UP_AFTER_SECONDS):
+        self.default_refresh_seconds = default_refresh_seconds
+        self.give_up_after = give_up_after
+        self._games: Dict[str, TrackedGame] = {}
+
+    @staticmethod
+    def _parse_tip_off(game: Dict[str, Any]) -> Optional[datetime]:
+        try:
+            return parser.parse(game['gameTimeUTC']).replace(tzinfo=timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def update(self, games: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[GameEvent]:
+        """Apply a fresh scoreboard, giving up on stale games, and return the start/final events it triggers."""
+        now = now or datetime.now(timezone.utc)
+        events = []
+        seen = set()
+        for game in games:
+            game_id = game['gameId']
+            seen.add(game_id)
+            state = self._games.get(game_id)
+            if state is None:
+                state = self._games[game_id] = TrackedGame(game_id, self._parse_tip_off(game))
+            state.status = game.get('gameStatus', 0)
+
+            tipped_off = state.tip_off is not None and now >= state.tip_off
+            if not state.started and (state.status >= GAME_STATUS_LIVE or tipped_off):
+                state.started = True
+                events.append(GameEvent(GAME_STARTED, game_id, game))
+            if state.given_up and state.status == GAME_STATUS_LIVE:
+                state.given_up = False
+                logger.info(f"Game {game_id} resumed")
+            if state.status == GAME_STATUS_FINAL and not state.final_seen:
+                state.final_seen = True
+                events.append(GameEvent(GAME_FINAL, game_id, game))
+
+        for game_id, state in list(self._games.items()):
+            # Forget games that rolled off the scoreboard, unless they only need their final write
+            if game_id not in seen and not (state.final_seen and self._is_active(state)):
+                if self._is_active(state):
+                    logger.warning(f"Game {game_id} left the scoreboard without going final, polling stopped")
+                del self._games[game_id]
+            elif self._is_active(state) and state.status != GAME_STATUS_LIVE and state.tip_off is not None \
+                    and (now - state.tip_off).total_seconds() > self.give_up_after:
+                state.given_up = True
+                logger.warning(f"Game {game_id} has no final written {self.give_up_after / 3600:.0f}h after tip-off "
+                               f"and is not live (status {state.status}), polling stopped")
+
+        for event in events:
+            logger.info(f"Game {event.game_id} {event.kind}")
+        return events
+
+    def observe_box_score(self, box_score_data: Optional[BoxScoreData]) -> Optional[GameEvent]:
+        """Note a final box score seen by the poller, which is usually ahead of the scoreboard."""
+        if not is_final(box_score_data):
+            return None
+        state = self._games.get(box_score_data.game_id)
+        if state is None or state.final_seen:
+            return None
+        state.final_seen = True
+        logger.info(f"Game {state.game_id} {GAME_FINAL} (from box score)")
+        return GameEvent(GAME_FINAL, state.game_id, {})
+
+    def mark_final_written(self, game_id: str) -> None:
+        """Stop polling a game once its final state has been persisted."""
+        state = self._games.get(game_id)
+        if state is not None and state.final_seen:
+            state.final_written = True
+            logger.info(f"Final state for game {game_id} written, polling stopped")
+
+    @staticmethod
+    def _is_active(state: TrackedGame) -> bool:
+        return state.started and not state.final_written and not state.given_up
+
+    def active_game_ids(self) -> List[str]:
+        """Games that should currently be polled."""
+        return [game_id for game_id, state in self._games.items() if self._is_active(state)]
+
+    def next_refresh_delay(self, now: Optional[datetime] = None) -> float:
+        """Seconds until the scoreboard should be refreshed again."""
+        now = now or datetime.now(timezone.utc)
+        upcoming = [
+            (state.tip_off - now).total_seconds()
+            for state in self._games.values()
+            if not state.started and state.tip_off is not None
+        ]
+        if any(until <= TIPOFF_WINDOW_BEFORE_SECONDS for until in upcoming):
+            return SCOREBOARD_REFRESH_NEAR_TIPOFF_SECONDS
+        future = [until for until in upcoming if until > TIPOFF_WINDOW_BEFORE_SECONDS]
+        if future:
+            # Wake up when the next tip-off window opens
+            until_window = min(future) - TIPOFF_WINDOW_BEFORE_SECONDS
+            return max(SCOREBOARD_REFRESH_NEAR_TIPOFF_SECONDS, min(self.default_refresh_seconds, until_window))
+        return self.default_refresh_seconds
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Dict, List, Any, Callable, Hashable, Optional, Tuple
+
+from ..config import PERSIST_QUEUE_MAX_PENDING, PERSIST_BATCH_SIZE, PERSIST_FLUSH_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Pending writes are keyed so a newer update replaces an older one, e.g. ('box_score', game_id)
+PendingKey = Hashable
+
+class WriteBehindQueue:
+    """
+    Bounded write-behind queue with a dedicated writer task.
+
+    put() stores an item under a key; an item already waiting under the same
+    key is replaced, since only the latest feed of a game needs writing. The
+    writer task hands pending items to the sink in batches, once batch_size
+    items are waiting or flush_interval seconds after the oldest arrived.
+    When max_pending distinct keys are waiting, put() blocks until the writer
+    catches up. close() flushes everything left before returning.
+
+    The sink receives a list of (key, item) pairs. A coroutine function is
+    awaited on the event loop; a plain function runs on the executor (the
+    loop's default one if None), so blocking writes never stall the loop.
+    """
+
+    def __init__(self,
+                 sink: Callable[[List[Tuple[PendingKey, Any]]], Any],
+                 max_pending: int = PERSIST_QUEUE_MAX_PENDING,
+                 batch_size: int = PERSIST_BATCH_SIZE,
+                 flush_interval: float = PERSIST_FLUSH_INTERVAL_SECONDS,
+                 executor: Optional[Executor] = None,
+                 name: str = "persistence"):
+        self.sink = sink
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.executor = executor
+        self.name = name
+        self._pending: Dict[PendingKey, Any] = {}
+        self._oldest: Optional[float] = None
+        self._wakeup = asyncio.Event()
+        self._not_full = asyncio.Condition()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.flushes = 0
+        self.flushed_items = 0
+        self.failed_flushes = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self._total_flush_seconds = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> asyncio.Task:
+        """Start the writer task on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"{self.name}-writer")
+        return self._task
+
+    async def put(self, key: PendingKey, item: Any) -> None:
+        """Queue an item, replacing any pending item with the same key. Waits while the queue is full."""
+        if self._closing:
+            raise RuntimeError(f"{self.name} queue is closed")
+        if key in self._pending:
+            self._pending[key] = item
+            self.coalesced += 1
+            return
+        async with self._not_full:
+            # Another put may have queued the same key while this one waited
+            await self._not_full.wait_for(lambda: len(self._pending) < self.max_pending or key in self._pending)
+            if key in self._pending:
+                self._pending[key] = item
+                self.coalesced += 1
+                return
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending[key] = item
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, len(self._pending))
+        self._wakeup.set()
+
+    async def _next_batch(self) -> Optional[List[Tuple[PendingKey, Any]]]:
+        """Wait until a batch is due. Returns None once closed and drained."""
+        while not self._pending:
+            if self._closing:
+                return None
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        while len(self._pending) < self.batch_size and not self._closing:
+            remaining = self._oldest + self.flush_interval - time.monotonic()
+            if remaining <= 0:
+                break
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+
+        batch = []
+        for key in list(self._pending)[:self.batch_size]:
+            batch.append((key, self._pending.pop(key)))
+        self._oldest = time.monotonic() if self._pending else None
+        async with self._not_full:
+            self._not_full.notify_all()
+        return batch
+
+    async def _flush(self, batch: List[Tuple[PendingKey, Any]]) -> None:
+        start = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(self.sink):
+                await self.sink(batch)
+            else:
+                await asyncio.get_running_loop().run_in_executor(self.executor, self.sink, batch)
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.error(f"Error flushing {len(batch)} {self.name} items: {e}")
+        elapsed = time.perf_counter() - start
+        self.flushes += 1
+        self.flushed_items += len(batch)
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        self._total_flush_seconds += elapsed
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            if batch is None:
+                return
+            await self._flush(batch)
+
+    async def close(self) -> None:
+        """Stop accepting items and wait until everything pending has been flushed."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+        elif self._pending:
+            while (batch := await self._next_batch()) is not None:
+                await self._flush(batch)
+        logger.info(f"{self.name} queue drained: {self.metrics()}")
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'coalesced': self.coalesced,
+            'flushes': self.flushes,
+            'flushed_items': self.flushed_items,
+            'failed_flushes': self.failed_flushes,
+            'last_flush_ms': round(self.last_flush_seconds * 1000, 1),
+            'avg_flush_ms': round(self._total_flush_seconds / self.flushes * 1000, 1) if self.flushes else 0.0,
+            'max_flush_ms': round(self.max_flush_seconds * 1000, 1),
+        }
@@ -0,0 +1,148 @@
+import heapq
+import itertools
+import logging
+import time
+from typing import Dict, List, Optional, Tuple, Iterable, Callable
+
+from ..config import (
+    POLL_INTERVAL_DEFAULT,
+    POLL_INTERVAL_CLOSE_LATE,
+    POLL_INTERVAL_CLOCK_STOPPED,
+    POLL_INTERVAL_PERIOD_BREAK,
+    POLL_INTERVAL_BLOWOUT,
+    POLL_INTERVAL_HALFTIME,
+    POLL_INTERVAL_PREGAME,
+    CLOSE_GAME_MARGIN,
+    CLOSE_GAME_SECONDS_LEFT,
+    BLOWOUT_MARGIN,
+)
+from ..data.models import BoxScoreData
+from ..utils.game_clock import parse_game_clock, REGULATION_PERIODS
+
+logger = logging.getLogger(__name__)
+
+# Scoreboard gameStatus values
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_LIVE = 2
+GAME_STATUS_FINAL = 3
+
+class PollScheduler:
+    """
+    Priority queue of per-game poll times.
+
+    Each game's next poll is set from its latest box score: close late-game
+    situations are polled fastest, halftime and other breaks slowest. Next poll
+    times are counted from when a poll was due rather than when it finished, so
+    a slow cycle does not push every later poll back.
+
+    pop_due() hands games out of the queue until observe() schedules them
+    again. A game whose poll never got observed, e.g. because the cycle
+    failed, is put back by the next sync().
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._heap: List[Tuple[float, int, str]] = []
+        self._due: Dict[str, float] = {}
+        # Popped games waiting for observe(), with the time their poll was due
+        self._in_flight: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._game_status: Dict[str, int] = {}
+        self._last_clock: Dict[str, Tuple[Optional[int], Optional[str]]] = {}
+        self._last_box_score: Dict[str, BoxScoreData] = {}
+
+    def _push(self, game_id: str, due: float) -> None:
+        self._due[game_id] = due
+        heapq.heappush(self._heap, (due, next(self._counter), game_id))
+
+    def sync(self, game_ids: Iterable[str]) -> None:
+        """Start polling new games right away and stop polling games that left the list."""
+        game_ids = set(game_ids)
+        now = self._clock()
+        for game_id in game_ids - set(self._due):
+            self._in_flight.pop(game_id, None)
+            self._push(game_id, now)
+        for game_id in (set(self._due) | set(self._in_flight)) - game_ids:
+            self.remove(game_id)
+
+    def remove(self, game_id: str) -> None:
+        """Stop polling a game. Its stale heap entry is skipped when popped."""
+        self._due.pop(game_id, None)
+        self._in_flight.pop(game_id, None)
+        self._game_status.pop(game_id, None)
+        self._last_clock.pop(game_id, None)
+        self._last_box_score.pop(game_id, None)
+
+    def set_game_status(self, game_id: str, game_status: int) -> None:
+        """Record the scoreboard gameStatus for a game."""
+        self._game_status[game_id] = game_status
+
+    def seconds_until_next(self) -> Optional[float]:
+        """Seconds until the earliest poll is due, or None if no games are scheduled."""
+        while self._heap:
+            due, _, game_id = self._heap[0]
+            if self._due.get(game_id) != due:
+                heapq.heappop(self._heap)
+                continue
+            return max(0.0, due - self._clock())
+        return None
+
+    def pop_due(self) -> List[str]:
+        """Remove and return every game whose poll is due."""
+        now = self._clock()
+        due_games = []
+        while self._heap and self._heap[0][0] <= now:
+            due, _, game_id = heapq.heappop(self._heap)
+            if self._due.get(game_id) == due:
+                del self._due[game_id]
+                self._in_flight[game_id] = due
+                due_games.append(game_id)
+        return due_games
+
+    def interval_for(self, game_id: str, box_score_data: Optional[BoxScoreData]) -> float:
+        """Pick the poll interval for a game from its state."""
+        game_status = self._game_status.get(game_id, GAME_STATUS_LIVE)
+        if game_status == GAME_STATUS_SCHEDULED:
+            return POLL_INTERVAL_PREGAME
+        if box_score_data:
+            self._last_box_score[game_id] = box_score_data
+        else:
+            # Unchanged or failed fetch: keep pacing the game by its last known state
+            box_score_data = self._last_box_score.get(game_id)
+            if not box_score_data:
+                return POLL_INTERVAL_DEFAULT
+
+        period = box_score_data.period
+        clock = box_score_data.game_clock
+        previous_clock = self._last_clock.get(game_id)
+        self._last_clock[game_id] = (period, clock)
+
+        seconds_left = parse_game_clock(clock)
+        if (box_score_data.game_status or '').lower().startswith('half'):
+            return POLL_INTERVAL_HALFTIME
+        if seconds_left == 0:
+            return POLL_INTERVAL_HALFTIME if period == REGULATION_PERIODS // 2 else POLL_INTERVAL_PERIOD_BREAK
+
+        scores = [team.get('TEAM_SCORE') or 0 for team in box_score_data.team_stats]
+        margin = abs(scores[0] - scores[1]) if len(scores) == 2 else 0
+
+        if (period or 0) >= REGULATION_PERIODS and seconds_left is not None \
+                and seconds_left <= CLOSE_GAME_SECONDS_LEFT and margin <= CLOSE_GAME_MARGIN:
+            return POLL_INTERVAL_CLOSE_LATE
+        if margin >= BLOWOUT_MARGIN:
+            return POLL_INTERVAL_BLOWOUT
+        if previous_clock == (period, clock):
+            return POLL_INTERVAL_CLOCK_STOPPED
+        return POLL_INTERVAL_DEFAULT
+
+    def observe(self, game_id: str, box_score_data: Optional[BoxScoreData]) -> float:
+        """Schedule a game's next poll after polling it. Returns the chosen interval."""
+        interval = self.interval_for(game_id, box_score_data)
+        if game_id not in self._in_flight:
+            # Removed while its poll was in flight
+            return interval
+        now = self._clock()
+        previous_due = self._in_flight.pop(game_id)
+        # Count from when the poll was due, but never schedule into the past
+        self._push(game_id, max(previous_due + interval, now))
+        return interval
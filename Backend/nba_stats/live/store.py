@@ -0,0 +1,160 @@
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, Optional
+
+from ..config import LIVE_API_PLAY_BY_PLAY_TAIL, LIVE_API_MAX_TAIL
+from ..data.models import BoxScoreData, ScoreboardData, PlayByPlayData
+
+logger = logging.getLogger(__name__)
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_BYTES = 512
+# Non-default play-by-play tails kept per game until its next update
+TAIL_CACHE_SIZE = 8
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+def encode_json(document: Any) -> bytes:
+    return json.dumps(document, default=_json_default, separators=(',', ':')).encode('utf-8')
+
+class CachedResponse:
+    """A pre-serialized JSON body with its ETag and gzipped form."""
+
+    __slots__ = ('body', 'gzip_body', 'etag')
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_BYTES else None
+        self.etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+    @classmethod
+    def from_document(cls, document: Any) -> "CachedResponse":
+        return cls(encode_json(document))
+
+class _GamePlays:
+    """A game's latest plays plus the tails already serialized from them."""
+
+    def __init__(self, play_by_play_data: PlayByPlayData):
+        self.game_id = play_by_play_data.game_id
+        self.plays = play_by_play_data.plays
+        self.retrieved_at = play_by_play_data.retrieved_at
+        self.tails: "OrderedDict[int, CachedResponse]" = OrderedDict()
+
+    def document(self, tail: int) -> Dict[str, Any]:
+        plays = self.plays[-tail:] if tail else []
+        return {
+            'game_id': self.game_id,
+            'retrieved_at': self.retrieved_at,
+            'last_action_number': self.plays[-1].get('actionNumber') if self.plays else None,
+            'plays': plays,
+        }
+
+class LiveStore:
+    """
+    The latest live feeds per game, serialized once for the read API.
+
+    The poller calls the put_* methods after each fetch; each builds the JSON
+    body, its gzip form and an ETag up front, so serving a request is a dict
+    lookup. Play-by-play is served as a tail of the latest plays: the default
+    tail is built on put, other lengths on first request and then reused
+    until the next update.
+    """
+
+    def __init__(self, default_tail: int = LIVE_API_PLAY_BY_PLAY_TAIL, max_tail: int = LIVE_API_MAX_TAIL):
+        self.default_tail = default_tail
+        self.max_tail = max_tail
+        self._box_scores: Dict[str, CachedResponse] = {}
+        self._plays: Dict[str, _GamePlays] = {}
+        self._game_states: Dict[str, CachedResponse] = {}
+        self._scoreboard: Optional[CachedResponse] = None
+        self._index: Optional[CachedResponse] = None
+        self._lock = threading.Lock()
+
+    def put_box_score(self, box_score_data: BoxScoreData) -> None:
+        response = CachedResponse.from_document(box_score_data.to_dict())
+        with self._lock:
+            is_new = box_score_data.game_id not in self._box_scores
+            self._box_scores[box_score_data.game_id] = response
+            if is_new:
+                self._index = None
+
+    def put_play_by_play(self, play_by_play_data: PlayByPlayData) -> None:
+        game_plays = _GamePlays(play_by_play_data)
+        game_plays.tails[self.default_tail] = CachedResponse.from_document(game_plays.document(self.default_tail))
+        with self._lock:
+            is_new = play_by_play_data.game_id not in self._plays
+            self._plays[play_by_play_data.game_id] = game_plays
+            if is_new:
+                self._index = None
+
+    def put_game_state(self, game_id: str, summary: Dict[str, Any]) -> None:
+        """A game's derived lineups, plus-minus and runs (GameState.summary())."""
+        response = CachedResponse.from_document(summary)
+        with self._lock:
+            self._game_states[game_id] = response
+
+    def put_scoreboard(self, scoreboard_data: ScoreboardData) -> None:
+        response = CachedResponse.from_document(scoreboard_data.to_dict())
+        with self._lock:
+            self._scoreboard = response
+
+    def forget(self, game_id: str) -> None:
+        with self._lock:
+            self._box_scores.pop(game_id, None)
+            self._plays.pop(game_id, None)
+            self._game_states.pop(game_id, None)
+            self._index = None
+
+    def retain(self, game_ids: Iterable[str]) -> None:
+        """Forget every game not in game_ids, e.g. finished games that left the scoreboard."""
+        game_ids = set(game_ids)
+        stale = (set(self._box_scores) | set(self._plays) | set(self._game_states)) - game_ids
+        for game_id in stale:
+            self.forget(game_id)
+
+    def box_score(self, game_id: str) -> Optional[CachedResponse]:
+        return self._box_scores.get(game_id)
+
+    def game_state(self, game_id: str) -> Optional[CachedResponse]:
+        return self._game_states.get(game_id)
+
+    def scoreboard(self) -> Optional[CachedResponse]:
+        return self._scoreboard
+
+    def play_by_play_tail(self, game_id: str, tail: Optional[int] = None) -> Optional[CachedResponse]:
+        """The latest `tail` plays of a game (default_tail if None, capped at max_tail)."""
+        game_plays = self._plays.get(game_id)
+        if game_plays is None:
+            return None
+        tail = self.default_tail if tail is None else max(0, min(tail, self.max_tail))
+        response = game_plays.tails.get(tail)
+        if response is None:
+            response = CachedResponse.from_document(game_plays.document(tail))
+            with self._lock:
+                game_plays.tails[tail] = response
+                while len(game_plays.tails) > TAIL_CACHE_SIZE:
+                    # Oldest non-default tail goes first
+                    oldest = next(key for key in game_plays.tails if key != self.default_tail)
+                    del game_plays.tails[oldest]
+        return response
+
+    def games(self) -> CachedResponse:
+        """IDs of the games that have a box score or play-by-play."""
+        index = self._index
+        if index is None:
+            with self._lock:
+                game_ids = sorted(set(self._box_scores) | set(self._plays))
+                index = self._index = CachedResponse.from_document({'games': game_ids})
+        return index
+
+    def stats(self) -> Dict[str, int]:
+        return {'box_scores': len(self._box_scores), 'play_by_plays': len(self._plays),
+                'game_states': len(self._game_states)}
@@ -0,0 +1,122 @@
+import sys
+import asyncio
+import logging
+from typing import List
+
+from pymongo import InsertOne, ReplaceOne
+
+from nba_stats.data import async_database
+from nba_stats.data.async_database import AsyncMongoDBClient
+from nba_stats.data.models import StaticBoxScoreData
+
+logger = logging.getLogger(__name__)
+
+CHECK_DB_NAME = "AsyncStorageCheck"
+CHECK_COLLECTION_NAME = "box_scores"
+
+def sample_box_score(game_id: str, points: float = 10.0) -> StaticBoxScoreData:
+    """A one-player static box score, enough to round-trip through the storage methods"""
+    return StaticBoxScoreData(game_id=game_id,
+                              player_stats=[{'TEAM_ABBREVIATION': 'BOS', 'PLAYER_NAME': 'Check Player',
+                                             'PLAYER_ID': 1, 'PTS': points}],
+                              team_stats=[{'TEAM_ABBREVIATION': 'BOS', 'TEAM_SCORE': points}])
+
+async def check_connect(uri: str) -> bool:
+    """Concurrent first calls must build a single AsyncMongoClient"""
+    created: List[object] = []
+    client_class = async_database.AsyncMongoClient
+
+    def counting_client(*args, **kwargs):
+        client = client_class(*args, **kwargs)
+        created.append(client)
+        return client
+
+    async_database.AsyncMongoClient = counting_client
+    try:
+        db_client = AsyncMongoDBClient(uri)
+        connected = await asyncio.gather(*(db_client.connect() for _ in range(8)))
+        await db_client.close()
+    finally:
+        async_database.AsyncMongoClient = client_class
+    return all(connected) and len(created) == 1
+
+async def run_checks(db_client: AsyncMongoDBClient, db_name: str = CHECK_DB_NAME) -> List[str]:
+    """
+    Exercise upserts, bulk writes and reads against a scratch database. Returns the failed checks
+
+    Args:
+        db_client (AsyncMongoDBClient): Client to check, connected to a real server or an in-memory stand-in
+        db_name (str): Scratch database; its collection is emptied first
+    """
+    failures = []
+
+    def expect(name: str, ok: bool) -> None:
+        print(f"{'ok  ' if ok else 'FAIL'} {name}")
+        if not ok:
+            failures.append(name)
+
+    await db_client.client[db_name][CHECK_COLLECTION_NAME].delete_many({})
+
+    # Upsert: the first save inserts, the second replaces
+    expect("save inserts", await db_client.save(sample_box_score('0000000001'), db_name, CHECK_COLLECTION_NAME))
+    expect("save replaces", await db_client.save(sample_box_score('0000000001', 25.0), db_name, CHECK_COLLECTION_NAME))
+    stored = await db_client.get_document('0000000001', db_name, CHECK_COLLECTION_NAME)
+    expect("save kept one updated document", bool(stored) and stored['player_stats'][0]['PTS'] == 25.0)
+
+    # Bulk upsert, one flag per object
+    saved = await db_client.save_many([sample_box_score(f"000000000{number}") for number in range(2, 5)],
+                                      db_name, CHECK_COLLECTION_NAME)
+    expect("save_many upserts every object", saved == [True, True, True])
+
+    # A failing operation only fails its own group
+    groups = [
+        [ReplaceOne({'game_id': '0000000005'}, sample_box_score('0000000005').to_dict(), upsert=True)],
+        [InsertOne({'_id': 'duplicate', 'game_id': 'duplicate'}), InsertOne({'_id': 'duplicate', 'game_id': 'duplicate'})],
+        [ReplaceOne({'game_id': '0000000006'}, sample_box_score('0000000006').to_dict(), upsert=True)],
+    ]
+    results = await db_client.write_operations(groups, db_name, CHECK_COLLECTION_NAME)
+    expect("write_operations reports the failed group only", results == [True, False, True])
+    expect("write_operations with nothing to write", await db_client.write_operations([[]], db_name,
+                                                                                     CHECK_COLLECTION_NAME) == [True])
+
+    # Reads
+    box_score_data = await db_client.get('0000000003', StaticBoxScoreData, db_name, CHECK_COLLECTION_NAME)
+    expect("get rebuilds the model", isinstance(box_score_data, StaticBoxScoreData)
+           and box_score_data.player_stats[0]['PLAYER_NAME'] == 'Check Player')
+    expect("get of a missing ID", await db_client.get('missing', StaticBoxScoreData, db_name,
+                                                      CHECK_COLLECTION_NAME) is None)
+    documents = await db_client.find_documents({'game_id': {'$regex': '^0000'}}, db_name, CHECK_COLLECTION_NAME,
+                                               projection={'game_id': 1, '_id': 0},
+                                               sort=[('game_id', -1)], limit=2)
+    expect("find_documents sorts and limits", [document['game_id'] for document in documents]
+           == ['0000000006', '0000000005'])
+    existing = await db_client.existing_ids(['0000000002', '0000000006', 'missing'], db_name, CHECK_COLLECTION_NAME)
+    expect("existing_ids", existing == {'0000000002', '0000000006'})
+    return failures
+
+async def check_async_storage(uri: str = None) -> bool:
+    """Run every check against a MongoDB server, then drop the scratch database"""
+    db_client = AsyncMongoDBClient(uri)
+    if not await db_client.connect():
+        print(f"Could not connect to {db_client.uri}")
+        return False
+    try:
+        failures = await run_checks(db_client)
+        await db_client.client.drop_database(CHECK_DB_NAME)
+    finally:
+        await db_client.close()
+
+    single_client = await check_connect(db_client.uri)
+    print(f"{'ok  ' if single_client else 'FAIL'} concurrent connect builds one client")
+    if not single_client:
+        failures.append("concurrent connect")
+    print(f"\n{'All checks passed' if not failures else f'{len(failures)} checks failed'}")
+    return not failures
+
+def main():
+    """Main entry point for the async storage backend check"""
+    uri = sys.argv[1] if len(sys.argv) > 1 else (input("MongoDB URI (default: MONGO_URI): ") or None)
+    sys.exit(0 if asyncio.run(check_async_storage(uri)) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import sys
+import logging
+
+from nba_stats.backfill import StaticBoxScoreBackfill, season_game_ids, default_checkpoint_path
+
+logger = logging.getLogger(__name__)
+
+def run_backfill(targets: list) -> None:
+    """
+    Backfill static box scores for a season or a list of game IDs
+    
+    Args:
+        targets (list): A single season such as '2023-24', or NBA game IDs
+    """
+    if len(targets) == 1 and '-' in targets[0]:
+        season = targets[0]
+        game_ids = season_game_ids(season)
+        checkpoint_path = default_checkpoint_path(season)
+    else:
+        game_ids = targets
+        checkpoint_path = default_checkpoint_path("games")
+
+    try:
+        result = StaticBoxScoreBackfill(checkpoint_path).run(game_ids)
+        print(f"Saved {result.saved} games, skipped {result.skipped}, missing {result.missing}, failed {result.failed} "
+              f"({result.games_per_minute:.1f} games/min)")
+        if result.failed:
+            print(f"Re-run the same command to retry failed games (checkpoint: {checkpoint_path})")
+    except KeyboardInterrupt:
+        print(f"\nBackfill interrupted; progress is saved in {checkpoint_path}")
+
+def main():
+    """Main entry point for the static box score backfill"""
+    if len(sys.argv) > 1:
+        targets = sys.argv[1:]
+    else:
+        targets = (input("Enter a season (default: 2024-25) or game IDs: ") or "2024-25").split()
+    
+    run_backfill(targets)
+
+if __name__ == "__main__":
+    main()
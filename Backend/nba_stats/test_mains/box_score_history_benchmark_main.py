@@ -0,0 +1,148 @@
+import sys
+import copy
+import random
+import logging
+import datetime
+from typing import Any, Dict, List
+
+import bson
+
+from nba_stats.api.nba_client import NBAClient
+from nba_stats.config import BOX_SCORE_HISTORY_KEYFRAME_INTERVAL
+from nba_stats.data.database import MongoDBClient
+from nba_stats.data.history import BoxScoreHistory
+from nba_stats.data.models import BoxScoreData
+from nba_stats.test_mains.live_parser_benchmark_main import build_sample_box_score
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_DB_NAME = "HistoryBenchmark"
+BENCHMARK_COLLECTION_NAME = "box_score_history"
+SECONDS_PER_POLL = 12
+PREGAME_POLLS = 15
+
+def simulate_game(polls: int, seed: int = 1, pregame_polls: int = PREGAME_POLLS) -> List[BoxScoreData]:
+    """
+    A game's live box scores, one per poll, from before tip-off to the final
+
+    The pregame polls have period 0 and no game clock, as the live feed does.
+    Ten players are on the court at a time and their minutes move every poll;
+    baskets, rebounds, assists and substitutions happen at roughly NBA rates.
+
+    Args:
+        polls (int): Number of polls over four periods
+        seed (int): Random seed, so runs are comparable
+        pregame_polls (int): Polls before tip-off
+    """
+    rng = random.Random(seed)
+    state = NBAClient._parse_live_box_score(build_sample_box_score())
+    players = state['player_stats']
+    for player in players:
+        for stat in ('PTS', 'REB', 'AST', 'STL', 'BLK', 'TO', 'FGM', 'FGA', 'FG3M', 'FG3A'):
+            player[stat] = 0
+    teams = [player['TEAM_ABBREVIATION'] for player in players]
+    on_court = {team: [index for index, abbreviation in enumerate(teams) if abbreviation == team][:5]
+                for team in set(teams)}
+    seconds_played = [0.0] * len(players)
+    tip_off = datetime.datetime(2025, 1, 1, 19, 0, 0)
+    polls_per_period = polls // 4
+
+    box_scores = []
+    for poll in range(-pregame_polls, 0):
+        state['period'] = 0
+        state['game_clock'] = ''
+        state['game_status'] = '7:00 pm ET'
+        box_scores.append(BoxScoreData(**copy.deepcopy(state),
+                                       retrieved_at=tip_off + datetime.timedelta(seconds=SECONDS_PER_POLL * poll)))
+
+    for poll in range(polls):
+        period = 1 + min(poll // polls_per_period, 3)
+        clock = max(720 - (poll % polls_per_period + 1) * 720 / polls_per_period, 0)
+        state['period'] = period
+        state['game_clock'] = f"PT{int(clock // 60):02d}M{clock % 60:05.2f}S"
+        state['game_status'] = 'Final' if poll == polls - 1 else f"Q{period} {int(clock // 60)}:{int(clock % 60):02d}"
+
+        for team_index, (team, lineup) in enumerate(sorted(on_court.items())):
+            for index in lineup:
+                seconds_played[index] += 720 / polls_per_period
+                players[index]['MIN'] = f"PT{int(seconds_played[index] // 60):02d}M{seconds_played[index] % 60:05.2f}S"
+            shooter = players[rng.choice(lineup)]
+            if rng.random() < 0.35:
+                shooter['FGA'] += 1
+                if rng.random() < 0.47:
+                    shooter['FGM'] += 1
+                    shooter['PTS'] += 2
+                    state['team_stats'][team_index]['TEAM_SCORE'] += 2
+                    state['team_stats'][team_index]['statistics']['points'] += 2
+                    if rng.random() < 0.6:
+                        players[rng.choice(lineup)]['AST'] += 1
+                else:
+                    players[rng.choice(lineup)]['REB'] += 1
+                shooter['FG_PCT'] = round(shooter['FGM'] / shooter['FGA'], 3)
+            if rng.random() < 0.05:
+                bench = [index for index, abbreviation in enumerate(teams) if abbreviation == team and index not in lineup]
+                lineup[rng.randrange(5)] = rng.choice(bench)
+
+        box_scores.append(BoxScoreData(**copy.deepcopy(state),
+                                       retrieved_at=tip_off + datetime.timedelta(seconds=SECONDS_PER_POLL * poll)))
+    return box_scores
+
+def stored_bytes(documents: List[Dict[str, Any]]) -> int:
+    return sum(len(bson.encode(document)) for document in documents)
+
+def run_benchmark(uri: str = None, polls: int = 720, keyframe_interval: int = BOX_SCORE_HISTORY_KEYFRAME_INTERVAL) -> bool:
+    """
+    Record a simulated game's history into a scratch database and compare its size with one box score
+
+    Args:
+        uri (str): MongoDB URI (default: MONGO_URI)
+        polls (int): Polls in the simulated game
+        keyframe_interval (int): Records per history segment
+    """
+    db_client = MongoDBClient(uri)
+    if not db_client.connect():
+        print(f"Could not connect to {db_client.uri}")
+        return False
+    db_client.client.drop_database(BENCHMARK_DB_NAME)
+
+    history = BoxScoreHistory(db_client, BENCHMARK_DB_NAME, BENCHMARK_COLLECTION_NAME, keyframe_interval)
+    box_scores = simulate_game(polls)
+    for box_score_data in box_scores:
+        if not history.record(box_score_data):
+            print(f"History write failed at {box_score_data.retrieved_at}")
+            return False
+
+    game_id = box_scores[0].game_id
+    documents = db_client.find_documents({'game_id': game_id}, BENCHMARK_DB_NAME, BENCHMARK_COLLECTION_NAME)
+    one_box_score = len(bson.encode(box_scores[-1].to_dict()))
+    history_bytes = stored_bytes(documents)
+
+    # Every recorded poll must still rebuild exactly, including from packed segments, and by game
+    # clock from the first segment, whose keyframe was recorded before tip-off
+    history.forget(game_id)
+    timed = box_scores[PREGAME_POLLS:]
+    rebuilt = all(history.at(game_id, timestamp=box_score_data.retrieved_at).to_dict() == box_score_data.to_dict()
+                  for box_score_data in box_scores[:1] + timed[::max(polls // 50, 1)] + timed[-1:])
+    rebuilt_by_clock = all(
+        (history.at_game_clock(game_id, box_score_data.period, box_score_data.game_clock) or box_scores[0]).to_dict()
+        == box_score_data.to_dict()
+        for box_score_data in timed[:1] + timed[::max(polls // 50, 1)] + timed[-1:])
+    db_client.client.drop_database(BENCHMARK_DB_NAME)
+
+    print(f"\n===== BOX SCORE HISTORY ({polls} polls, keyframe every {keyframe_interval} records) =====")
+    print(f"One box score:      {one_box_score / 1024:.1f} KiB")
+    print(f"Full snapshots:     {polls * one_box_score / 1024:.0f} KiB ({polls}x)")
+    print(f"Stored history:     {history_bytes / 1024:.1f} KiB ({history_bytes / one_box_score:.1f}x) "
+          f"in {len(documents)} segments, {sum('packed' in document for document in documents)} packed")
+    print(f"Rebuilds match:     {'yes' if rebuilt else 'NO'}")
+    print(f"By game clock:      {'yes' if rebuilt_by_clock else 'NO'}")
+    return rebuilt and rebuilt_by_clock
+
+def main():
+    """Main entry point for the box score history storage benchmark"""
+    uri = sys.argv[1] if len(sys.argv) > 1 else None
+    polls = int(sys.argv[2]) if len(sys.argv) > 2 else 720
+    sys.exit(0 if run_benchmark(uri, polls) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import sys
+import logging
+from typing import Optional
+
+from dateutil import parser
+
+from nba_stats.data.history import BoxScoreHistory
+from nba_stats.utils.formatters import BoxScoreFormatter
+
+logger = logging.getLogger(__name__)
+
+def show_box_score_at(game_id: str, when: str, clock: Optional[str] = None) -> None:
+    """
+    Print a game's box score as it was at a point in time, rebuilt from its history
+
+    Args:
+        game_id (str): The NBA game ID
+        when (str): A timestamp (e.g. '2025-04-20T20:15:00'), or a period number when clock is given
+        clock (str): Live game clock in the period (e.g. 'PT02M00.00S')
+    """
+    try:
+        history = BoxScoreHistory()
+        if clock:
+            box_score_data = history.at_game_clock(game_id, int(when), clock)
+        else:
+            box_score_data = history.at(game_id, timestamp=parser.parse(when))
+
+        if not box_score_data:
+            print(f"No box score history for game {game_id} at {when} {clock or ''}")
+            return
+
+        print(f"Box score as of {box_score_data.retrieved_at} "
+              f"(period {box_score_data.period}, clock {box_score_data.game_clock})")
+        BoxScoreFormatter.print_box_score(box_score_data)
+    except Exception as e:
+        logger.error(f"Error rebuilding box score history: {e}")
+
+def main():
+    """Main entry point for the box score history viewer"""
+    if len(sys.argv) > 2:
+        game_id = sys.argv[1]
+        when = sys.argv[2]
+        clock = sys.argv[3] if len(sys.argv) > 3 else None
+    else:
+        game_id = input("Enter NBA game ID (default: 0042400103): ") or "0042400103"
+        when = input("Enter a timestamp, or a period number to give a game clock: ")
+        clock = input("Enter the game clock (e.g. PT02M00.00S), or leave empty for a timestamp: ") or None
+
+    show_box_score_at(game_id, when, clock)
+
+if __name__ == "__main__":
+    main()
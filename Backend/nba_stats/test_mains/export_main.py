@@ -0,0 +1,34 @@
+import sys
+import logging
+
+from nba_stats.data.export import BoxScoreExporter
+
+logger = logging.getLogger(__name__)
+
+def run_export(incremental: bool = True) -> None:
+    """
+    Export stored box scores to Parquet, partitioned by season and game date
+
+    Args:
+        incremental (bool): Only export games added since the last run; otherwise rewrite everything
+    """
+    exporter = BoxScoreExporter()
+    try:
+        exported = exporter.run(incremental=incremental)
+        for collection_name, games in exported.items():
+            print(f"{collection_name}: {games} games exported")
+        print(f"Parquet datasets written to {exporter.out_dir}")
+    except KeyboardInterrupt:
+        print(f"\nExport interrupted; the next incremental run resumes from {exporter.state.path}")
+
+def main():
+    """Main entry point for the Parquet export"""
+    if len(sys.argv) > 1:
+        incremental = sys.argv[1] != "--full"
+    else:
+        incremental = (input("Full export? Rewrites existing datasets (y/N): ").lower() != "y")
+
+    run_export(incremental)
+
+if __name__ == "__main__":
+    main()
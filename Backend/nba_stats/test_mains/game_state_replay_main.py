@@ -0,0 +1,121 @@
+import sys
+import logging
+from typing import Any, Dict, List, Optional
+
+import bson
+from nba_api.live.nba.endpoints import boxscore as live_boxscore
+
+from nba_stats.api.nba_client import NBAClient
+from nba_stats.data.models import BoxScoreData, PlayByPlayData
+from nba_stats.live.game_state import GameState, GameStateEngine, HOME, AWAY, LINEUP_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Actions per simulated poll, and how often the replay restarts from a checkpoint
+ACTIONS_PER_POLL = 12
+POLLS_PER_RESTART = 10
+
+def league_plus_minus(game_id: str) -> Dict[str, int]:
+    """Each player's plus-minus as the league's live box score reports it, by person ID"""
+    game = live_boxscore.BoxScore(game_id=game_id).get_dict()['game']
+    return {str(player['personId']): int(player['statistics']['plusMinusPoints'])
+            for team_key in ('homeTeam', 'awayTeam') for player in game[team_key]['players']
+            if player['statistics'].get('minutes', 'PT00M00.00S') != 'PT00M00.00S'}
+
+def replay(play_by_play_data: PlayByPlayData, box_score_data: Optional[BoxScoreData]) -> Dict[str, Any]:
+    """
+    Replay a game action by action, and again poll by poll through checkpoints
+
+    Returns the full replay's state, the number of resumed plays with fewer or
+    more than five players on a side, and whether the checkpointed replay ended
+    in the same state.
+    """
+    state = GameState(play_by_play_data.game_id)
+    if box_score_data:
+        state.seed_starters(box_score_data)
+    bad_lineups = 0
+    for action in play_by_play_data.plays:
+        state.apply(action)
+        if action.get('actionType') not in ('substitution', 'period', 'timeout', 'game') and action.get('personId'):
+            bad_lineups += any(len(team.on_court) != LINEUP_SIZE for team in state.teams.values())
+
+    # The live path: polls of a growing play list, restarting from a BSON round-tripped checkpoint now and then
+    engine = GameStateEngine()
+    plays = play_by_play_data.plays
+    for poll, end in enumerate(range(ACTIONS_PER_POLL, len(plays) + ACTIONS_PER_POLL, ACTIONS_PER_POLL), start=1):
+        engine.observe(PlayByPlayData(play_by_play_data.game_id, plays[:end]), box_score_data)
+        if poll % POLLS_PER_RESTART == 0:
+            checkpoint = bson.decode(bson.encode(engine.get(play_by_play_data.game_id).to_dict()))
+            engine = GameStateEngine()
+            engine.load(play_by_play_data.game_id, checkpoint)
+    resumed = engine.get(play_by_play_data.game_id)
+    return {'state': state, 'bad_lineups': bad_lineups, 'checkpoint_matches': resumed.to_dict() == state.to_dict()}
+
+def check_game_state(game_id: str) -> bool:
+    """
+    Replay a recorded game and check the derived lineups, stints, plus-minus and runs
+
+    Args:
+        game_id (str): The NBA game ID of a finished game
+    """
+    play_by_play_data = NBAClient.get_live_play_by_play(game_id)
+    box_score_data = NBAClient.get_live_box_score(game_id)
+    if not play_by_play_data:
+        print(f"Failed to retrieve play-by-play data for game ID: {game_id}")
+        return False
+
+    result = replay(play_by_play_data, box_score_data)
+    state: GameState = result['state']
+    failures: List[str] = []
+
+    def expect(name: str, ok: bool, detail: str = "") -> None:
+        print(f"{'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail else ''}")
+        if not ok:
+            failures.append(name)
+
+    margins = {HOME: state.score[HOME] - state.score[AWAY], AWAY: state.score[AWAY] - state.score[HOME]}
+    expect("five players a side whenever play resumes", result['bad_lineups'] == 0,
+           f"{result['bad_lineups']} plays without")
+    for tricode, team in state.teams.items():
+        stints = team.stints + ([team.stint] if team.stint else [])
+        margin = margins.get(team.side)
+        stint_margin = sum(stint['points_for'] - stint['points_against'] for stint in stints)
+        expect(f"{tricode} stints add up to the final margin", stint_margin == margin, f"{stint_margin} vs {margin}")
+        expect(f"{tricode} player plus-minus adds up to five times the margin",
+               sum(team.plus_minus.values()) == LINEUP_SIZE * margin)
+        lineup_points = sum(lineup['points_for'] for lineup in team.lineups.values()) + (team.stint or {}).get('points_for', 0)
+        expect(f"{tricode} lineups account for every point", lineup_points == state.score.get(team.side))
+        runs = [run for run in state.runs if run['team'] == tricode]
+        largest = state.largest_runs.get(tricode, {}).get('points', 0)
+        expect(f"{tricode} largest run covers every recorded run", all(run['points'] <= largest for run in runs),
+               f"{len(runs)} runs of {state.run_min_points}+, largest {largest}")
+    expect("checkpointed poll-by-poll replay ends in the same state", result['checkpoint_matches'])
+
+    try:
+        reference = league_plus_minus(game_id)
+    except Exception as e:
+        print(f"skip league plus-minus comparison: {e}")
+    else:
+        ours = {person_id: value for team in state.teams.values() for person_id, value in team.plus_minus.items()}
+        differing = sorted(person_id for person_id, value in reference.items() if ours.get(person_id, 0) != value)
+        expect("plus-minus matches the league's box score", not differing,
+               ", ".join(f"{state.player_names.get(person_id)} {ours.get(person_id, 0)} vs {reference[person_id]}"
+                         for person_id in differing))
+
+    summary = state.summary()
+    print(f"\nFinal {summary['score']}, {sum(len(team.stints) for team in state.teams.values())} stints, "
+          f"{len(state.runs)} runs")
+    print(f"\n{'All checks passed' if not failures else f'{len(failures)} checks failed'}")
+    return not failures
+
+def main():
+    """Main entry point for the game state replay check"""
+    if len(sys.argv) > 1:
+        game_id = sys.argv[1]
+    else:
+        game_id = input("Enter a finished NBA game ID (default: 0042400103): ") or "0042400103"
+
+    sys.exit(0 if check_game_state(game_id) else 1)
+
+if __name__ == "__main__":
+    main()
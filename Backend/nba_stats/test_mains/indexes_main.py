@@ -0,0 +1,23 @@
+import logging
+
+from nba_stats.data.indexes import IndexManager
+
+logger = logging.getLogger(__name__)
+
+def verify_indexes() -> None:
+    """Create the declared MongoDB indexes and print what is missing or still scanned"""
+    try:
+        report = IndexManager().verify()
+        for kind, specs in report.items():
+            print(f"\n===== {kind.upper().replace('_', ' ')} ({len(specs)}) =====")
+            for spec in specs:
+                print(spec)
+    except Exception as e:
+        logger.error(f"Error verifying indexes: {e}")
+
+def main():
+    """Main entry point for the index check"""
+    verify_indexes()
+
+if __name__ == "__main__":
+    main()
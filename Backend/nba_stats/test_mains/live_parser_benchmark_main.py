@@ -0,0 +1,111 @@
+import sys
+import copy
+import json
+import math
+import timeit
+import logging
+from typing import Any, Dict
+
+from nba_api.live.nba.endpoints import boxscore as live_boxscore
+from nba_api.library.http import NBAResponse
+
+from nba_stats.api.nba_client import NBAClient, PLAYER_STATS_COLUMNS_MAPPING
+
+logger = logging.getLogger(__name__)
+
+PLAYERS_PER_TEAM = 13
+
+def build_sample_box_score(players_per_team: int = PLAYERS_PER_TEAM) -> live_boxscore.BoxScore:
+    """
+    Build a live BoxScore endpoint from nba_api's sample payload without a network call
+
+    Args:
+        players_per_team (int): How many players to put on each roster
+    """
+    payload = copy.deepcopy(live_boxscore.BoxScore.expected_data)
+    for team_key in ('homeTeam', 'awayTeam'):
+        team = payload['game'][team_key]
+        template = team['players'][0]
+        players = []
+        for order in range(players_per_team):
+            player = copy.deepcopy(template)
+            player['order'] = order + 1
+            player['personId'] = template['personId'] + order
+            player['statistics']['points'] = order * 2
+            if order >= 5:
+                # Bench players have no position in the live feed
+                player.pop('position', None)
+                player['starter'] = "0"
+            players.append(player)
+        team['players'] = players
+
+    data = live_boxscore.BoxScore(game_id=payload['game']['gameId'], get_request=False)
+    data.nba_response = NBAResponse(response=json.dumps(payload), status_code=200, url='sample')
+    data.load_response()
+    return data
+
+def parse_live_box_score_pandas(data: live_boxscore.BoxScore) -> Dict[str, Any]:
+    """The previous DataFrame-based player stats parser, kept here as the benchmark baseline"""
+    import pandas as pd
+
+    home_df = pd.DataFrame(data.home_team_player_stats.get_dict())
+    away_df = pd.DataFrame(data.away_team_player_stats.get_dict())
+
+    home_df['TEAM_ABBREVIATION'] = data.home_team.get_dict()['teamTricode']
+    away_df['TEAM_ABBREVIATION'] = data.away_team.get_dict()['teamTricode']
+
+    all_players_df = pd.concat([home_df, away_df])
+
+    player_stats_df = pd.json_normalize(all_players_df.to_dict('records'), sep='_')
+
+    player_stats_clean = pd.DataFrame()
+    for new_col, source_col in PLAYER_STATS_COLUMNS_MAPPING.items():
+        player_stats_clean[new_col] = player_stats_df.get(source_col)
+
+    return {'player_stats': player_stats_clean.to_dict('records')}
+
+def same_value(a: Any, b: Any) -> bool:
+    """Compare cell values, treating pandas' NaN for a missing field as None"""
+    def normalize(value):
+        return None if isinstance(value, float) and math.isnan(value) else value
+    return normalize(a) == normalize(b)
+
+def check_equivalence(data: live_boxscore.BoxScore) -> bool:
+    """Check that both parsers produce the same player rows"""
+    expected = parse_live_box_score_pandas(data)['player_stats']
+    actual = NBAClient._parse_live_box_score(data)['player_stats']
+    if len(expected) != len(actual):
+        return False
+    for expected_row, actual_row in zip(expected, actual):
+        if list(expected_row) != list(actual_row):
+            return False
+        if not all(same_value(expected_row[key], actual_row[key]) for key in expected_row):
+            return False
+    return True
+
+def run_benchmark(iterations: int = 500) -> None:
+    """
+    Time the pandas and dict-based live box score parsers on the same payload
+
+    Args:
+        iterations (int): Number of parses per parser
+    """
+    data = build_sample_box_score()
+
+    print(f"Outputs match: {check_equivalence(data)}")
+
+    pandas_seconds = timeit.timeit(lambda: parse_live_box_score_pandas(data), number=iterations)
+    dict_seconds = timeit.timeit(lambda: NBAClient._parse_live_box_score(data), number=iterations)
+
+    print(f"\n===== LIVE BOX SCORE PARSER ({2 * PLAYERS_PER_TEAM} players, {iterations} runs) =====")
+    print(f"pandas: {pandas_seconds / iterations * 1e6:.1f} us/parse")
+    print(f"dict:   {dict_seconds / iterations * 1e6:.1f} us/parse")
+    print(f"Speedup: {pandas_seconds / dict_seconds:.1f}x")
+
+def main():
+    """Main entry point for the parser benchmark"""
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    run_benchmark(iterations)
+
+if __name__ == "__main__":
+    main()
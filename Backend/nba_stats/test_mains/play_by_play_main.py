@@ -8,13 +8,18 @@ from nba_stats.utils.formatters import PlayByPlayFormatter
 
 logger = logging.getLogger(__name__)
 
-def process_play_by_play(game_id: str, save_to_db: bool = False) -> None:
+def process_play_by_play(game_id: str, save_to_db: bool = False,
+                         limit: Optional[int] = 25, tail: Optional[int] = None,
+                         since_action_number: Optional[int] = None) -> None:
     """
     Process play-by-play data for a given game ID and optionally save to MongoDB
     
     Args:
         game_id (str): The NBA game ID
         save_to_db (bool): Whether to save the data to MongoDB
+        limit (int): Maximum number of plays to print
+        tail (int): Only print the latest N plays
+        since_action_number (int): Only print plays after this actionNumber
     """
     try:
         # Get play-by-play data from NBA API
@@ -25,7 +30,8 @@ def process_play_by_play(game_id: str, save_to_db: bool = False) -> None:
             return
         
         # Print formatted play-by-play data
-        PlayByPlayFormatter.print_play_by_play(play_by_play_data)
+        PlayByPlayFormatter.print_play_by_play(play_by_play_data, limit=limit, tail=tail,
+                                               since_action_number=since_action_number)
         
         # Save to MongoDB if requested
         if save_to_db:
@@ -40,6 +46,14 @@ def process_play_by_play(game_id: str, save_to_db: bool = False) -> None:
         logger.error(f"Error processing play-by-play data: {e}")
         logger.error(f"Exception details: {str(e)}")
         print("Make sure the game ID is valid and in the format '0022200001'")
+def int_option(name: str, default: Optional[int] = None) -> Optional[int]:
+    """Read an integer option given as '--name N' on the command line"""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            return int(sys.argv[index + 1])
+    return default
+
 def main():
     """Main entry point for the play-by-play application"""
     if len(sys.argv) > 1:
@@ -50,6 +64,9 @@ def main():
         game_id = input("Enter NBA game ID (default: 0022000181): ") or "0042400103"
         save_to_db = input("Save to MongoDB? (y/n): ").lower() == 'y'
     
-    process_play_by_play(game_id, save_to_db)
+    process_play_by_play(game_id, save_to_db,
+                         limit=int_option("--limit", 25),
+                         tail=int_option("--tail"),
+                         since_action_number=int_option("--since"))
 if __name__ == "__main__":
     main()
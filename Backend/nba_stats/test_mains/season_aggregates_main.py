@@ -0,0 +1,47 @@
+import sys
+import logging
+
+from nba_stats.data.aggregates import AggregateEngine
+
+logger = logging.getLogger(__name__)
+
+def show_leaders(season: str, season_type: str = "regular", catch_up: bool = False) -> None:
+    """
+    Print a season's stored leaderboards
+
+    Args:
+        season (str): Season to show, e.g. '2023-24'
+        season_type (str): 'regular', 'playoffs', ...
+        catch_up (bool): First aggregate stored static box scores that are not folded in yet
+    """
+    engine = AggregateEngine()
+    if catch_up:
+        print(f"Aggregated {engine.catch_up()} stored games")
+
+    document = engine.get_leaders(season, season_type)
+    if not document:
+        print(f"No aggregates stored for the {season} {season_type} season")
+        return
+
+    print(f"{season} {season_type} season, {document['games']} games")
+    for stat, leaders in document['leaders'].items():
+        print(f"\n{stat}")
+        for rank, leader in enumerate(leaders[:10], start=1):
+            name = leader.get('player_name') or leader.get('team_abbreviation')
+            print(f"  {rank:2d}. {name:<28} {leader['value']:>8}  ({leader['games']} games)")
+
+def main():
+    """Main entry point for the season aggregates"""
+    if len(sys.argv) > 1:
+        season = sys.argv[1]
+        season_type = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else "regular"
+        catch_up = "--catch-up" in sys.argv
+    else:
+        season = input("Enter the season (e.g., 2023-24): ")
+        season_type = input("Enter the season type (regular/playoffs, default regular): ") or "regular"
+        catch_up = (input("Aggregate stored games first? (y/N): ").lower() == "y")
+
+    show_leaders(season, season_type, catch_up)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import sys
+import timeit
+import logging
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from nba_stats.api.nba_client import NBAClient
+from nba_stats.data.models import PlayerStatLine, TeamStatLine
+from nba_stats.test_mains.live_parser_benchmark_main import build_sample_box_score
+
+logger = logging.getLogger(__name__)
+
+def measure(build: Callable[[], Any]) -> int:
+    """
+    Bytes still allocated by the object that build() returns
+
+    Args:
+        build (Callable): Builds the structure to measure
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+def run_benchmark(games: int = 200) -> None:
+    """
+    Compare dict rows with slotted stat lines for many games kept in memory
+
+    Args:
+        games (int): Number of box scores to hold at once
+    """
+    parsed: Dict[str, List[Dict[str, Any]]] = NBAClient._parse_live_box_score(build_sample_box_score())
+    player_rows = parsed['player_stats']
+    team_rows = parsed['team_stats']
+
+    # Values are shared in both cases, so only the row containers are compared
+    dict_bytes = measure(lambda: [([dict(row) for row in player_rows], [dict(row) for row in team_rows])
+                                  for _ in range(games)])
+    slot_bytes = measure(lambda: [(PlayerStatLine.from_list(player_rows), TeamStatLine.from_list(team_rows))
+                                  for _ in range(games)])
+
+    players_per_game = len(player_rows)
+    print(f"\n===== STAT LINE MEMORY ({games} games, {players_per_game} players + {len(team_rows)} teams each) =====")
+    print(f"dict rows:    {dict_bytes / 1024:.0f} KiB ({dict_bytes / games:.0f} B/game)")
+    print(f"slotted rows: {slot_bytes / 1024:.0f} KiB ({slot_bytes / games:.0f} B/game)")
+    print(f"Saved: {1 - slot_bytes / dict_bytes:.0%}")
+
+    lines = PlayerStatLine.from_list(player_rows)
+    iterations = 2000
+    from_seconds = timeit.timeit(lambda: PlayerStatLine.from_list(player_rows), number=iterations)
+    to_seconds = timeit.timeit(lambda: [line.to_dict() for line in lines], number=iterations)
+    print(f"\nfrom_dict: {from_seconds / iterations / players_per_game * 1e6:.2f} us/row, "
+          f"to_dict: {to_seconds / iterations / players_per_game * 1e6:.2f} us/row")
+
+def main():
+    """Main entry point for the stat line memory benchmark"""
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    run_benchmark(games)
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,60 @@
 from ..data.models import BoxScoreData, StaticBoxScoreData, ScoreboardData, PlayByPlayData
-from typing import Dict, List, Any, Set
-from nba_api.stats.static import players
+from typing import Dict, List, Any, Set, Iterable, Iterator, Optional
+from collections import deque
+from itertools import islice
+from .player_index import PlayerIndex
 from dateutil import parser
 from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Plays shown by print_play_by_play unless a limit is given
+DEFAULT_PRINT_PLAY_LIMIT = 25
+
+def _print_lines(lines: Iterable[str]) -> None:
+    """Print lines as they are produced"""
+    for line in lines:
+        print(line)
+
 class BoxScoreFormatter:
     """Handles formatting of box score data for display"""
-    
+
     @staticmethod
-    def format_box_score(box_score_data: BoxScoreData) -> str:
-        """Format box score data into a readable string"""
-        output = []
-        
+    def _group_players_by_team(player_stats: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group player rows by team in one pass, keeping the order teams first appear in"""
+        teams: Dict[str, List[Dict[str, Any]]] = {}
+        for player in player_stats:
+            teams.setdefault(player['TEAM_ABBREVIATION'], []).append(player)
+        return teams
+
+    @staticmethod
+    def _iter_player_lines(player_stats: List[Dict[str, Any]]) -> Iterator[str]:
+        """Yield each team's player lines, highest scorers first"""
+        yield "\n===== PLAYER STATS ====="
+        for team_abbr, team_players in BoxScoreFormatter._group_players_by_team(player_stats).items():
+            yield f"\n{team_abbr} Players:"
+            
+            # Sort by points scored (highest first)
+            for player in sorted(team_players, key=lambda x: x['PTS'], reverse=True):
+                yield (f"{player['PLAYER_NAME']} - {player['PTS']} pts, "
+                       f"{player['REB']} reb, {player['AST']} ast, {player['MIN']} min")
+
+    @staticmethod
+    def iter_box_score(box_score_data: BoxScoreData) -> Iterator[str]:
+        """Yield the lines of a formatted box score"""
         # Add game status
-        output.append(f"\n===== GAME STATUS: {box_score_data.game_status} =====")
+        yield f"\n===== GAME STATUS: {box_score_data.game_status} ====="
         
         # Add arena info if available
         if box_score_data.arena:
             arena = box_score_data.arena
-            output.append(f"Arena: {arena.get('arenaName', 'N/A')} in {arena.get('arenaCity', 'N/A')}, {arena.get('arenaState', 'N/A')}")
+            yield f"Arena: {arena.get('arenaName', 'N/A')} in {arena.get('arenaCity', 'N/A')}, {arena.get('arenaState', 'N/A')}"
         
         # Add team stats
-        output.append("\n===== TEAM STATS =====")
+        yield "\n===== TEAM STATS ====="
         for team in box_score_data.team_stats:
-            output.append(f"\n{team['TEAM_CITY']} {team['TEAM_NAME']} ({team['TEAM_ABBREVIATION']}): {team['TEAM_SCORE']} pts")
+            yield f"\n{team['TEAM_CITY']} {team['TEAM_NAME']} ({team['TEAM_ABBREVIATION']}): {team['TEAM_SCORE']} pts"
             
             fg_pct = team['statistics']['fieldGoalsPercentage']
             fg_pct_str = f"{fg_pct:.1%}" if isinstance(fg_pct, float) else "N/A"
@@ -34,41 +62,31 @@ class BoxScoreFormatter:
             tp_pct = team['statistics']['threePointersPercentage']
             tp_pct_str = f"{tp_pct:.1%}" if isinstance(tp_pct, float) else "N/A"
             
-            output.append(f"FG%: {fg_pct_str}, 3P%: {tp_pct_str}")
-            output.append(f"Rebounds: {team['statistics']['reboundsTotal']}, " 
-                         f"Assists: {team['statistics']['assists']}, "
-                         f"Turnovers: {team['statistics'].get('turnoversTotal', 0)}")
+            yield f"FG%: {fg_pct_str}, 3P%: {tp_pct_str}"
+            yield (f"Rebounds: {team['statistics']['reboundsTotal']}, " 
+                   f"Assists: {team['statistics']['assists']}, "
+                   f"Turnovers: {team['statistics'].get('turnoversTotal', 0)}")
         
         # Add player stats
-        output.append("\n===== PLAYER STATS =====")
-        team_abbrs = set(player['TEAM_ABBREVIATION'] for player in box_score_data.player_stats)
-        
-        for team_abbr in team_abbrs:
-            team_players = [p for p in box_score_data.player_stats if p['TEAM_ABBREVIATION'] == team_abbr]
-            output.append(f"\n{team_abbr} Players:")
-            
-            # Sort by points scored (highest first)
-            for player in sorted(team_players, key=lambda x: x['PTS'], reverse=True):
-                output.append(f"{player['PLAYER_NAME']} - {player['PTS']} pts, "
-                             f"{player['REB']} reb, {player['AST']} ast, {player['MIN']} min")
-        
-        return "\n".join(output)
+        yield from BoxScoreFormatter._iter_player_lines(box_score_data.player_stats)
+
+    @staticmethod
+    def format_box_score(box_score_data: BoxScoreData) -> str:
+        """Format box score data into a readable string"""
+        return "\n".join(BoxScoreFormatter.iter_box_score(box_score_data))
     
     @staticmethod
     def print_box_score(box_score_data: BoxScoreData) -> None:
         """Print formatted box score to console"""
-        formatted_output = BoxScoreFormatter.format_box_score(box_score_data)
-        print(formatted_output)
-    
+        _print_lines(BoxScoreFormatter.iter_box_score(box_score_data))
+
     @staticmethod
-    def format_static_box_score(box_score_data: StaticBoxScoreData) -> str:
-        """Format static box score data into a readable string"""
-        output = []
-        
+    def iter_static_box_score(box_score_data: StaticBoxScoreData) -> Iterator[str]:
+        """Yield the lines of a formatted static box score"""
         # Add team stats
-        output.append("\n===== TEAM STATS =====")
+        yield "\n===== TEAM STATS ====="
         for team in box_score_data.team_stats:
-            output.append(f"\n{team['TEAM_CITY']} {team['TEAM_NAME']} ({team['TEAM_ABBREVIATION']})")
+            yield f"\n{team['TEAM_CITY']} {team['TEAM_NAME']} ({team['TEAM_ABBREVIATION']})"
             
             # Format percentages
             fg_pct = team['FG_PCT']
@@ -77,29 +95,21 @@ class BoxScoreFormatter:
             fg3_pct = team['FG3_PCT']
             fg3_pct_str = f"{fg3_pct:.1%}" if isinstance(fg3_pct, float) else "N/A"
             
-            output.append(f"Points: {team['PTS']}, FG%: {fg_pct_str}, 3P%: {fg3_pct_str}")
-            output.append(f"Rebounds: {team['REB']}, Assists: {team['AST']}, Turnovers: {team['TO']}")
+            yield f"Points: {team['PTS']}, FG%: {fg_pct_str}, 3P%: {fg3_pct_str}"
+            yield f"Rebounds: {team['REB']}, Assists: {team['AST']}, Turnovers: {team['TO']}"
         
         # Add player stats
-        output.append("\n===== PLAYER STATS =====")
-        team_abbrs = set(player['TEAM_ABBREVIATION'] for player in box_score_data.player_stats)
-        
-        for team_abbr in team_abbrs:
-            team_players = [p for p in box_score_data.player_stats if p['TEAM_ABBREVIATION'] == team_abbr]
-            output.append(f"\n{team_abbr} Players:")
-            
-            # Sort by points scored (highest first)
-            for player in sorted(team_players, key=lambda x: x['PTS'], reverse=True):
-                output.append(f"{player['PLAYER_NAME']} - {player['PTS']} pts, "
-                             f"{player['REB']} reb, {player['AST']} ast, {player['MIN']} min")
-        
-        return "\n".join(output)
+        yield from BoxScoreFormatter._iter_player_lines(box_score_data.player_stats)
+
+    @staticmethod
+    def format_static_box_score(box_score_data: StaticBoxScoreData) -> str:
+        """Format static box score data into a readable string"""
+        return "\n".join(BoxScoreFormatter.iter_static_box_score(box_score_data))
     
     @staticmethod
     def print_static_box_score(box_score_data: StaticBoxScoreData) -> None:
         """Print formatted static box score to console"""
-        formatted_output = BoxScoreFormatter.format_static_box_score(box_score_data)
-        print(formatted_output)
+        _print_lines(BoxScoreFormatter.iter_static_box_score(box_score_data))
     
 class ScoreboardFormatter:
     """Handles formatting of scoreboard data for display"""
@@ -134,27 +144,60 @@ class ScoreboardFormatter:
 
 class PlayByPlayFormatter:
     """Handles formatting of play-by-play data for display"""
-    
+
     @staticmethod
-    def format_play_by_play(play_by_play_data: PlayByPlayData) -> str:
-        """Format play-by-play data into a readable string"""
-        output = []
+    def _select_plays(plays: List[Dict[str, Any]],
+                      limit: Optional[int],
+                      tail: Optional[int],
+                      since_action_number: Optional[int]) -> Iterable[Dict[str, Any]]:
+        """Apply since_action_number, then tail, then limit without copying more plays than needed"""
+        selected: Iterable[Dict[str, Any]] = plays
+        if since_action_number is not None:
+            selected = (play for play in selected if play['actionNumber'] > since_action_number)
+        if tail is not None:
+            if tail <= 0:
+                return []
+            selected = selected[-tail:] if isinstance(selected, list) else deque(selected, maxlen=tail)
+        if limit is not None:
+            selected = islice(selected, max(limit, 0))
+        return selected
+
+    @staticmethod
+    def iter_play_by_play(play_by_play_data: PlayByPlayData,
+                          limit: Optional[int] = None,
+                          tail: Optional[int] = None,
+                          since_action_number: Optional[int] = None) -> Iterator[str]:
+        """
+        Yield the lines of a formatted play-by-play
+
+        Args:
+            limit (int): Stop after this many plays
+            tail (int): Only the latest N plays
+            since_action_number (int): Only plays after this actionNumber
+        """
         line = "{action_number}: {period}:{clock} {player_id} ({action_type})"
         
         # Add play-by-play header
-        output.append("\n===== PLAY-BY-PLAY =====")
+        yield "\n===== PLAY-BY-PLAY ====="
         
         # Add each play
-        for play in play_by_play_data.plays:
-            player_name = ''
-            player = players.find_player_by_id(play['personId'])
-            if player is not None:
-                player_name = player['full_name']
-            output.append(line.format(action_number=play['actionNumber'],period=play['period'],clock=play['clock'],action_type=play['description'],player_id=player_name))
-        return "\n".join(output)
+        player_index = PlayerIndex.shared()
+        for play in PlayByPlayFormatter._select_plays(play_by_play_data.plays, limit, tail, since_action_number):
+            player_name = player_index.player_name(play['personId'])
+            yield line.format(action_number=play['actionNumber'],period=play['period'],clock=play['clock'],action_type=play['description'],player_id=player_name)
+    
+    @staticmethod
+    def format_play_by_play(play_by_play_data: PlayByPlayData,
+                            limit: Optional[int] = None,
+                            tail: Optional[int] = None,
+                            since_action_number: Optional[int] = None) -> str:
+        """Format play-by-play data into a readable string"""
+        return "\n".join(PlayByPlayFormatter.iter_play_by_play(play_by_play_data, limit, tail, since_action_number))
     
     @staticmethod
-    def print_play_by_play(play_by_play_data: List[Dict[str, Any]]) -> None:
-        """Print formatted play-by-play to console"""
-        formatted_output = PlayByPlayFormatter.format_play_by_play(play_by_play_data)
-        print(formatted_output[:1000])  # Limit to first 1000 characters for readability
\ No newline at end of file
+    def print_play_by_play(play_by_play_data: PlayByPlayData,
+                           limit: Optional[int] = DEFAULT_PRINT_PLAY_LIMIT,
+                           tail: Optional[int] = None,
+                           since_action_number: Optional[int] = None) -> None:
+        """Print formatted play-by-play to console, only rendering the plays that are shown"""
+        _print_lines(PlayByPlayFormatter.iter_play_by_play(play_by_play_data, limit, tail, since_action_number))
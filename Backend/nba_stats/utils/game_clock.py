@@ -0,0 +1,31 @@
+import re
+from typing import Optional
+
+# Live feeds report the clock as an ISO 8601 duration, e.g. "PT05M32.00S"
+GAME_CLOCK_PATTERN = re.compile(r'^PT(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?$')
+
+REGULATION_PERIODS = 4
+REGULATION_PERIOD_SECONDS = 12 * 60
+OVERTIME_PERIOD_SECONDS = 5 * 60
+
+def parse_game_clock(clock: Optional[str]) -> Optional[float]:
+    """Convert a live game clock string to seconds left in the period."""
+    if not clock:
+        return None
+    match = GAME_CLOCK_PATTERN.match(clock)
+    if not match:
+        return None
+    minutes, seconds = match.groups()
+    return int(minutes or 0) * 60 + float(seconds or 0)
+
+def period_length(period: int) -> int:
+    """Length of a period in seconds."""
+    return REGULATION_PERIOD_SECONDS if period <= REGULATION_PERIODS else OVERTIME_PERIOD_SECONDS
+
+def elapsed_game_seconds(period: Optional[int], clock: Optional[str]) -> Optional[float]:
+    """Seconds of game time played before the given period and clock."""
+    seconds_left = parse_game_clock(clock)
+    if not period or seconds_left is None:
+        return None
+    elapsed = sum(period_length(p) for p in range(1, period))
+    return elapsed + period_length(period) - seconds_left
@@ -0,0 +1,93 @@
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+
+from nba_api.stats.static import players, teams
+
+from ..data.models import BoxScoreData
+
+logger = logging.getLogger(__name__)
+
+class PlayerIndex:
+    """
+    O(1) player and team lookups by ID.
+
+    Built once from nba_api's static player and team lists, which scan
+    linearly on every find_*_by_id call. Players missing from the static data
+    (rookies, two-way and 10-day signings) are added from live box score
+    rosters as the poller sees them. Use PlayerIndex.shared() so the
+    formatters and any API layer share one index.
+    """
+
+    _shared: Optional["PlayerIndex"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self,
+                 player_list: Optional[List[Dict[str, Any]]] = None,
+                 team_list: Optional[List[Dict[str, Any]]] = None):
+        player_list = players.get_players() if player_list is None else player_list
+        team_list = teams.get_teams() if team_list is None else team_list
+        self._players: Dict[int, Dict[str, Any]] = {player['id']: player for player in player_list}
+        self._teams: Dict[int, Dict[str, Any]] = {team['id']: team for team in team_list}
+        self._teams_by_abbreviation: Dict[str, Dict[str, Any]] = {team['abbreviation']: team for team in team_list}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> "PlayerIndex":
+        """The process-wide index, built on first use."""
+        if cls._shared is None:
+            with cls._shared_lock:
+                if cls._shared is None:
+                    cls._shared = cls()
+        return cls._shared
+
+    def player(self, person_id: Any) -> Optional[Dict[str, Any]]:
+        return self._players.get(person_id)
+
+    def player_name(self, person_id: Any, default: str = '') -> str:
+        player = self._players.get(person_id)
+        return player['full_name'] if player is not None else default
+
+    def team(self, team_id: Any) -> Optional[Dict[str, Any]]:
+        return self._teams.get(team_id)
+
+    def team_by_abbreviation(self, abbreviation: str) -> Optional[Dict[str, Any]]:
+        return self._teams_by_abbreviation.get(abbreviation)
+
+    def refresh_from_box_score(self, box_score_data: BoxScoreData) -> int:
+        """Add players and teams from a live box score that the index does not know yet. Returns the number added."""
+        added = 0
+        with self._lock:
+            for team_stats in box_score_data.team_stats:
+                team_id = team_stats.get('TEAM_ID')
+                if team_id is None or team_id in self._teams:
+                    continue
+                team = {
+                    'id': team_id,
+                    'full_name': f"{team_stats.get('TEAM_CITY', '')} {team_stats.get('TEAM_NAME', '')}".strip(),
+                    'abbreviation': team_stats.get('TEAM_ABBREVIATION'),
+                    'nickname': team_stats.get('TEAM_NAME'),
+                    'city': team_stats.get('TEAM_CITY'),
+                }
+                self._teams[team_id] = team
+                self._teams_by_abbreviation.setdefault(team['abbreviation'], team)
+                added += 1
+
+            for player_stats in box_score_data.player_stats:
+                person_id = player_stats.get('PLAYER_ID')
+                if person_id is None or person_id in self._players:
+                    continue
+                full_name = player_stats.get('PLAYER_NAME') or ''
+                first_name, _, last_name = full_name.partition(' ')
+                self._players[person_id] = {
+                    'id': person_id,
+                    'full_name': full_name,
+                    'first_name': first_name,
+                    'last_name': last_name,
+                    'is_active': True,
+                }
+                added += 1
+
+        if added:
+            logger.info(f"Player index: added {added} players/teams from box score {box_score_data.game_id}")
+        return added
@@ -0,0 +1,25 @@
+from typing import Optional
+
+# Game IDs look like 0022400123: season type prefix, two-digit season start year, game number
+GAME_ID_SEASON_TYPES = {
+    '001': 'preseason',
+    '002': 'regular',
+    '003': 'allstar',
+    '004': 'playoffs',
+    '005': 'playin',
+}
+
+def season_from_game_id(game_id: Optional[str]) -> Optional[str]:
+    """'0022400123' -> '2024-25'. None if the ID does not look like an NBA game ID."""
+    if not game_id or len(game_id) < 5 or not game_id[3:5].isdigit():
+        return None
+    year = int(game_id[3:5])
+    # The league's first season was 1946-47
+    start_year = (1900 if year >= 46 else 2000) + year
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+def season_type_from_game_id(game_id: Optional[str]) -> Optional[str]:
+    """'0042400101' -> 'playoffs'."""
+    if not game_id:
+        return None
+    return GAME_ID_SEASON_TYPES.get(game_id[:3])